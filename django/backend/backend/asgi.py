@@ -2,6 +2,13 @@
 ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn backend.asgi:application``) to
+run the async task list views under /api/single-task/async/ without holding
+a worker thread per request; the sync views work under either interface.
+
+Persistent database connections are turned off here whatever
+DATABASE_CONN_MAX_AGE says: each request runs in its own thread, so a
+connection kept open for reuse would only pile up.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +19,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+os.environ['DATABASE_CONN_MAX_AGE'] = '0'
 
 application = get_asgi_application()
@@ -15,6 +15,8 @@ from datetime import timedelta
 import environ
 import logging
 
+from django.core.exceptions import ImproperlyConfigured
+
 env = environ.Env()
 # reading .env file
 environ.Env.read_env()
@@ -31,9 +33,10 @@ TEMPLATE_DIR = BASE_DIR / 'templates'
 SECRET_KEY = env("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# With DEBUG every query is also kept in connection.queries
+DEBUG = env.bool("DEBUG", default=True)
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=[])
 
 
 # Application definition
@@ -54,8 +57,11 @@ INSTALLED_APPS = [
     'djoser',
     'authapp',
 
+    'idempotency',
     'interval_task_group',
+    'jobs',
     'monthly_task',
+    'response_cache',
     'single_task',
     'user_profiles',
     'weekly_task',
@@ -97,32 +103,77 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-#DATABASES = {
-#    'default': {
-#        'ENGINE': 'django.db.backends.sqlite3',
-#        'NAME': BASE_DIR / 'db.sqlite3',
-#    }
-#}
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': env("DATABASE_NAME"),
-        'USER': env("DATABASE_USER"),
-        'PASSWORD': env("DATABASE_PASSWORD"),
-        'HOST': env("DATABASE_HOST"),
-        'PORT': env("DATABASE_PORT"),
+# Set DATABASE_ENGINE=sqlite to use the local db.sqlite3 instead of MySQL
+if env("DATABASE_ENGINE", default="mysql") == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': env("DATABASE_NAME"),
+            'USER': env("DATABASE_USER"),
+            'PASSWORD': env("DATABASE_PASSWORD"),
+            'HOST': env("DATABASE_HOST"),
+            'PORT': env("DATABASE_PORT"),
+        }
     }
-}
+
+# Persistent connections, for WSGI workers only: every worker thread keeps
+# its own connection open for DATABASE_CONN_MAX_AGE seconds instead of
+# connecting for each request; 0 closes it after every request. Under ASGI
+# every request runs in a new thread, so a persistent connection is never
+# reused or closed; backend.asgi forces 0. Health checks ping a reused
+# connection before the first query of a request and reconnect when the
+# server dropped it
+DATABASES['default'].update({
+    'CONN_MAX_AGE': env.int("DATABASE_CONN_MAX_AGE", default=60),
+    'CONN_HEALTH_CHECKS': env.bool("DATABASE_CONN_HEALTH_CHECKS", default=True),
+})
+
+# Connection budget: each thread holds at most one connection, so
+#   WEB_CONCURRENCY x WEB_THREADS + run_jobs --threads <= DATABASE_MAX_CONNECTIONS
+# WEB_CONCURRENCY and WEB_THREADS must match the WSGI server's worker
+# processes and threads per process (gunicorn reads WEB_CONCURRENCY itself;
+# pass --threads $WEB_THREADS). DATABASE_MAX_CONNECTIONS is the share of
+# MySQL's max_connections (151 by default) left for this app. Startup fails
+# when the web workers alone exceed it, and run_jobs refuses more threads
+# than the connections they leave
+WEB_CONCURRENCY = env.int("WEB_CONCURRENCY", default=1)
+WEB_THREADS = env.int("WEB_THREADS", default=1)
+DATABASE_MAX_CONNECTIONS = env.int("DATABASE_MAX_CONNECTIONS", default=151)
+if WEB_CONCURRENCY * WEB_THREADS > DATABASE_MAX_CONNECTIONS:
+    raise ImproperlyConfigured(
+        "WEB_CONCURRENCY x WEB_THREADS ({} x {}) exceeds "
+        "DATABASE_MAX_CONNECTIONS ({})".format(
+            WEB_CONCURRENCY, WEB_THREADS, DATABASE_MAX_CONNECTIONS
+        )
+    )
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_profiles.authentication.UserProfileJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSIONS_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson for JSON, and MessagePack for Accept/Content-Type: application/msgpack
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.ORJSONRenderer',
+        'backend.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.parsers.ORJSONParser',
+        'backend.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'COERCE_DECIMAL_TO_STRING': False
 }
 
@@ -138,8 +189,50 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Token',),
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=10),
     'REFRESH_TOKEN_LIFETIME': timedelta(minutes=360), #this is 6 hours
+    # adds the user_profile_id claim read by UserProfileJWTAuthentication
+    'TOKEN_OBTAIN_SERIALIZER': 'user_profiles.serializers.UserProfileTokenObtainPairSerializer',
+}
+
+# Fill the weekly and monthly quarter calendar caches when the
+# single_task app loads instead of on first use
+QUARTER_CALENDAR_PRECOMPUTE = env.bool("QUARTER_CALENDAR_PRECOMPUTE", default=False)
+
+# How long a stored Idempotency-Key response is replayed for retries
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# How long deleted SingleTasks are reported by the changes endpoint; older
+# sync cursors get 410 Gone and must reload. purge_task_tombstones drops
+# the older tombstones
+SINGLE_TASK_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Changes are re-sent for this long before the cursor, so a task saved by
+# a transaction that committed after the previous sync is not missed
+SINGLE_TASK_CHANGES_OVERLAP = timedelta(seconds=5)
+
+# Apply weekly, monthly and interval templates to a quarter as recurrence
+# rules that the task lists expand on read, storing a task only once an
+# occurrence is changed (single_task.recurrence). Before turning it off
+# again, store the remaining occurrences with materialize_recurrence_rules
+SINGLE_TASK_VIRTUAL_RECURRENCE = env.bool("SINGLE_TASK_VIRTUAL_RECURRENCE", default=False)
+
+# Rows per second the background job workers of one process may write in
+# total (0 for no limit), how often a failing job is tried, and after how
+# long without progress a running job is assumed dead and queued again
+JOBS_MAX_WRITES_PER_SECOND = env.int("JOBS_MAX_WRITES_PER_SECOND", default=2000)
+JOBS_MAX_ATTEMPTS = 3
+JOBS_STALE_AFTER = timedelta(minutes=10)
+
+# Local memory by default; set CACHE_URL (e.g. redis://..., memcache://...)
+# to share the cache between processes
+CACHES = {
+    'default': env.cache_url('CACHE_URL', default='locmemcache://'),
 }
 
+# The cache holding the per-user responses of the read endpoints, and how
+# long (in seconds) they are kept when no write invalidates them first
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -0,0 +1,59 @@
+"""
+Settings for the API-only deployment: run the workers with
+DJANGO_SETTINGS_MODULE=backend.settings_api.
+
+The Angular client authenticates every request with a JWT, so this
+profile drops what only the admin and the browsable API use:
+
+- the admin, sessions, messages, django_bootstrap5 and rangefilter apps,
+  so the admin modules and their templates are never imported
+- the session, CSRF, auth and messages middleware, and DRF's session
+  authentication and browsable API renderer
+- the admin URLs (see backend.urls_api)
+
+DEBUG is off unless the DEBUG environment variable turns it on. Run the
+admin from a separate process with backend.settings.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK, TEMPLATES, env
+
+DEBUG = env.bool("DEBUG", default=False)
+
+ADMIN_ONLY_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django_bootstrap5',
+    'rangefilter',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'backend.urls_api'
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {
+        'context_processors': [
+            'django.template.context_processors.request',
+        ],
+    },
+}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'user_profiles.authentication.UserProfileJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.ORJSONRenderer',
+        'backend.renderers.MessagePackRenderer',
+    ),
+}
@@ -0,0 +1,16 @@
+"""
+URL configuration of the API-only deployment (backend.settings_api): the
+API and auth URLs of backend.urls, without the admin.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('auth/', include('authapp.urls')),
+    path('api/interval-task/', include('interval_task_group.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/profiles/', include('user_profiles.urls')),
+    path('api/response-cache/', include('response_cache.urls')),
+    path('api/single-task/', include('single_task.urls')),
+    path('api/monthly-task/', include('monthly_task.urls')),
+    path('api/weekly-task/', include('weekly_task.urls')),
+]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('user_profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('request_path', models.CharField(max_length=255)),
+                ('response_status', models.PositiveSmallIntegerField()),
+                ('response_data', models.JSONField()),
+                ('created_date_time', models.DateTimeField(auto_now_add=True)),
+                ('user_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to='user_profiles.userprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'Idempotency Keys',
+                'indexes': [models.Index(fields=['created_date_time'], name='idempotency_created_idx')],
+                'unique_together': {('user_profile', 'key')},
+            },
+            managers=[
+                ('custom_query', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-17 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('idempotency', '0002_idempotencykey_response_headers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='request_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
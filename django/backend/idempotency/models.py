@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from user_profiles.models import UserProfile
+
+
+class IdempotencyKeyManager(models.Manager):
+    def live_key(self, user_profile_id, key):
+        """
+        Get a user's stored key if it has not expired yet, or None.
+        """
+        return self.get_queryset().filter(
+            user_profile_id=user_profile_id,
+            key=key,
+            created_date_time__gte=timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+        ).first()
+
+    def delete_expired(self):
+        """
+        Delete all keys older than IDEMPOTENCY_KEY_TTL.
+        """
+        return self.get_queryset().filter(
+            created_date_time__lt=timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+        ).delete()
+
+
+class IdempotencyKey(models.Model):
+    """
+    The response of a successful write request, stored under the client's
+    Idempotency-Key header so that retries can be answered without writing again.
+    """
+    custom_query = IdempotencyKeyManager()
+    objects = models.Manager()
+
+    key = models.CharField(max_length=255)
+
+    user_profile = models.ForeignKey(
+        UserProfile,
+        related_name='idempotency_keys',
+        on_delete=models.CASCADE
+    )
+
+    request_path = models.CharField(max_length=255)
+
+    # SHA-256 of the request body, so a key reused for another body is
+    # rejected instead of replayed; empty for keys stored without one
+    request_fingerprint = models.CharField(max_length=64, blank=True, default='')
+
+    response_status = models.PositiveSmallIntegerField()
+
+    response_data = models.JSONField()
+
+    # The response headers in REPLAYED_RESPONSE_HEADERS, e.g. the Location
+    # of a queued job
+    response_headers = models.JSONField(default=dict)
+
+    created_date_time = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return "{} {} - {}".format(
+            self.key,
+            self.request_path,
+            str(self.user_profile).title()
+        )
+
+    class Meta:
+        verbose_name_plural = 'Idempotency Keys'
+        unique_together = ('user_profile', 'key',)
+        indexes = [
+            models.Index(
+                fields=['created_date_time'],
+                name='idempotency_created_idx'
+            ),
+        ]
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from idempotency.models import IdempotencyKey
+from jobs.models import Job
+from jobs.utils import run_pending_jobs
+from response_cache.utils import get_response_cache
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+User = get_user_model()
+
+WEEKLY_APPLY_URL = '/api/weekly-task/applied-quarterly/'
+MONTHLY_APPLY_URL = '/api/monthly-task/applied-quarterly/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+class IdempotentApplyApiTests(TestCase):
+    """Test the Idempotency-Key handling of the quarterly apply endpoints"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        self.payload = {
+            'quarter': 'Q1',
+            'year': 2026,
+            'weekly_task_scheduler': self.weekly_task_scheduler.id
+        }
+        access_token = UserProfileTokenObtainPairSerializer.get_token(
+            self.test_user
+        ).access_token
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(access_token))
+
+    def apply_weekly_scheduler(self, idempotency_key, url=WEEKLY_APPLY_URL):
+        return self.client.post(
+            url, data=self.payload, format='json',
+            HTTP_IDEMPOTENCY_KEY=idempotency_key
+        )
+
+    def test_retry_replays_stored_response(self):
+        """Test that a retry with the same key does not write again"""
+        print("Test that a retry with the same key does not write again")
+        first_res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(first_res.status_code, status.HTTP_202_ACCEPTED)
+
+        # authenticate, then the single duplicate check
+        with self.assertNumQueries(2):
+            retry_res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(retry_res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry_res.data, first_res.data)
+        self.assertEqual(retry_res['Idempotent-Replayed'], 'true')
+        # the client can still find the queued job
+        self.assertEqual(retry_res['Location'], first_res['Location'])
+        self.assertEqual(WeeklyTaskAppliedQuarterly.objects.count(), 1)
+        self.assertEqual(Job.objects.count(), 1)
+        run_pending_jobs()
+        self.assertEqual(SingleTask.objects.count(), 13)
+
+    def test_key_reused_for_another_endpoint(self):
+        """Test that a key cannot be reused for a different request path"""
+        print("Test that a key cannot be reused for a different request path")
+        self.apply_weekly_scheduler('apply-1')
+        res = self.apply_weekly_scheduler('apply-1', url=MONTHLY_APPLY_URL)
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_key_reused_for_another_body(self):
+        """Test that a key cannot be reused with a different request body"""
+        print("Test that a key cannot be reused with a different request body")
+        self.apply_weekly_scheduler('apply-1')
+        self.payload['quarter'] = 'Q2'
+        res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(WeeklyTaskAppliedQuarterly.objects.count(), 1)
+
+        # the same data in another key order is the same request
+        self.payload = {
+            'weekly_task_scheduler': self.weekly_task_scheduler.id,
+            'year': 2026,
+            'quarter': 'Q1'
+        }
+        res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res['Idempotent-Replayed'], 'true')
+
+    def test_expired_key_is_evicted(self):
+        """Test that an expired key no longer replays and is evicted"""
+        print("Test that an expired key no longer replays and is evicted")
+        self.apply_weekly_scheduler('apply-1')
+        IdempotencyKey.objects.update(
+            created_date_time=IdempotencyKey.objects.get().created_date_time
+            - timedelta(days=2)
+        )
+        WeeklyTaskAppliedQuarterly.objects.all().delete()
+
+        res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotIn('Idempotent-Replayed', res)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_failed_apply_is_rolled_back(self):
+        """Test that a failure while queueing the job leaves no application"""
+        print("Test that a failure while queueing the job leaves no application")
+        with mock.patch.object(
+                Job.custom_query, 'enqueue', side_effect=Exception):
+            res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WeeklyTaskAppliedQuarterly.objects.exists())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        res = self.apply_weekly_scheduler('apply-1')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        run_pending_jobs()
+        self.assertEqual(SingleTask.objects.count(), 13)
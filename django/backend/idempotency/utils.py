@@ -0,0 +1,105 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from user_profiles.utils import get_user_profile_id
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# Headers of a stored response that are sent again with its replays
+REPLAYED_RESPONSE_HEADERS = ('Location',)
+
+
+def get_request_fingerprint(request) -> str:
+    """
+    Gets the SHA-256 of a request's parsed body, with sorted keys, so the
+    same data sent as JSON or MessagePack has the same fingerprint.
+    """
+    data = json.dumps(request.data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def replay_stored_response(
+        request, stored_key: IdempotencyKey, request_fingerprint: str
+) -> Response:
+    """Answers a retried request from the response stored under its key."""
+    if stored_key.request_path != request.path or (
+            stored_key.request_fingerprint
+            and stored_key.request_fingerprint != request_fingerprint):
+        return Response(
+            {"message": "This Idempotency-Key was already used for another request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(
+        stored_key.response_data,
+        status=stored_key.response_status,
+        headers={**stored_key.response_headers, IDEMPOTENCY_REPLAYED_HEADER: 'true'}
+    )
+
+
+def idempotent(view_method):
+    """
+    Decorator for write view methods that honours the Idempotency-Key header.
+
+    A retry with a key the user already sent gets the stored response back,
+    with its REPLAYED_RESPONSE_HEADERS, after a single lookup, without
+    calling the view again; reusing the key for another path or body is a
+    422. Otherwise the
+    view runs in a transaction together with storing its response, so two
+    concurrent requests with the same key cannot both write: the second
+    one fails on the unique key, is rolled back and replays the first.
+    Only successful responses are stored. Keys expire after
+    IDEMPOTENCY_KEY_TTL and expired keys are evicted on the next store.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response(
+                {"message": "The Idempotency-Key header is too long"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user_profile_id = get_user_profile_id(request)
+        request_fingerprint = get_request_fingerprint(request)
+        stored_key = IdempotencyKey.custom_query.live_key(user_profile_id, key)
+        if stored_key is not None:
+            return replay_stored_response(request, stored_key, request_fingerprint)
+
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    IdempotencyKey.custom_query.delete_expired()
+                    IdempotencyKey.objects.create(
+                        key=key,
+                        user_profile_id=user_profile_id,
+                        request_path=request.path,
+                        request_fingerprint=request_fingerprint,
+                        response_status=response.status_code,
+                        response_data=response.data,
+                        response_headers={
+                            header: response[header]
+                            for header in REPLAYED_RESPONSE_HEADERS
+                            if response.has_header(header)
+                        }
+                    )
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            stored_key = IdempotencyKey.custom_query.live_key(user_profile_id, key)
+            if stored_key is None:
+                raise
+            return replay_stored_response(request, stored_key, request_fingerprint)
+        return response
+
+    return wrapper
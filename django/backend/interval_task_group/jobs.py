@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from jobs.utils import job_handler
+from response_cache.utils import INTERVAL_TASK_GROUP_NAMESPACE
+from single_task.models import RECURRENCE_DAILY, RecurrenceRule
+from single_task.quarter_calendar import get_quarter_bounds
+from single_task.services import (
+    materialize_quarterly_application,
+    rerotate_quarterly_applications,
+)
+
+from .models import IntervalTaskGroupAppliedQuarterly, IntervalTaskScheduler
+from .utils import (
+    get_first_day_offset,
+    get_interval_scheduling_dates_by_quarter,
+    generate_task_batch_by_date_list_and_interval_task_list
+)
+
+APPLY_QUARTERLY_JOB = 'interval_task_group.apply_quarterly'
+
+
+def build_quarterly_tasks(quarterly_application):
+    """Builds the unsaved SingleTasks of an interval task group applied to a quarter."""
+    interval_task_group = quarterly_application.interval_task_group
+    return generate_task_batch_by_date_list_and_interval_task_list(
+        interval_task_group=interval_task_group,
+        scheduling_dates=get_interval_scheduling_dates_by_quarter(
+            interval=interval_task_group.interval_in_days,
+            year=quarterly_application.year,
+            quarter=quarterly_application.quarter,
+            first_day_offset=get_first_day_offset(quarterly_application)
+        ),
+        generation_batch=quarterly_application.generation_batch
+    )
+
+
+def build_recurrence_rule(quarterly_application):
+    """
+    Builds the unsaved RecurrenceRule of an interval task group applied to
+    a quarter, starting on the application's first day offset like the
+    materialized tasks.
+    """
+    interval_task_group = quarterly_application.interval_task_group
+    first_day_of_quarter, first_day_after_quarter = get_quarter_bounds(
+        quarterly_application.year, quarterly_application.quarter
+    )
+    return RecurrenceRule(
+        user_profile_id=interval_task_group.task_group_owner_id,
+        generation_batch=quarterly_application.generation_batch,
+        frequency=RECURRENCE_DAILY,
+        interval=interval_task_group.interval_in_days,
+        first_date=first_day_of_quarter + timedelta(
+            days=get_first_day_offset(quarterly_application)
+        ),
+        end_date=first_day_after_quarter,
+        task_names=[
+            interval_task.interval_task_name
+            for interval_task in interval_task_group.interval_tasks.all()
+        ]
+    )
+
+
+def rerotate_quarterly_tasks(interval_task_group):
+    """
+    Renames the future pending tasks of an interval task group's quarterly
+    applications to the group's current tasks, after tasks were added to
+    or removed from it.
+
+    Returns:
+        Tuple of (number of renamed tasks, set of the dates whose tasks changed)
+    """
+    return rerotate_quarterly_applications(
+        IntervalTaskGroupAppliedQuarterly.objects.filter(
+            interval_task_group=interval_task_group
+        ).select_related('interval_task_group'),
+        # the order the tasks are applied in
+        IntervalTaskScheduler.objects.filter(
+            interval_task_group=interval_task_group
+        ).order_by('interval_task_name', 'id').values_list('interval_task_name', flat=True)
+    )
+
+
+@job_handler(APPLY_QUARTERLY_JOB)
+def apply_quarterly(job, job_context):
+    """Creates the SingleTasks of an IntervalTaskGroupAppliedQuarterly."""
+    created_task_count = materialize_quarterly_application(
+        IntervalTaskGroupAppliedQuarterly.objects.select_related('interval_task_group'),
+        job.payload['quarterly_application_id'],
+        build_quarterly_tasks,
+        INTERVAL_TASK_GROUP_NAMESPACE,
+        job_context
+    )
+    return {'created_task_count': created_task_count}
@@ -0,0 +1,33 @@
+import uuid
+
+from django.db import migrations, models
+
+
+def generate_batch_ids(apps, schema_editor):
+    IntervalTaskGroupAppliedQuarterly = apps.get_model('interval_task_group', 'IntervalTaskGroupAppliedQuarterly')
+    for quarterly_application in IntervalTaskGroupAppliedQuarterly.objects.only('id').iterator():
+        quarterly_application.generation_batch = uuid.uuid4()
+        quarterly_application.save(update_fields=['generation_batch'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interval_task_group', '0001_initial'),
+    ]
+
+    operations = [
+        # Added as nullable first, so existing rows do not all receive the
+        # same default value, then filled in and made unique
+        migrations.AddField(
+            model_name='intervaltaskgroupappliedquarterly',
+            name='generation_batch',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(generate_batch_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='intervaltaskgroupappliedquarterly',
+            name='generation_batch',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
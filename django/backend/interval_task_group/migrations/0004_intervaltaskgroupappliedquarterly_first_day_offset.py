@@ -0,0 +1,63 @@
+# Generated by Django 4.2.13 on 2026-10-17 19:29
+
+import datetime
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Min
+from django.db.models.functions import Coalesce
+
+QUARTER_START_MONTHS = {'Q1': 1, 'Q2': 4, 'Q3': 7, 'Q4': 10}
+
+
+def store_first_day_offsets(apps, schema_editor):
+    """
+    Stores the offset the existing applications' tasks were generated with,
+    taken from their earliest task or recurrence rule. Applications without
+    either keep a null offset and use the default one.
+    """
+    IntervalTaskGroupAppliedQuarterly = apps.get_model('interval_task_group', 'IntervalTaskGroupAppliedQuarterly')
+    RecurrenceRule = apps.get_model('single_task', 'RecurrenceRule')
+    SingleTask = apps.get_model('single_task', 'SingleTask')
+    for quarterly_application in IntervalTaskGroupAppliedQuarterly.objects.select_related(
+            'interval_task_group').iterator():
+        first_dates = [
+            first_date for first_date in (
+                SingleTask._default_manager.filter(
+                    generation_batch=quarterly_application.generation_batch
+                ).aggregate(first_date=Min(Coalesce('occurrence_date', 'date')))['first_date'],
+                RecurrenceRule._default_manager.filter(
+                    generation_batch=quarterly_application.generation_batch
+                ).values_list('first_date', flat=True).first()
+            )
+            if first_date is not None
+        ]
+        if not first_dates:
+            continue
+        first_day_of_quarter = datetime.date(
+            quarterly_application.year, QUARTER_START_MONTHS[quarterly_application.quarter], 1
+        )
+        first_day_offset = (min(first_dates) - first_day_of_quarter).days
+        if first_day_offset > 6:
+            # the first tasks were deleted; later ones are whole intervals on
+            first_day_offset %= quarterly_application.interval_task_group.interval_in_days
+        if 0 <= first_day_offset <= 6:
+            quarterly_application.first_day_offset = first_day_offset
+            quarterly_application.save(update_fields=['first_day_offset'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_task', '0009_recurrencerule'),
+        ('interval_task_group', '0003_intervaltaskgroup_updated_date_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='intervaltaskgroupappliedquarterly',
+            name='first_day_offset',
+            field=models.SmallIntegerField(editable=False, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(6)]),
+        ),
+        migrations.RunPython(store_first_day_offsets, migrations.RunPython.noop),
+    ]
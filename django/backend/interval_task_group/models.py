@@ -1,5 +1,9 @@
+import uuid
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Prefetch
+from django.utils import timezone
 
 from user_profiles.models import UserProfile
 
@@ -26,6 +30,24 @@ class IntervalTaskGroupManager(models.Manager):
             task_group_owner_id=user_profile_id
         )
 
+    def with_interval_tasks(self):
+        """
+        Get interval task groups with their interval tasks prefetched,
+        so serializing many groups costs two queries instead of one per group.
+        """
+        return self.get_queryset().prefetch_related(
+            get_interval_tasks_prefetch()
+        )
+
+    def touch(self, task_group_id):
+        """
+        Bump a group's updated_date_time after its interval tasks changed,
+        so the group lists' ETag and Last-Modified change with them.
+        """
+        return self.get_queryset().filter(id=task_group_id).update(
+            updated_date_time=timezone.now()
+        )
+
 
 class IntervalTaskGroup(models.Model):
     custom_query = IntervalTaskGroupManager()
@@ -42,6 +64,9 @@ class IntervalTaskGroup(models.Model):
         related_name='interval_task_groups',
         on_delete=models.CASCADE
     )
+
+    # Also bumped when the group's interval tasks change
+    updated_date_time = models.DateTimeField(auto_now=True)
     
     @property
     def template_selector_string(self):
@@ -92,6 +117,19 @@ class IntervalTaskScheduler(models.Model):
         ordering = ['interval_task_group', 'interval_task_name']
 
 
+def get_interval_tasks_prefetch():
+    """
+    Prefetch for the interval tasks of one or more groups.
+
+    The tasks are ordered by name only; ordering by the group, as the model's
+    default ordering does, would join back to the group and its owner.
+    """
+    return Prefetch(
+        'interval_tasks',
+        queryset=IntervalTaskScheduler.objects.order_by('interval_task_name', 'id')
+    )
+
+
 class IntervalTaskGroupAppliedQuarterly(models.Model):
     quarter = models.CharField(
         max_length=2,
@@ -110,6 +148,26 @@ class IntervalTaskGroupAppliedQuarterly(models.Model):
         related_name='quarterly_applications',
         on_delete=models.CASCADE
     )
+
+    # Shared by every SingleTask generated for this application, so they
+    # can be found and deleted together
+    generation_batch = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False
+    )
+
+    # Days between the first day of the quarter and the first task, kept so
+    # the tasks can be regenerated on the same dates; null for applications
+    # saved without one, which use the group's default offset
+    first_day_offset = models.SmallIntegerField(
+        null=True,
+        editable=False,
+        validators=[
+            MinValueValidator(0),
+            MaxValueValidator(6)
+        ]
+    )
     
     class Meta:
         verbose_name_plural = 'Interval Task Groups Applied Quarterly'
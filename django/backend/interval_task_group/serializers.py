@@ -29,11 +29,15 @@ class IntervalTaskGroupAppliedQuarterlySerializer(serializers.ModelSerializer):
     Lightweight serializer that only includes the task group ID.
     The frontend already has all task groups cached, so we don't need
     to send the full task group data with each quarterly application.
+
+    With balance_load, the first day offset is picked to put the group's
+    tasks on the quarter's least busy dates instead of the default one.
     """
+    balance_load = serializers.BooleanField(write_only=True, required=False, default=False)
     
     class Meta:
         model = IntervalTaskGroupAppliedQuarterly
         fields = (
             'id', 'quarter', 'year',
-            'interval_task_group'
+            'interval_task_group', 'first_day_offset', 'balance_load'
         )
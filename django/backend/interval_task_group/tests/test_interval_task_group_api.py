@@ -0,0 +1,415 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interval_task_group.models import (
+    IntervalTaskGroup,
+    IntervalTaskScheduler,
+    IntervalTaskGroupAppliedQuarterly
+)
+from interval_task_group.utils import get_default_first_day_offset
+from jobs.models import Job
+from jobs.utils import run_pending_jobs
+from response_cache.utils import get_response_cache
+from single_task.models import SingleTask
+from single_task.quarter_calendar import get_interval_dates, get_interval_start_offsets
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+INTERVAL_TASK_URL = '/api/interval-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class IntervalTaskGroupQueryCountApiTests(TestCase):
+    """Test the number of queries issued by the interval task group API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Wipe surfaces',
+            interval_in_days=3,
+            task_group_owner=self.test_user_profile
+        )
+        IntervalTaskScheduler.objects.create(
+            interval_task_name='Wipe kitchen counter',
+            interval_task_group=self.interval_task_group
+        )
+        for quarter in ('Q1', 'Q2'):
+            IntervalTaskGroupAppliedQuarterly.objects.create(
+                quarter=quarter,
+                year=2026,
+                interval_task_group=self.interval_task_group
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_applied_quarterly_list_query_count(self):
+        """Test the applied quarterly list view query count"""
+        print("Test the applied quarterly list view query count")
+        # one query to authenticate the user, one for the applications
+        with self.assertNumQueries(2):
+            res = self.client.get('{}applied-quarterly/'.format(INTERVAL_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+    def test_applied_quarterly_filtered_query_count(self):
+        """Test the applied quarterly list filtered by quarter and year"""
+        print("Test the applied quarterly list filtered by quarter and year")
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                '{}applied-quarterly/Q1/2026/'.format(INTERVAL_TASK_URL)
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_group_create_query_count(self):
+        """Test creating a group does not look up the user profile"""
+        print("Test creating a group does not look up the user profile")
+        payload = {
+            'task_group_name': 'Water plants',
+            'interval_in_days': 2
+        }
+        # authenticate, insert, then the group's (empty) interval tasks
+        with self.assertNumQueries(3):
+            res = self.client.post(
+                '{}group/'.format(INTERVAL_TASK_URL), data=payload, format='json'
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+
+class IntervalTaskGroupPrefetchApiTests(TestCase):
+    """Test that serializing interval task groups does not cost a query per group"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def create_interval_task_groups(self, number_of_groups):
+        for group_number in range(number_of_groups):
+            interval_task_group = IntervalTaskGroup.objects.create(
+                task_group_name='Group {}'.format(group_number),
+                interval_in_days=group_number + 1,
+                task_group_owner=self.test_user_profile
+            )
+            for task_number in range(3):
+                IntervalTaskScheduler.objects.create(
+                    interval_task_name='Task {}'.format(task_number),
+                    interval_task_group=interval_task_group
+                )
+
+    def assert_constant_query_count(self, url, expected_number_of_queries):
+        for number_of_groups in (1, 10):
+            self.create_interval_task_groups(number_of_groups)
+            # the groups were created without the API, so drop the cached list
+            get_response_cache().clear()
+            # authenticate, the list's version stamp, the groups, then all
+            # of their interval tasks
+            with self.assertNumQueries(expected_number_of_queries):
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            for group in res.data:
+                self.assertEqual(len(group['interval_tasks']), 3)
+
+    def test_groups_by_user_constant_query_count(self):
+        """Test the groups list view query count does not grow with the groups"""
+        print("Test the groups list view query count does not grow with the groups")
+        self.assert_constant_query_count('{}groups/'.format(INTERVAL_TASK_URL), 4)
+
+    def test_group_viewset_list_constant_query_count(self):
+        """Test the group viewset list query count does not grow with the groups"""
+        print("Test the group viewset list query count does not grow with the groups")
+        self.assert_constant_query_count('{}group/'.format(INTERVAL_TASK_URL), 4)
+
+    def test_group_viewset_retrieve_query_count(self):
+        """Test retrieving a group prefetches its interval tasks"""
+        print("Test retrieving a group prefetches its interval tasks")
+        self.create_interval_task_groups(1)
+        interval_task_group = IntervalTaskGroup.objects.get()
+        with self.assertNumQueries(3):
+            res = self.client.get('{}group/{}/'.format(
+                INTERVAL_TASK_URL, interval_task_group.id
+            ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['interval_tasks']), 3)
+
+    def test_scheduler_create_query_count(self):
+        """Test adding a task to a group and re-serializing the group"""
+        print("Test adding a task to a group and re-serializing the group")
+        self.create_interval_task_groups(1)
+        interval_task_group = IntervalTaskGroup.objects.get()
+        payload = {
+            'interval_task_name': 'Task 3',
+            'interval_task_group': interval_task_group.id
+        }
+        # authenticate, the group, then in a savepoint (a transaction outside
+        # of tests) the insert, touching the group and the group's quarterly
+        # applications to re-rotate, then the group's tasks
+        with self.assertNumQueries(8):
+            res = self.client.post(
+                '{}create-scheduler/'.format(INTERVAL_TASK_URL),
+                data=payload, format='json'
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['interval_tasks']), 4)
+
+    def test_scheduler_delete_query_count(self):
+        """Test removing a task from a group and re-serializing the group"""
+        print("Test removing a task from a group and re-serializing the group")
+        self.create_interval_task_groups(1)
+        interval_task_group = IntervalTaskGroup.objects.get()
+        interval_task = interval_task_group.interval_tasks.first()
+        # authenticate, the group, then in a savepoint (a transaction outside
+        # of tests) the delete, touching the group and the group's quarterly
+        # applications to re-rotate, then the group's tasks
+        with self.assertNumQueries(8):
+            res = self.client.delete('{}delete-scheduler/{}/{}/'.format(
+                INTERVAL_TASK_URL, interval_task.id, interval_task_group.id
+            ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['interval_tasks']), 2)
+        self.assertFalse(
+            IntervalTaskScheduler.objects.filter(id=interval_task.id).exists()
+        )
+
+    def test_scheduler_delete_missing_task(self):
+        """Test removing a task that is not in the group fails"""
+        print("Test removing a task that is not in the group fails")
+        self.create_interval_task_groups(1)
+        interval_task_group = IntervalTaskGroup.objects.get()
+        res = self.client.delete('{}delete-scheduler/{}/{}/'.format(
+            INTERVAL_TASK_URL, 0, interval_task_group.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class IntervalTaskRotationApiTests(TestCase):
+    """Test adding and removing tasks re-rotates the generated tasks"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts',
+            interval_in_days=2,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('A', 'B'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=self.interval_task_group
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+        self.today = datetime.date.today()
+        self.client.post('{}applied-quarterly/'.format(INTERVAL_TASK_URL), {
+            'quarter': 'Q{}'.format((self.today.month - 1) // 3 + 1),
+            'year': self.today.year,
+            'interval_task_group': self.interval_task_group.id
+        }, format='json')
+        run_pending_jobs()
+        self.first_date = SingleTask.objects.order_by('date').first().date
+        self.past_tasks = list(SingleTask.objects.filter(
+            date__lt=self.today).order_by('date').values_list('date', 'task_name'))
+
+    def assert_rotation(self, task_names):
+        for task in SingleTask.objects.filter(date__gte=self.today):
+            occurrence_number = (task.date - self.first_date).days // 2
+            self.assertEqual(task.task_name, task_names[occurrence_number % len(task_names)])
+        self.assertEqual(
+            list(SingleTask.objects.filter(date__lt=self.today).order_by('date')
+                 .values_list('date', 'task_name')),
+            self.past_tasks
+        )
+
+    def test_added_task_is_rotated_in(self):
+        """Test a new task takes its turn in the future tasks"""
+        print("Test a new task takes its turn in the future tasks")
+        task_names = list(SingleTask.objects.values_list('task_name', flat=True))
+        res = self.client.post('{}create-scheduler/'.format(INTERVAL_TASK_URL), {
+            'interval_task_name': 'C',
+            'interval_task_group': self.interval_task_group.id
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assert_rotation('ABC')
+        self.assertEqual(
+            res.data['updated_task_count'],
+            sum(old_name != new_name for old_name, new_name in zip(
+                task_names, SingleTask.objects.values_list('task_name', flat=True)))
+        )
+
+    def test_removed_task_is_rotated_out(self):
+        """Test the future tasks of a removed task go to the remaining tasks"""
+        print("Test the future tasks of a removed task go to the remaining tasks")
+        interval_task = IntervalTaskScheduler.objects.get(interval_task_name='A')
+        res = self.client.delete('{}delete-scheduler/{}/{}/'.format(
+            INTERVAL_TASK_URL, interval_task.id, self.interval_task_group.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assert_rotation('B')
+
+    def test_destroy_group_deletes_generated_tasks(self):
+        """Test deleting the group deletes the tasks of its applications"""
+        print("Test deleting the group deletes the tasks of its applications")
+        generated_task_count = SingleTask.objects.count()
+        res = self.client.delete('{}group/{}/'.format(
+            INTERVAL_TASK_URL, self.interval_task_group.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], generated_task_count)
+        self.assertFalse(IntervalTaskGroupAppliedQuarterly.objects.exists())
+        self.assertFalse(SingleTask.objects.exists())
+
+
+class IntervalTaskStartOffsetApiTests(TestCase):
+    """Test applying an interval task group starts on a reproducible day"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts',
+            interval_in_days=3,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('A', 'B'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=self.interval_task_group
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+        self.default_offset = get_default_first_day_offset(
+            self.interval_task_group.id, 3, 2026, 'Q1'
+        )
+
+    def apply(self, **data):
+        res = self.client.post('{}applied-quarterly/'.format(INTERVAL_TASK_URL), {
+            'quarter': 'Q1',
+            'year': 2026,
+            'interval_task_group': self.interval_task_group.id,
+            **data
+        }, format='json')
+        run_pending_jobs()
+        return res
+
+    def get_generated_tasks(self, quarterly_application_id):
+        return list(SingleTask.objects.filter(
+            generation_batch=IntervalTaskGroupAppliedQuarterly.objects.get(
+                id=quarterly_application_id).generation_batch
+        ).order_by('date').values_list('date', 'task_name'))
+
+    def test_default_offset_is_stable(self):
+        """Test the default offset depends on the group, year and quarter only"""
+        print("Test the default offset depends on the group, year and quarter only")
+        start_offsets = get_interval_start_offsets(3, 2026, 'Q1')
+        self.assertIn(self.default_offset, start_offsets)
+        self.assertEqual(
+            get_default_first_day_offset(self.interval_task_group.id, 3, 2026, 'Q1'),
+            self.default_offset
+        )
+        # the groups are spread over the possible starting days
+        self.assertEqual(
+            {get_default_first_day_offset(group_id, 3, 2026, 'Q1') for group_id in range(1, 50)},
+            set(start_offsets)
+        )
+
+    def test_reapplying_gives_the_same_tasks(self):
+        """Test re-applying a group to a quarter regenerates the same tasks"""
+        print("Test re-applying a group to a quarter regenerates the same tasks")
+        res = self.apply()
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['first_day_offset'], self.default_offset)
+        tasks = self.get_generated_tasks(res.data['id'])
+        self.assertEqual(
+            tasks[0][0], datetime.date(2026, 1, 1) + datetime.timedelta(days=self.default_offset)
+        )
+
+        self.client.delete('{}applied-quarterly/{}/'.format(INTERVAL_TASK_URL, res.data['id']))
+        self.assertFalse(SingleTask.objects.exists())
+        res = self.apply()
+        self.assertEqual(self.get_generated_tasks(res.data['id']), tasks)
+
+    def test_balance_load(self):
+        """Test balance_load starts the group on the dates with the fewest tasks"""
+        print("Test balance_load starts the group on the dates with the fewest tasks")
+        start_offsets = get_interval_start_offsets(3, 2026, 'Q1')
+        least_loaded_offset = next(
+            offset for offset in start_offsets if offset != self.default_offset
+        )
+        SingleTask.objects.bulk_create([
+            SingleTask(
+                task_name='Busy', date=task_date, user_profile=self.test_user_profile
+            )
+            for offset in start_offsets if offset != least_loaded_offset
+            for task_date in get_interval_dates(3, offset, 2026, 'Q1')
+        ])
+
+        res = self.apply(balance_load=True)
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['first_day_offset'], least_loaded_offset)
+        self.assertNotIn('balance_load', res.data)
+
+    def test_group_without_interval_tasks_is_rejected(self):
+        """Test applying a group without interval tasks fails without queueing a job"""
+        print("Test applying a group without interval tasks fails without queueing a job")
+        self.interval_task_group.interval_tasks.all().delete()
+        res = self.apply()
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('message', res.data)
+        self.assertFalse(IntervalTaskGroupAppliedQuarterly.objects.exists())
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(SingleTask.objects.filter(
+            task_name__in=('A', 'B'),
+            date__in=SingleTask.objects.filter(task_name='Busy').values('date')
+        ).exists())
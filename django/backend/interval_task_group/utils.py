@@ -1,98 +1,133 @@
-from datetime import date, timedelta
-from typing import List
-import random
+from collections import Counter
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+import zlib
 
-from single_task.models import SingleTask
-from weekly_task.utils import get_first_day_of_week_by_year_and_quarter
+from django.conf import settings
+from django.db.models import Count
 
+from single_task.models import TASK_STATUS_PENDING, SingleTask
+from single_task.quarter_calendar import (
+    get_interval_dates,
+    get_interval_start_offsets,
+    get_quarter_bounds,
+)
+from single_task.recurrence import get_virtual_tasks
 
-def get_first_date_for_interval_task_by_year_and_quarter(
-        interval: int, year: int, quarter: str
-) -> date:
+
+def get_default_first_day_offset(
+        interval_task_group_id: int, interval: int, year: int, quarter: str
+) -> int:
     """
-    Gets a random starting date within the first week of a quarter for interval tasks.
-    
-    If interval is 7 or less, picks a random day from days 0 to interval-1.
-    If interval is greater than 7, picks any random day from 0-6.
-    
+    Gets the number of days between the first day of a quarter and the
+    first date of an interval task group applied to it.
+
+    The offset is one of the first week's possible starting days, picked
+    by a stable hash of the group, year and quarter, so that applying the
+    same group to the same quarter always gives the same dates while
+    different groups are spread over the week.
+
     Args:
+        interval_task_group_id: The id of the IntervalTaskGroup
         interval: The number of days between task occurrences
         year: The year
         quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
-    
+
     Returns:
-        A random date within the first week of the quarter
+        An offset from 0 to 6
     """
-    # Days of the week: 0=Monday through 6=Sunday
-    # Reorder to match Java's array: Sunday=0, Monday=1, etc.
-    possible_days_to_begin = [6, 0, 1, 2, 3, 4, 5]  # [Sunday, Monday, ..., Saturday]
-    
-    # Determine the range for random selection
-    daily_index = interval if interval <= 7 else 7
-    
-    # Pick a random index
-    random_index = random.randint(0, daily_index - 1)
-    
-    # Get the corresponding day of week (in Python's 0=Monday format)
-    beginning_day_of_week = possible_days_to_begin[random_index]
-    
-    # Use the existing function to get the first occurrence of that day in the quarter
-    return get_first_day_of_week_by_year_and_quarter(
-        beginning_day_of_week, year, quarter
+    offsets = get_interval_start_offsets(interval, year, quarter)
+    seed = zlib.crc32('{}:{}:{}'.format(interval_task_group_id, year, quarter).encode())
+    return offsets[seed % len(offsets)]
+
+
+def get_least_loaded_first_day_offset(interval_task_group, year: int, quarter: str) -> int:
+    """
+    Gets the first day offset of an interval task group for a quarter
+    whose dates have the fewest of the owner's tasks, so the group's tasks
+    land on the quarter's lighter days. Ties go to the default offset.
+
+    Args:
+        interval_task_group: The IntervalTaskGroup
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        An offset from 0 to 6
+    """
+    interval = interval_task_group.interval_in_days
+    first_day_of_quarter, first_day_after_quarter = get_quarter_bounds(year, quarter)
+    tasks_per_date = Counter(dict(
+        SingleTask.objects.filter(
+            user_profile_id=interval_task_group.task_group_owner_id,
+            date__gte=first_day_of_quarter,
+            date__lt=first_day_after_quarter
+        ).order_by().values('date').annotate(
+            number_of_tasks=Count('id')
+        ).values_list('date', 'number_of_tasks')
+    ))
+    if settings.SINGLE_TASK_VIRTUAL_RECURRENCE:
+        tasks_per_date.update(task.date for task in get_virtual_tasks(
+            interval_task_group.task_group_owner_id,
+            first_day_of_quarter, first_day_after_quarter
+        ))
+
+    default_offset = get_default_first_day_offset(
+        interval_task_group.id, interval, year, quarter
+    )
+    return min(
+        get_interval_start_offsets(interval, year, quarter),
+        key=lambda offset: (
+            sum(tasks_per_date[task_date]
+                for task_date in get_interval_dates(interval, offset, year, quarter)),
+            offset != default_offset,
+            offset
+        )
+    )
+
+
+def get_first_day_offset(quarterly_application) -> int:
+    """
+    Gets the first day offset of an IntervalTaskGroupAppliedQuarterly,
+    falling back to the default one for applications saved without it.
+    """
+    if quarterly_application.first_day_offset is not None:
+        return quarterly_application.first_day_offset
+    return get_default_first_day_offset(
+        quarterly_application.interval_task_group_id,
+        quarterly_application.interval_task_group.interval_in_days,
+        quarterly_application.year,
+        quarterly_application.quarter
     )
 
 
 def get_interval_scheduling_dates_by_quarter(
-        interval: int, year: int, quarter: str
+        interval: int, year: int, quarter: str, first_day_offset: int
 ) -> List[date]:
     """
     Gets all dates for interval task scheduling within a given quarter.
     
-    Starts with a random date in the first week of the quarter,
-    then adds dates at the specified interval throughout the quarter.
+    Starts first_day_offset days into the quarter, then adds dates at the
+    specified interval throughout the quarter, so the same arguments
+    always give the same dates.
     
     Args:
         interval: The number of days between task occurrences
         year: The year
         quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+        first_day_offset: Days between the first day of the quarter and the first date
     
     Returns:
         List of dates separated by the specified interval
     """
-    dates = []
-    
-    # Get the randomly generated starting date
-    date_in_quarter = get_first_date_for_interval_task_by_year_and_quarter(
-        interval, year, quarter
-    )
-    
-    if quarter == 'Q1':
-        # Q1: January-March, ends when we hit April (month 4)
-        while date_in_quarter.month < 4:
-            dates.append(date_in_quarter)
-            date_in_quarter = date_in_quarter + timedelta(days=interval)
-    elif quarter == 'Q2':
-        # Q2: April-June, ends when we hit July (month 7)
-        while date_in_quarter.month < 7:
-            dates.append(date_in_quarter)
-            date_in_quarter = date_in_quarter + timedelta(days=interval)
-    elif quarter == 'Q3':
-        # Q3: July-September, ends when we hit October (month 10)
-        while date_in_quarter.month < 10:
-            dates.append(date_in_quarter)
-            date_in_quarter = date_in_quarter + timedelta(days=interval)
-    else:  # Q4
-        # Q4: October-December, ends when we hit next year
-        next_year = year + 1
-        while date_in_quarter.year < next_year:
-            dates.append(date_in_quarter)
-            date_in_quarter = date_in_quarter + timedelta(days=interval)
-    
-    return dates
+    # The cached tuple is shared, so hand out a copy
+    return list(get_interval_dates(interval, first_day_offset, year, quarter))
 
 
 def generate_task_batch_by_date_list_and_interval_task_list(
-        interval_task_group, scheduling_dates: List[date]
+        interval_task_group, scheduling_dates: List[date],
+        generation_batch: Optional[UUID] = None
 ) -> List[SingleTask]:
     """
     Generates a batch of SingleTask instances by cycling through interval tasks.
@@ -103,6 +138,9 @@ def generate_task_batch_by_date_list_and_interval_task_list(
     Args:
         interval_task_group: IntervalTaskGroup instance with related interval_tasks
         scheduling_dates: List of dates on which to schedule tasks
+        generation_batch: The generation_batch of the quarterly application
+            creating the tasks; each task's date is then also stored as its
+            occurrence_date
     
     Returns:
         List of SingleTask instances (not yet saved to database)
@@ -125,8 +163,10 @@ def generate_task_batch_by_date_list_and_interval_task_list(
         single_task = SingleTask(
             task_name=interval_task.interval_task_name,
             date=task_date,
-            user_profile=interval_task_group.task_group_owner,
-            status='pending'
+            user_profile_id=interval_task_group.task_group_owner_id,
+            status=TASK_STATUS_PENDING,
+            generation_batch=generation_batch,
+            occurrence_date=task_date if generation_batch else None
         )
         
         batch_of_tasks.append(single_task)
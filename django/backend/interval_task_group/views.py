@@ -2,64 +2,127 @@ from rest_framework import generics, status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from idempotency.utils import idempotent
+from jobs.models import Job
+from response_cache.conditional import ConditionalListMixin
+from response_cache.utils import (
+    INTERVAL_TASK_GROUP_NAMESPACE,
+    CachedListMixin,
+    get_quarter_namespaces,
+    get_single_task_namespace,
+    invalidate_cached_responses
+)
+from single_task.utils import GENERATED_TASK_CASCADE_MODES, delete_generated_tasks
+from user_profiles.utils import get_user_profile_id
 
-from single_task.models import SingleTask
+from .jobs import APPLY_QUARTERLY_JOB, build_recurrence_rule, rerotate_quarterly_tasks
 from .models import (
     IntervalTaskGroup,
     IntervalTaskScheduler,
-    IntervalTaskGroupAppliedQuarterly
+    IntervalTaskGroupAppliedQuarterly,
+    get_interval_tasks_prefetch
 )
 from .serializers import (
     IntervalTaskGroupSerializer,
     #IntervalTaskSchedulerSerializer,
     IntervalTaskGroupAppliedQuarterlySerializer
 )
-from .utils import (
-    get_interval_scheduling_dates_by_quarter,
-    generate_task_batch_by_date_list_and_interval_task_list
-)
+from .utils import get_default_first_day_offset, get_least_loaded_first_day_offset
 
 
-class IntervalTaskGroupAppliedQuarterlyViewSet(viewsets.ModelViewSet):
+class IntervalTaskGroupAppliedQuarterlyViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for IntervalTaskGroupAppliedQuarterly.
-    Applying an interval task group to a quarter creates SingleTask instances
+    Applying an interval task group to a quarter queues a job that creates SingleTask instances
     cycling through the group's tasks at the specified interval.
     """
     permission_classes = (IsAuthenticated,)
     queryset = IntervalTaskGroupAppliedQuarterly.objects.all()
     serializer_class = IntervalTaskGroupAppliedQuarterlySerializer
+    cache_namespace = INTERVAL_TASK_GROUP_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        # Only the authenticated user's applications can be listed or deleted
+        queryset = IntervalTaskGroupAppliedQuarterly.objects.filter(
+            interval_task_group__task_group_owner_id=get_user_profile_id(self.request)
+        )
+        return queryset.order_by(
+            '-year', '-quarter',
+            'interval_task_group__task_group_name'
+        )
+
+    @idempotent
     def create(self, request, *args, **kwargs):
-        """Create a quarterly application and generate all SingleTask instances."""
+        """
+        Create a quarterly application and queue a job that generates its
+        SingleTask instances. Responds with 202 and the job's id; the job's
+        progress is at /api/jobs/<job_id>/. With
+        SINGLE_TASK_VIRTUAL_RECURRENCE on, the application is stored as a
+        RecurrenceRule instead, and the response is 201.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        interval_task_group = serializer.validated_data['interval_task_group']
+        # The tasks rotate through the group's interval tasks, so there must be one
+        if not interval_task_group.interval_tasks.exists():
+            return Response(
+                {"message": "Add an interval task to the group before applying it"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            quarter = serializer.validated_data['quarter']
             year = serializer.validated_data['year']
-            interval_task_group = serializer.validated_data['interval_task_group']
-
-            # Generate list of dates for this quarter at the specified interval
-            scheduling_dates = get_interval_scheduling_dates_by_quarter(
-                interval=interval_task_group.interval_in_days,
-                year=year,
-                quarter=quarter
+            quarter = serializer.validated_data['quarter']
+            # Stored, so the tasks can always be regenerated on the same dates
+            if serializer.validated_data.pop('balance_load'):
+                first_day_offset = get_least_loaded_first_day_offset(
+                    interval_task_group, year, quarter
+                )
+            else:
+                first_day_offset = get_default_first_day_offset(
+                    interval_task_group.id, interval_task_group.interval_in_days, year, quarter
+                )
+
+            if settings.SINGLE_TASK_VIRTUAL_RECURRENCE:
+                with transaction.atomic():
+                    quarterly_application = serializer.save(first_day_offset=first_day_offset)
+                    build_recurrence_rule(quarterly_application).save()
+
+                invalidate_cached_responses(
+                    [interval_task_group.task_group_owner_id],
+                    [INTERVAL_TASK_GROUP_NAMESPACE] + get_quarter_namespaces(
+                        quarterly_application.year, quarterly_application.quarter
+                    )
+                )
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+            # Save the quarterly application and queue the job creating its
+            # tasks together, so an application is never left without a job
+            with transaction.atomic():
+                quarterly_application = serializer.save(first_day_offset=first_day_offset)
+                job = Job.custom_query.enqueue(
+                    APPLY_QUARTERLY_JOB,
+                    {'quarterly_application_id': quarterly_application.id},
+                    user_profile_id=interval_task_group.task_group_owner_id
+                )
+
+            # The job invalidates the quarter's months once their tasks exist
+            invalidate_cached_responses(
+                [interval_task_group.task_group_owner_id], [INTERVAL_TASK_GROUP_NAMESPACE]
             )
-
-            # Save the quarterly application
-            serializer.save()
-
-            # Generate and save all SingleTask instances, cycling through interval tasks
-            batch_of_tasks = generate_task_batch_by_date_list_and_interval_task_list(
-                interval_task_group=interval_task_group,
-                scheduling_dates=scheduling_dates
+            return Response(
+                {**serializer.data, 'job_id': job.id},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse('jobs:job-detail', kwargs={'id': job.id})}
             )
-            SingleTask.objects.bulk_create(batch_of_tasks)
-
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response(
                 {"message": "There was an error. Please try again"},
@@ -67,17 +130,43 @@ class IntervalTaskGroupAppliedQuarterlyViewSet(viewsets.ModelViewSet):
             )
 
     def destroy(self, request, *args, **kwargs):
-        """Delete the quarterly application."""
+        """
+        Delete the quarterly application and the SingleTask instances it generated.
+        ?cascade=pending keeps tasks that were completed, deferred or cancelled,
+        ?cascade=none keeps all of them.
+        """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             quarterly_application = self.get_object()
             deleted_id = quarterly_application.id
 
-            # Delete the quarterly application
-            quarterly_application.delete()
+            # Delete the generated tasks and the quarterly application together,
+            # locking the application so a running job cannot add tasks meanwhile
+            with transaction.atomic():
+                IntervalTaskGroupAppliedQuarterly.objects.select_for_update().filter(id=deleted_id).exists()
+                deleted_task_count = delete_generated_tasks(
+                    quarterly_application.generation_batch, cascade
+                )
+                quarterly_application.delete()
+
+            invalidate_cached_responses(
+                [get_user_profile_id(request)],
+                [INTERVAL_TASK_GROUP_NAMESPACE] + get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            )
 
             return Response({
                 "message": "Interval task group application successfully deleted!",
-                "id": deleted_id
+                "id": deleted_id,
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -90,7 +179,7 @@ class IntervalTaskGroupAppliedQuarterlyViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class IntervalTaskGroupAppliedQuarterlyListView(generics.ListAPIView):
+class IntervalTaskGroupAppliedQuarterlyListView(CachedListMixin, generics.ListAPIView):
     """
     Get all interval task groups applied quarterly for the authenticated user.
     Can be filtered by quarter and year via URL parameters.
@@ -98,22 +187,24 @@ class IntervalTaskGroupAppliedQuarterlyListView(generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
     queryset = IntervalTaskGroupAppliedQuarterly.objects.all()
     serializer_class = IntervalTaskGroupAppliedQuarterlySerializer
+    cache_namespace = INTERVAL_TASK_GROUP_NAMESPACE
 
     def get_queryset(self):
         # Check if filtering by quarter and year
         quarter = self.kwargs.get("quarter")
         year = self.kwargs.get("year")
+        user_profile_id = get_user_profile_id(self.request)
 
         if quarter and year:
             queryset = IntervalTaskGroupAppliedQuarterly.objects.filter(
-                interval_task_group__task_group_owner__user=self.request.user,
+                interval_task_group__task_group_owner_id=user_profile_id,
                 quarter=quarter,
                 year=year
             )
         else:
             # Return all quarterly applications for the user
             queryset = IntervalTaskGroupAppliedQuarterly.objects.filter(
-                interval_task_group__task_group_owner__user=self.request.user
+                interval_task_group__task_group_owner_id=user_profile_id
             )
 
         return queryset.order_by(
@@ -122,15 +213,22 @@ class IntervalTaskGroupAppliedQuarterlyListView(generics.ListAPIView):
         )
 
 
-class IntervalTaskGroupViewSet(viewsets.ModelViewSet):
+class IntervalTaskGroupViewSet(ConditionalListMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for IntervalTaskGroup.
     """
     permission_classes = (IsAuthenticated,)
     queryset = IntervalTaskGroup.objects.all()
     serializer_class = IntervalTaskGroupSerializer
+    cache_namespace = INTERVAL_TASK_GROUP_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        queryset = IntervalTaskGroup.custom_query.with_interval_tasks().filter(
+            task_group_owner_id=get_user_profile_id(self.request)
+        )
+        return queryset.order_by('task_group_name')
+
     def create(self, request, *args, **kwargs):
         """Create a new interval task group."""
         serializer = self.get_serializer(data=request.data)
@@ -139,8 +237,9 @@ class IntervalTaskGroupViewSet(viewsets.ModelViewSet):
         try:
             # Automatically set task_group_owner from authenticated user
             new_group = serializer.save(
-                task_group_owner=request.user.userprofile
+                task_group_owner_id=get_user_profile_id(request)
             )
+            invalidate_cached_responses([new_group.task_group_owner_id], [INTERVAL_TASK_GROUP_NAMESPACE])
             return Response(
                 serializer.data,
                 status=status.HTTP_201_CREATED
@@ -152,14 +251,47 @@ class IntervalTaskGroupViewSet(viewsets.ModelViewSet):
             )
 
     def destroy(self, request, *args, **kwargs):
-        """Delete an interval task group."""
+        """
+        Delete an interval task group, its quarterly applications and the
+        SingleTask instances they generated. ?cascade=pending keeps tasks
+        that were completed, deferred or cancelled, ?cascade=none keeps all
+        of them.
+        """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             instance = self.get_object()
             group_id = instance.id
-            self.perform_destroy(instance)
+
+            # The applications are deleted with the group, so delete
+            # their tasks first, locking them so no job adds tasks meanwhile
+            with transaction.atomic():
+                quarterly_applications = list(
+                    IntervalTaskGroupAppliedQuarterly.objects.select_for_update().filter(interval_task_group=instance)
+                )
+                deleted_task_count = sum(
+                    delete_generated_tasks(quarterly_application.generation_batch, cascade)
+                    for quarterly_application in quarterly_applications
+                )
+                self.perform_destroy(instance)
+
+            invalidate_cached_responses([instance.task_group_owner_id], [INTERVAL_TASK_GROUP_NAMESPACE] + [
+                namespace
+                for quarterly_application in quarterly_applications
+                for namespace in get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            ])
             return Response({
                 "id": group_id,
-                "message": "Interval task group successfully deleted!"
+                "message": "Interval task group successfully deleted!",
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -183,19 +315,38 @@ class IntervalTaskSchedulerCreateView(APIView):
             # Get the interval task group
             interval_task_group = get_object_or_404(
                 IntervalTaskGroup,
-                id=interval_task_group_id
+                id=interval_task_group_id,
+                task_group_owner_id=get_user_profile_id(request)
             )
 
-            # Create the interval task scheduler
-            interval_task_scheduler = IntervalTaskScheduler(
-                interval_task_name=interval_task_name,
-                interval_task_group=interval_task_group
+            # Create the interval task scheduler and rotate the new task into
+            # the group's future pending tasks together
+            with transaction.atomic():
+                interval_task_scheduler = IntervalTaskScheduler(
+                    interval_task_name=interval_task_name,
+                    interval_task_group=interval_task_group
+                )
+                interval_task_scheduler.save()
+                IntervalTaskGroup.custom_query.touch(interval_task_group.id)
+                renamed_task_count, changed_dates = rerotate_quarterly_tasks(
+                    interval_task_group
+                )
+            invalidate_cached_responses(
+                [interval_task_group.task_group_owner_id],
+                [INTERVAL_TASK_GROUP_NAMESPACE] + [
+                    get_single_task_namespace(changed_date) for changed_date in changed_dates
+                ]
             )
-            interval_task_scheduler.save()
 
             # Return the updated group with all its tasks
+            prefetch_related_objects(
+                [interval_task_group], get_interval_tasks_prefetch()
+            )
             serializer = IntervalTaskGroupSerializer(interval_task_group)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(
+                {**serializer.data, 'updated_task_count': renamed_task_count},
+                status=status.HTTP_201_CREATED
+            )
         except Exception as e:
             return Response(
                 {"message": "There was an error. Please try again"},
@@ -218,20 +369,39 @@ class IntervalTaskSchedulerDeleteView(APIView):
             # Get the interval task group
             interval_task_group = get_object_or_404(
                 IntervalTaskGroup,
-                id=task_group_id
+                id=task_group_id,
+                task_group_owner_id=get_user_profile_id(request)
             )
 
-            # Get and delete the interval task scheduler
-            interval_task_scheduler = get_object_or_404(
-                IntervalTaskScheduler,
-                id=interval_task_id,
-                interval_task_group=interval_task_group
+            # Delete the interval task scheduler in a single statement, and
+            # rotate the remaining tasks through the future pending tasks
+            with transaction.atomic():
+                deleted_count, _ = IntervalTaskScheduler.objects.filter(
+                    id=interval_task_id,
+                    interval_task_group=interval_task_group
+                ).delete()
+                if not deleted_count:
+                    raise IntervalTaskScheduler.DoesNotExist
+                IntervalTaskGroup.custom_query.touch(interval_task_group.id)
+                renamed_task_count, changed_dates = rerotate_quarterly_tasks(
+                    interval_task_group
+                )
+            invalidate_cached_responses(
+                [interval_task_group.task_group_owner_id],
+                [INTERVAL_TASK_GROUP_NAMESPACE] + [
+                    get_single_task_namespace(changed_date) for changed_date in changed_dates
+                ]
             )
-            interval_task_scheduler.delete()
 
             # Return the updated group
+            prefetch_related_objects(
+                [interval_task_group], get_interval_tasks_prefetch()
+            )
             serializer = IntervalTaskGroupSerializer(interval_task_group)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(
+                {**serializer.data, 'updated_task_count': renamed_task_count},
+                status=status.HTTP_200_OK
+            )
         except Exception as e:
             return Response(
                 {"message": "The interval task group or task does not exist. Please try again"},
@@ -239,16 +409,17 @@ class IntervalTaskSchedulerDeleteView(APIView):
             )
 
 
-class IntervalTaskGroupsByUserListView(generics.ListAPIView):
+class IntervalTaskGroupsByUserListView(ConditionalListMixin, CachedListMixin, generics.ListAPIView):
     """
     Get all interval task groups for the authenticated user.
     """
     permission_classes = (IsAuthenticated,)
     queryset = IntervalTaskGroup.objects.all()
     serializer_class = IntervalTaskGroupSerializer
+    cache_namespace = INTERVAL_TASK_GROUP_NAMESPACE
 
     def get_queryset(self):
-        queryset = IntervalTaskGroup.objects.filter(
-            task_group_owner__user=self.request.user
+        queryset = IntervalTaskGroup.custom_query.with_interval_tasks().filter(
+            task_group_owner_id=get_user_profile_id(self.request)
         )
         return queryset.order_by('task_group_name')
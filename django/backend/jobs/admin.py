@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job_type', 'status', 'completed', 'total',
+                    'attempts', 'user_profile', 'updated_date_time',)
+    list_filter = ('status', 'job_type',)
+
+
+admin.site.register(Job, JobAdmin)
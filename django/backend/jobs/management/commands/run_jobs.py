@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from jobs.models import Job
+from jobs.utils import run_job, run_pending_jobs
+
+
+def run_job_in_worker_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        # like the end of a request, so CONN_MAX_AGE applies to the worker too
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    """
+    Runs the queued background jobs on a pool of --threads threads, polling
+    the job table every --poll-interval seconds:
+
+        python manage.py run_jobs --threads 4
+
+    The writes of all threads share one rate limit,
+    JOBS_MAX_WRITES_PER_SECOND. Each thread holds a database connection, so
+    --threads may not exceed the connections the web workers leave of
+    DATABASE_MAX_CONNECTIONS. With --once the queued jobs are run one
+    after another in this thread and the command exits, e.g. from cron.
+    """
+    help = 'Run the queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--once', action='store_true')
+
+    def handle(self, *args, **options):
+        Job.custom_query.requeue_stale()
+        if options['once']:
+            number_of_jobs = run_pending_jobs()
+            self.stdout.write(self.style.SUCCESS('Ran {} jobs'.format(number_of_jobs)))
+            return
+
+        threads = options['threads']
+        connections_left = (
+            settings.DATABASE_MAX_CONNECTIONS
+            - settings.WEB_CONCURRENCY * settings.WEB_THREADS
+        )
+        if threads > connections_left:
+            raise CommandError(
+                '--threads {} exceeds the {} database connections left by the '
+                'web workers'.format(threads, connections_left)
+            )
+        running = {}
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            try:
+                while True:
+                    running = {
+                        job_id: future for job_id, future in running.items()
+                        if not future.done()
+                    }
+                    free_threads = threads - len(running)
+                    if free_threads:
+                        for job_id in Job.custom_query.queued_ids(threads):
+                            if job_id not in running and free_threads:
+                                running[job_id] = executor.submit(
+                                    run_job_in_worker_thread, job_id
+                                )
+                                free_threads -= 1
+                    Job.custom_query.requeue_stale()
+                    close_old_connections()
+                    time.sleep(options['poll_interval'])
+            except KeyboardInterrupt:
+                self.stdout.write('Waiting for the running jobs to finish')
+            finally:
+                connections.close_all()
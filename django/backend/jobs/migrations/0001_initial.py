@@ -0,0 +1,43 @@
+# Generated by Django 4.2.13 on 2026-10-17 19:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('user_profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_date_time', models.DateTimeField(auto_now_add=True)),
+                ('started_date_time', models.DateTimeField(blank=True, null=True)),
+                ('finished_date_time', models.DateTimeField(blank=True, null=True)),
+                ('updated_date_time', models.DateTimeField(auto_now=True)),
+                ('user_profile', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='user_profiles.userprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'Jobs',
+                'indexes': [models.Index(fields=['status', 'id'], name='jobs_status_idx')],
+            },
+            managers=[
+                ('custom_query', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
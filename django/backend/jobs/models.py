@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from user_profiles.models import UserProfile
+
+JOB_STATUS = (
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('succeeded', 'Succeeded'),
+    ('failed', 'Failed'),
+)
+
+
+class JobManager(models.Manager):
+    def enqueue(self, job_type, payload, user_profile_id=None):
+        """
+        Queue a job for the worker. Called inside the transaction that
+        writes the job's input, the job only becomes visible with it.
+        """
+        return self.get_queryset().create(
+            job_type=job_type,
+            payload=payload,
+            user_profile_id=user_profile_id
+        )
+
+    def queued_ids(self, limit):
+        """
+        Get the ids of the oldest queued jobs.
+        """
+        return list(self.get_queryset().filter(
+            status='queued'
+        ).order_by('id').values_list('id', flat=True)[:limit])
+
+    def claim(self, job_id):
+        """
+        Mark a queued job as running. Returns False when another worker
+        claimed it first.
+        """
+        now = timezone.now()
+        return self.get_queryset().filter(id=job_id, status='queued').update(
+            status='running',
+            attempts=F('attempts') + 1,
+            started_date_time=now,
+            updated_date_time=now
+        ) == 1
+
+    def requeue_stale(self):
+        """
+        Queue running jobs again whose worker has not reported progress for
+        JOBS_STALE_AFTER, e.g. because the worker process died.
+        """
+        return self.get_queryset().filter(
+            status='running',
+            updated_date_time__lt=timezone.now() - settings.JOBS_STALE_AFTER
+        ).update(status='queued', updated_date_time=timezone.now())
+
+
+class Job(models.Model):
+    """
+    Work handed off from a request to the background worker (see the
+    run_jobs command), such as materializing the SingleTasks of a quarterly
+    application. Clients poll GET /api/jobs/<id>/ for its progress.
+    """
+    custom_query = JobManager()
+    objects = models.Manager()
+
+    job_type = models.CharField(max_length=100)
+
+    payload = models.JSONField(default=dict)
+
+    # The user who started the job, and who may read its status
+    user_profile = models.ForeignKey(
+        UserProfile,
+        related_name='jobs',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=JOB_STATUS,
+        default='queued'
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # Progress as units of work (e.g. tasks) done out of total, once known
+    completed = models.PositiveIntegerField(default=0)
+
+    total = models.PositiveIntegerField(null=True, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+
+    error = models.TextField(default='', blank=True)
+
+    created_date_time = models.DateTimeField(auto_now_add=True)
+
+    started_date_time = models.DateTimeField(null=True, blank=True)
+
+    finished_date_time = models.DateTimeField(null=True, blank=True)
+
+    updated_date_time = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "{} #{} ({})".format(self.job_type, self.id, self.get_status_display())
+
+    class Meta:
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            # The worker's queue, and finding stale running jobs
+            models.Index(
+                fields=['status', 'id'],
+                name='jobs_status_idx'
+            ),
+        ]
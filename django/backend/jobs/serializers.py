@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = (
+            'id', 'job_type', 'status',
+            'completed', 'total', 'result', 'error',
+            'created_date_time', 'started_date_time',
+            'finished_date_time', 'updated_date_time'
+        )
+        read_only_fields = fields
@@ -0,0 +1,253 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interval_task_group.models import IntervalTaskGroup, IntervalTaskScheduler
+from jobs.models import Job
+from jobs.utils import WriteRateLimiter, run_job, run_pending_jobs
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+from response_cache.utils import get_response_cache
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.models import WeeklyTaskScheduler
+
+User = get_user_model()
+
+JOBS_URL = '/api/jobs/'
+WEEKLY_APPLY_URL = '/api/weekly-task/applied-quarterly/'
+MONTHLY_APPLY_URL = '/api/monthly-task/applied-quarterly/'
+INTERVAL_APPLY_URL = '/api/interval-task/applied-quarterly/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class QuarterlyApplicationJobApiTests(TestCase):
+    """Test applying templates to a quarter through background jobs"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.monthly_task_scheduler = MonthlyTaskScheduler.objects.create(
+            monthly_task_name='Pay rent',
+            day_of_month=1,
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def apply_monthly_scheduler(self):
+        return self.client.post(MONTHLY_APPLY_URL, {
+            'quarter': 'Q1',
+            'year': 2026,
+            'monthly_task_scheduler': self.monthly_task_scheduler.id
+        }, format='json')
+
+    def test_apply_returns_accepted_job(self):
+        """Test applying a template returns 202 before any task is created"""
+        print("Test applying a template returns 202 before any task is created")
+        res = self.apply_monthly_scheduler()
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res['Location'], '{}{}/'.format(JOBS_URL, res.data['job_id']))
+        self.assertTrue(MonthlyTaskAppliedQuarterly.objects.filter(id=res.data['id']).exists())
+        self.assertFalse(SingleTask.objects.exists())
+
+        res = self.client.get(res['Location'])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], 'queued')
+        self.assertEqual(res.data['job_type'], 'monthly_task.apply_quarterly')
+
+    def test_job_reports_progress(self):
+        """Test the job status shows the created tasks once the job ran"""
+        print("Test the job status shows the created tasks once the job ran")
+        job_url = self.apply_monthly_scheduler()['Location']
+        self.assertEqual(run_pending_jobs(), 1)
+
+        res = self.client.get(job_url)
+        self.assertEqual(res.data['status'], 'succeeded')
+        self.assertEqual(res.data['completed'], 3)
+        self.assertEqual(res.data['total'], 3)
+        self.assertEqual(res.data['result'], {'created_task_count': 3})
+        self.assertIsNotNone(res.data['finished_date_time'])
+        self.assertEqual(SingleTask.objects.filter(
+            generation_batch=MonthlyTaskAppliedQuarterly.objects.get().generation_batch
+        ).count(), 3)
+
+    def test_weekly_and_interval_applications(self):
+        """Test the weekly and interval apply endpoints also queue jobs"""
+        print("Test the weekly and interval apply endpoints also queue jobs")
+        weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts',
+            interval_in_days=7,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('Legs', 'Back'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=interval_task_group
+            )
+        res = self.client.post(WEEKLY_APPLY_URL, {
+            'quarter': 'Q1',
+            'year': 2026,
+            'weekly_task_scheduler': weekly_task_scheduler.id
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        res = self.client.post(INTERVAL_APPLY_URL, {
+            'quarter': 'Q1',
+            'year': 2026,
+            'interval_task_group': interval_task_group.id
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(SingleTask.objects.exists())
+
+        self.assertEqual(run_pending_jobs(), 2)
+        self.assertEqual(SingleTask.objects.filter(task_name='Vacuum living room').count(), 13)
+        self.assertEqual(
+            SingleTask.objects.filter(task_name__in=['Legs', 'Back']).count(),
+            Job.objects.get(job_type='interval_task_group.apply_quarterly').total
+        )
+        self.assertFalse(Job.objects.exclude(status='succeeded').exists())
+
+    def test_job_of_another_user_is_not_found(self):
+        """Test a user cannot read the status of another user's job"""
+        print("Test a user cannot read the status of another user's job")
+        job_url = self.apply_monthly_scheduler()['Location']
+        other_user = User.objects.create_user('otheruser', 'otherpassword')
+        UserProfile.objects.create(user=other_user)
+        self.client.credentials(HTTP_AUTHORIZATION=get_token_auth_header(other_user))
+        res = self.client.get(job_url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_application_deleted_before_job_runs(self):
+        """Test a job whose application was deleted creates no tasks"""
+        print("Test a job whose application was deleted creates no tasks")
+        res = self.apply_monthly_scheduler()
+        self.client.delete('{}{}/'.format(MONTHLY_APPLY_URL, res.data['id']))
+        run_pending_jobs()
+        self.assertFalse(SingleTask.objects.exists())
+        self.assertEqual(Job.objects.get().result, {'created_task_count': 0})
+
+    def test_rerun_job_does_not_duplicate_tasks(self):
+        """Test running an already completed job again writes nothing"""
+        print("Test running an already completed job again writes nothing")
+        self.apply_monthly_scheduler()
+        run_pending_jobs()
+        job = Job.objects.get()
+        Job.objects.filter(id=job.id).update(status='queued')
+        self.assertTrue(run_job(job.id))
+        self.assertEqual(SingleTask.objects.count(), 3)
+        self.assertEqual(Job.objects.get().result, {'created_task_count': 0})
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_failed_job_is_retried(self):
+        """Test a failing job is queued again, then marked as failed"""
+        print("Test a failing job is queued again, then marked as failed")
+        self.apply_monthly_scheduler()
+        job = Job.objects.get()
+        with mock.patch.object(
+                SingleTask.objects, 'bulk_create', side_effect=Exception('Database is down')):
+            run_job(job.id)
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'queued')
+            self.assertEqual(job.attempts, 1)
+            run_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('Database is down', job.error)
+        self.assertFalse(SingleTask.objects.exists())
+
+    def test_run_jobs_command(self):
+        """Test the worker command runs the queued jobs with --once"""
+        print("Test the worker command runs the queued jobs with --once")
+        self.apply_monthly_scheduler()
+        out = StringIO()
+        call_command('run_jobs', '--once', stdout=out)
+        self.assertIn('Ran 1 jobs', out.getvalue())
+        self.assertEqual(SingleTask.objects.count(), 3)
+
+
+class ConnectionBudgetTests(TestCase):
+    """Test the threads of the web and job workers fit DATABASE_MAX_CONNECTIONS"""
+
+    @override_settings(DATABASE_MAX_CONNECTIONS=10, WEB_CONCURRENCY=4, WEB_THREADS=2)
+    def test_run_jobs_refuses_threads_over_the_budget(self):
+        """Test run_jobs refuses more threads than the web workers leave"""
+        print("Test run_jobs refuses more threads than the web workers leave")
+        with self.assertRaisesMessage(CommandError, '2 database connections left'):
+            call_command('run_jobs', '--threads', '3')
+
+    def test_settings_refuse_web_workers_over_the_budget(self):
+        """Test startup fails when the web workers exceed the budget"""
+        print("Test startup fails when the web workers exceed the budget")
+        environment = dict(
+            os.environ, SECRET_KEY='x', DATABASE_NAME='x', DATABASE_USER='x',
+            DATABASE_PASSWORD='x', DATABASE_HOST='x', DATABASE_PORT='3306',
+            WEB_CONCURRENCY='4', WEB_THREADS='8', DATABASE_MAX_CONNECTIONS='30',
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', 'import backend.settings'],
+            cwd=settings.BASE_DIR, env=environment, capture_output=True, text=True,
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('exceeds DATABASE_MAX_CONNECTIONS (30)', result.stderr)
+
+
+class WriteRateLimiterTests(TestCase):
+    """Test the token bucket limiting the rows written by jobs"""
+
+    @mock.patch('jobs.utils.time')
+    def test_writes_over_the_rate_wait(self, mock_time):
+        """Test writes beyond the bucket wait for it to refill"""
+        print("Test writes beyond the bucket wait for it to refill")
+        mock_time.monotonic.return_value = 100.0
+        write_rate_limiter = WriteRateLimiter(100)
+        write_rate_limiter.acquire(100)
+        mock_time.sleep.assert_not_called()
+        write_rate_limiter.acquire(50)
+        mock_time.sleep.assert_called_once_with(0.5)
+
+        # a second later the debt is paid and 50 rows are available again
+        mock_time.sleep.reset_mock()
+        mock_time.monotonic.return_value = 101.0
+        write_rate_limiter.acquire(50)
+        mock_time.sleep.assert_not_called()
+
+    @mock.patch('jobs.utils.time')
+    def test_zero_rate_disables_the_limit(self, mock_time):
+        """Test a rate of 0 does not limit the writes"""
+        print("Test a rate of 0 does not limit the writes")
+        WriteRateLimiter(0).acquire(10000)
+        mock_time.sleep.assert_not_called()
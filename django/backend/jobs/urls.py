@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import JobDetailView
+
+app_name = "jobs"
+
+urlpatterns = [
+    # Get the status and progress of a background job
+    path('<int:id>/',
+         JobDetailView.as_view(),
+         name='job-detail'),
+]
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Handlers by job type, registered with @job_handler in each app's jobs.py
+_JOB_HANDLERS = {}
+
+
+def job_handler(job_type: str) -> Callable:
+    """
+    Registers the decorated function as the handler of a job type.
+
+    The handler is called with the Job and its JobContext, and returns the
+    job's result, which must be JSON serializable. Jobs are retried after
+    an error, so handlers must be safe to run again.
+    """
+    def register(handler):
+        _JOB_HANDLERS[job_type] = handler
+        return handler
+    return register
+
+
+class WriteRateLimiter:
+    """
+    Token bucket shared by the worker threads of a process that limits how
+    many rows the jobs write per second, so a burst of jobs (e.g. every user
+    applying their templates at the start of a quarter) does not turn into
+    a write storm against the database.
+    """
+
+    def __init__(self, rows_per_second: int):
+        self.rows_per_second = rows_per_second
+        self.available_rows = float(rows_per_second)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, number_of_rows: int):
+        """Blocks until number_of_rows may be written."""
+        if not self.rows_per_second:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.available_rows = min(
+                float(self.rows_per_second),
+                self.available_rows + (now - self.last_refill) * self.rows_per_second
+            )
+            self.last_refill = now
+            # Take the rows now, going into debt if needed, and wait until
+            # the bucket has refilled the debt
+            self.available_rows -= number_of_rows
+            wait = -self.available_rows / self.rows_per_second
+        if wait > 0:
+            time.sleep(wait)
+
+
+_write_rate_limiter = None
+_write_rate_limiter_lock = threading.Lock()
+
+
+def get_write_rate_limiter() -> WriteRateLimiter:
+    """Returns the process' limiter, sized by JOBS_MAX_WRITES_PER_SECOND."""
+    global _write_rate_limiter
+    with _write_rate_limiter_lock:
+        if (_write_rate_limiter is None
+                or _write_rate_limiter.rows_per_second != settings.JOBS_MAX_WRITES_PER_SECOND):
+            _write_rate_limiter = WriteRateLimiter(settings.JOBS_MAX_WRITES_PER_SECOND)
+        return _write_rate_limiter
+
+
+class JobContext:
+    """
+    Passed to job handlers to report progress and to throttle their writes.
+    """
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def set_progress(self, completed: int, total: Optional[int] = None):
+        """Stores the job's progress, which also marks the job as alive."""
+        self.job.completed = completed
+        update = {'completed': completed, 'updated_date_time': timezone.now()}
+        if total is not None:
+            self.job.total = update['total'] = total
+        Job.objects.filter(id=self.job.id).update(**update)
+
+    def throttle(self, number_of_rows: int):
+        """Waits until the rate limiter allows writing number_of_rows."""
+        get_write_rate_limiter().acquire(number_of_rows)
+
+
+def run_job(job_id: int) -> bool:
+    """
+    Claims a queued job and runs its handler.
+
+    A failed job is queued again until it has been attempted
+    JOBS_MAX_ATTEMPTS times, then it is marked as failed with the error.
+
+    Args:
+        job_id: The id of a queued job
+
+    Returns:
+        False if the job was not queued (e.g. another worker claimed it)
+    """
+    if not Job.custom_query.claim(job_id):
+        return False
+    job = Job.objects.get(id=job_id)
+
+    try:
+        handler = _JOB_HANDLERS[job.job_type]
+        result = handler(job, JobContext(job))
+    except Exception as e:
+        logger.exception('Job %s (%s) failed', job.id, job.job_type)
+        retry = job.attempts < settings.JOBS_MAX_ATTEMPTS
+        Job.objects.filter(id=job.id).update(
+            status='queued' if retry else 'failed',
+            error=repr(e),
+            finished_date_time=None if retry else timezone.now(),
+            updated_date_time=timezone.now()
+        )
+        return True
+
+    Job.objects.filter(id=job.id).update(
+        status='succeeded',
+        result=result,
+        error='',
+        finished_date_time=timezone.now(),
+        updated_date_time=timezone.now()
+    )
+    return True
+
+
+def run_pending_jobs(max_jobs: Optional[int] = None) -> int:
+    """
+    Runs queued jobs one after another in the calling thread until none are
+    left, e.g. from the worker's --once mode or from tests.
+
+    Args:
+        max_jobs: Optionally stop after running this many jobs
+
+    Returns:
+        The number of jobs run
+    """
+    number_of_jobs = 0
+    while max_jobs is None or number_of_jobs < max_jobs:
+        job_ids = Job.custom_query.queued_ids(1)
+        if not job_ids:
+            break
+        if run_job(job_ids[0]):
+            number_of_jobs += 1
+    return number_of_jobs
@@ -0,0 +1,20 @@
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from user_profiles.utils import get_user_profile_id
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    """
+    Get the status and progress of one of the authenticated user's jobs.
+    GET /api/jobs/<id>/
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = JobSerializer
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        return Job.objects.filter(user_profile_id=get_user_profile_id(self.request))
@@ -0,0 +1,58 @@
+from jobs.utils import job_handler
+from response_cache.utils import MONTHLY_TASK_NAMESPACE
+from single_task.models import RECURRENCE_MONTHLY, RecurrenceRule
+from single_task.quarter_calendar import get_quarter_bounds
+from single_task.services import materialize_quarterly_application
+from single_task.utils import generate_recurring_tasks_by_date_list
+
+from .models import MonthlyTaskAppliedQuarterly
+from .utils import get_monthly_scheduling_dates_by_quarter
+
+APPLY_QUARTERLY_JOB = 'monthly_task.apply_quarterly'
+
+
+def build_quarterly_tasks(quarterly_application):
+    """Builds the unsaved SingleTasks of a monthly task applied to a quarter."""
+    monthly_task_scheduler = quarterly_application.monthly_task_scheduler
+    return generate_recurring_tasks_by_date_list(
+        task_name=monthly_task_scheduler.monthly_task_name,
+        user_profile=monthly_task_scheduler.user_profile,
+        dates_to_schedule_tasks=get_monthly_scheduling_dates_by_quarter(
+            year=quarterly_application.year,
+            quarter=quarterly_application.quarter,
+            day_of_month=monthly_task_scheduler.day_of_month
+        ),
+        generation_batch=quarterly_application.generation_batch
+    )
+
+
+def build_recurrence_rule(quarterly_application):
+    """Builds the unsaved RecurrenceRule of a monthly task applied to a quarter."""
+    monthly_task_scheduler = quarterly_application.monthly_task_scheduler
+    first_day_of_quarter, first_day_after_quarter = get_quarter_bounds(
+        quarterly_application.year, quarterly_application.quarter
+    )
+    return RecurrenceRule(
+        user_profile_id=monthly_task_scheduler.user_profile_id,
+        generation_batch=quarterly_application.generation_batch,
+        frequency=RECURRENCE_MONTHLY,
+        interval=1,
+        first_date=first_day_of_quarter.replace(day=monthly_task_scheduler.day_of_month),
+        end_date=first_day_after_quarter,
+        task_names=[monthly_task_scheduler.monthly_task_name]
+    )
+
+
+@job_handler(APPLY_QUARTERLY_JOB)
+def apply_quarterly(job, job_context):
+    """Creates the SingleTasks of a MonthlyTaskAppliedQuarterly."""
+    created_task_count = materialize_quarterly_application(
+        MonthlyTaskAppliedQuarterly.objects.select_related(
+            'monthly_task_scheduler__user_profile'
+        ),
+        job.payload['quarterly_application_id'],
+        build_quarterly_tasks,
+        MONTHLY_TASK_NAMESPACE,
+        job_context
+    )
+    return {'created_task_count': created_task_count}
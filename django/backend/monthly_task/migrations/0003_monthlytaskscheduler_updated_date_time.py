@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monthly_task', '0002_monthlytaskappliedquarterly_generation_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlytaskscheduler',
+            name='updated_date_time',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
@@ -46,6 +48,8 @@ class MonthlyTaskScheduler(models.Model):
         on_delete=models.CASCADE
     )
 
+    updated_date_time = models.DateTimeField(auto_now=True)
+
     @property
     def ordinal_suffix(self):
         """Returns the ordinal suffix for the day (st, nd, rd, th)."""
@@ -102,6 +106,14 @@ class MonthlyTaskAppliedQuarterly(models.Model):
         on_delete=models.CASCADE
     )
 
+    # Shared by every SingleTask generated for this application, so they
+    # can be found and deleted together
+    generation_batch = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False
+    )
+
     class Meta:
         verbose_name_plural = 'Monthly Tasks Applied Quarterly'
         ordering = [
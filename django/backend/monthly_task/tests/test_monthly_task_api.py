@@ -0,0 +1,163 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from jobs.utils import run_pending_jobs
+from response_cache.utils import get_response_cache
+from single_task.models import TASK_STATUS_COMPLETED, SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+
+User = get_user_model()
+
+MONTHLY_TASK_URL = '/api/monthly-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class MonthlyTaskQueryCountApiTests(TestCase):
+    """Test the number of queries issued by the monthly task API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        for day_of_month in range(1, 4):
+            scheduler = MonthlyTaskScheduler.objects.create(
+                monthly_task_name='Monthly task {}'.format(day_of_month),
+                day_of_month=day_of_month,
+                user_profile=self.test_user_profile
+            )
+            for quarter in ('Q1', 'Q2'):
+                MonthlyTaskAppliedQuarterly.objects.create(
+                    quarter=quarter,
+                    year=2026,
+                    monthly_task_scheduler=scheduler
+                )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_schedulers_by_user_query_count(self):
+        """Test the monthly schedulers list view query count"""
+        print("Test the monthly schedulers list view query count")
+        # authenticate the user, the list's version stamp, then the schedulers
+        with self.assertNumQueries(3):
+            res = self.client.get('{}schedulers/'.format(MONTHLY_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_applied_quarterly_list_query_count(self):
+        """Test the applied quarterly list view query count"""
+        print("Test the applied quarterly list view query count")
+        with self.assertNumQueries(2):
+            res = self.client.get('{}applied-quarterly/'.format(MONTHLY_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 6)
+
+    def test_applied_quarterly_filtered_query_count(self):
+        """Test the applied quarterly list filtered by quarter and year"""
+        print("Test the applied quarterly list filtered by quarter and year")
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                '{}applied-quarterly/Q1/2026/'.format(MONTHLY_TASK_URL)
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_scheduler_create_query_count(self):
+        """Test creating a scheduler does not look up the user profile"""
+        print("Test creating a scheduler does not look up the user profile")
+        payload = {
+            'monthly_task_name': 'Pay rent',
+            'day_of_month': 1
+        }
+        with self.assertNumQueries(2):
+            res = self.client.post(
+                '{}scheduler/'.format(MONTHLY_TASK_URL), data=payload, format='json'
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+
+class MonthlyTaskSchedulerUpdateApiTests(TestCase):
+    """Test editing a scheduler updates the tasks it generated"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.monthly_task_scheduler = MonthlyTaskScheduler.objects.create(
+            monthly_task_name='Pay rent',
+            day_of_month=28,
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+        # the next quarter, so all of its tasks are in the future
+        today = datetime.date.today()
+        next_quarter_month = (today.month - 1) // 3 * 3 + 4
+        self.year = today.year + (next_quarter_month > 12)
+        self.quarter = 'Q{}'.format((next_quarter_month - 1) % 12 // 3 + 1)
+        self.client.post('{}applied-quarterly/'.format(MONTHLY_TASK_URL), {
+            'quarter': self.quarter,
+            'year': self.year,
+            'monthly_task_scheduler': self.monthly_task_scheduler.id
+        }, format='json')
+        run_pending_jobs()
+
+    def test_update_reschedules_pending_tasks(self):
+        """Test a new day of month moves the pending tasks but not the completed ones"""
+        print("Test a new day of month moves the pending tasks but not the completed ones")
+        completed_task = SingleTask.objects.order_by('date').first()
+        SingleTask.objects.filter(id=completed_task.id).update(status=TASK_STATUS_COMPLETED)
+        res = self.client.patch(
+            '{}scheduler/{}/'.format(MONTHLY_TASK_URL, self.monthly_task_scheduler.id),
+            {'day_of_month': 15},
+            format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['updated_task_count'], 2)
+        self.assertEqual(res.data['created_task_count'], 1)
+        self.assertEqual(res.data['deleted_task_count'], 0)
+        self.assertEqual(
+            sorted(SingleTask.objects.values_list('date__day', 'status')),
+            [(15, 0), (15, 0), (15, 0), (28, TASK_STATUS_COMPLETED)]
+        )
+
+    def test_invalid_update_changes_nothing(self):
+        """Test an invalid day of month is rejected without touching the tasks"""
+        print("Test an invalid day of month is rejected without touching the tasks")
+        res = self.client.patch(
+            '{}scheduler/{}/'.format(MONTHLY_TASK_URL, self.monthly_task_scheduler.id),
+            {'day_of_month': 31},
+            format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(SingleTask.objects.values_list('date__day', flat=True)), {28})
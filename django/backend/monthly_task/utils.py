@@ -1,6 +1,8 @@
 from datetime import date
 from typing import List
 
+from single_task.quarter_calendar import get_monthly_dates
+
 
 def get_monthly_scheduling_dates_by_quarter(
         year: int, quarter: str, day_of_month: int
@@ -16,27 +18,5 @@ def get_monthly_scheduling_dates_by_quarter(
     Returns:
         List of dates (one per month in the quarter) on the specified day of month
     """
-    dates = []
-
-    if quarter == 'Q1':
-        # January, February, March
-        dates.append(date(year, 1, day_of_month))
-        dates.append(date(year, 2, day_of_month))
-        dates.append(date(year, 3, day_of_month))
-    elif quarter == 'Q2':
-        # April, May, June
-        dates.append(date(year, 4, day_of_month))
-        dates.append(date(year, 5, day_of_month))
-        dates.append(date(year, 6, day_of_month))
-    elif quarter == 'Q3':
-        # July, August, September
-        dates.append(date(year, 7, day_of_month))
-        dates.append(date(year, 8, day_of_month))
-        dates.append(date(year, 9, day_of_month))
-    else:  # Q4
-        # October, November, December
-        dates.append(date(year, 10, day_of_month))
-        dates.append(date(year, 11, day_of_month))
-        dates.append(date(year, 12, day_of_month))
-
-    return dates
+    # The cached tuple is shared, so hand out a copy
+    return list(get_monthly_dates(day_of_month, year, quarter))
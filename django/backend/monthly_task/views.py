@@ -1,56 +1,102 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import generics, status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from single_task.models import SingleTask
-from single_task.utils import generate_recurring_tasks_by_date_list
+from idempotency.utils import idempotent
+from jobs.models import Job
+from response_cache.conditional import ConditionalListMixin
+from response_cache.utils import (
+    MONTHLY_TASK_NAMESPACE,
+    CachedListMixin,
+    get_quarter_namespaces,
+    get_single_task_namespace,
+    invalidate_cached_responses
+)
+from single_task.services import reschedule_quarterly_applications
+from single_task.utils import (
+    GENERATED_TASK_CASCADE_MODES,
+    delete_generated_tasks,
+)
+from user_profiles.utils import get_user_profile_id
 
+from .jobs import APPLY_QUARTERLY_JOB, build_quarterly_tasks, build_recurrence_rule
 from .models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
 from .serializers import MonthlyTaskSchedulerSerializer, MonthlyTaskAppliedQuarterlySerializer
-from .utils import (
-    get_monthly_scheduling_dates_by_quarter,
-)
 
 
-class MonthlyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
+class MonthlyTaskAppliedQuarterlyViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for MonthlyTaskAppliedQuarterly.
-    Applying a monthly task to a quarter creates SingleTask instances for each month.
+    Applying a monthly task to a quarter queues a job that creates SingleTask
+    instances for each month.
     """
     permission_classes = (IsAuthenticated,)
     queryset = MonthlyTaskAppliedQuarterly.objects.all()
     serializer_class = MonthlyTaskAppliedQuarterlySerializer
+    cache_namespace = MONTHLY_TASK_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        # Only the authenticated user's applications can be listed or deleted
+        queryset = MonthlyTaskAppliedQuarterly.objects.filter(
+            monthly_task_scheduler__user_profile_id=get_user_profile_id(self.request)
+        )
+        return queryset.order_by(
+            '-year', '-quarter',
+            'monthly_task_scheduler__day_of_month',
+            'monthly_task_scheduler__monthly_task_name'
+        )
+
+    @idempotent
     def create(self, request, *args, **kwargs):
-        """Create a quarterly application and generate all SingleTask instances."""
+        """
+        Create a quarterly application and queue a job that generates its
+        SingleTask instances. Responds with 202 and the job's id; the job's
+        progress is at /api/jobs/<job_id>/. With
+        SINGLE_TASK_VIRTUAL_RECURRENCE on, the application is stored as a
+        RecurrenceRule instead, and the response is 201.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         try:
-            quarter = serializer.validated_data['quarter']
-            year = serializer.validated_data['year']
             monthly_task_scheduler = serializer.validated_data['monthly_task_scheduler']
 
-            # Generate list of dates for this quarter (3 dates, one per month)
-            quarterly_task_date_list = get_monthly_scheduling_dates_by_quarter(
-                year=year,
-                quarter=quarter,
-                day_of_month=monthly_task_scheduler.day_of_month
-            )
+            if settings.SINGLE_TASK_VIRTUAL_RECURRENCE:
+                with transaction.atomic():
+                    quarterly_application = serializer.save()
+                    build_recurrence_rule(quarterly_application).save()
 
-            # Save the quarterly application
-            serializer.save()
+                invalidate_cached_responses(
+                    [monthly_task_scheduler.user_profile_id],
+                    [MONTHLY_TASK_NAMESPACE] + get_quarter_namespaces(
+                        quarterly_application.year, quarterly_application.quarter
+                    )
+                )
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-            # Generate and save all SingleTask instances for the quarter
-            batch_of_tasks = generate_recurring_tasks_by_date_list(
-                task_name=monthly_task_scheduler.monthly_task_name,
-                user_profile=monthly_task_scheduler.user_profile,
-                dates_to_schedule_tasks=quarterly_task_date_list
-            )
-            SingleTask.objects.bulk_create(batch_of_tasks)
+            # Save the quarterly application and queue the job creating its
+            # tasks together, so an application is never left without a job
+            with transaction.atomic():
+                quarterly_application = serializer.save()
+                job = Job.custom_query.enqueue(
+                    APPLY_QUARTERLY_JOB,
+                    {'quarterly_application_id': quarterly_application.id},
+                    user_profile_id=monthly_task_scheduler.user_profile_id
+                )
 
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # The job invalidates the quarter's months once their tasks exist
+            invalidate_cached_responses(
+                [monthly_task_scheduler.user_profile_id], [MONTHLY_TASK_NAMESPACE]
+            )
+            return Response(
+                {**serializer.data, 'job_id': job.id},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse('jobs:job-detail', kwargs={'id': job.id})}
+            )
         except Exception as e:
             return Response(
                 {"message": "There was an error. Please try again"},
@@ -59,19 +105,42 @@ class MonthlyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         """
-        Delete the quarterly application.
-        Note: Does not return obsolete task IDs (simpler than the teacher scheduling app).
+        Delete the quarterly application and the SingleTask instances it generated.
+        ?cascade=pending keeps tasks that were completed, deferred or cancelled,
+        ?cascade=none keeps all of them.
         """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             quarterly_application = self.get_object()
             deleted_id = quarterly_application.id
 
-            # Delete the quarterly application
-            quarterly_application.delete()
+            # Delete the generated tasks and the quarterly application together,
+            # locking the application so a running job cannot add tasks meanwhile
+            with transaction.atomic():
+                MonthlyTaskAppliedQuarterly.objects.select_for_update().filter(id=deleted_id).exists()
+                deleted_task_count = delete_generated_tasks(
+                    quarterly_application.generation_batch, cascade
+                )
+                quarterly_application.delete()
+
+            invalidate_cached_responses(
+                [get_user_profile_id(request)],
+                [MONTHLY_TASK_NAMESPACE] + get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            )
 
             return Response({
                 "message": "Monthly task application successfully deleted!",
-                "id": deleted_id
+                "id": deleted_id,
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -84,7 +153,7 @@ class MonthlyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class MonthlyTaskAppliedQuarterlyListView(generics.ListAPIView):
+class MonthlyTaskAppliedQuarterlyListView(CachedListMixin, generics.ListAPIView):
     """
     Get all monthly tasks applied quarterly for the authenticated user.
     Can be filtered by quarter and year via URL parameters.
@@ -92,22 +161,24 @@ class MonthlyTaskAppliedQuarterlyListView(generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
     queryset = MonthlyTaskAppliedQuarterly.objects.all()
     serializer_class = MonthlyTaskAppliedQuarterlySerializer
+    cache_namespace = MONTHLY_TASK_NAMESPACE
 
     def get_queryset(self):
         # Check if filtering by quarter and year
         quarter = self.kwargs.get("quarter")
         year = self.kwargs.get("year")
+        user_profile_id = get_user_profile_id(self.request)
 
         if quarter and year:
             queryset = MonthlyTaskAppliedQuarterly.objects.filter(
-                monthly_task_scheduler__user_profile__user=self.request.user,
+                monthly_task_scheduler__user_profile_id=user_profile_id,
                 quarter=quarter,
                 year=year
             )
         else:
             # Return all quarterly applications for the user
             queryset = MonthlyTaskAppliedQuarterly.objects.filter(
-                monthly_task_scheduler__user_profile__user=self.request.user
+                monthly_task_scheduler__user_profile_id=user_profile_id
             )
 
         return queryset.order_by(
@@ -117,15 +188,22 @@ class MonthlyTaskAppliedQuarterlyListView(generics.ListAPIView):
         )
 
 
-class MonthlyTaskSchedulerViewSet(viewsets.ModelViewSet):
+class MonthlyTaskSchedulerViewSet(ConditionalListMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for MonthlyTaskScheduler templates.
     """
     permission_classes = (IsAuthenticated,)
     queryset = MonthlyTaskScheduler.objects.all()
     serializer_class = MonthlyTaskSchedulerSerializer
+    cache_namespace = MONTHLY_TASK_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        queryset = MonthlyTaskScheduler.objects.filter(
+            user_profile_id=get_user_profile_id(self.request)
+        )
+        return queryset.order_by('day_of_month', 'monthly_task_name')
+
     def create(self, request, *args, **kwargs):
         """Create a new monthly task scheduler."""
         serializer = self.get_serializer(data=request.data)
@@ -134,8 +212,9 @@ class MonthlyTaskSchedulerViewSet(viewsets.ModelViewSet):
         try:
             # Automatically set user_profile from authenticated user
             new_scheduler = serializer.save(
-                user_profile=request.user.userprofile
+                user_profile_id=get_user_profile_id(request)
             )
+            invalidate_cached_responses([new_scheduler.user_profile_id], [MONTHLY_TASK_NAMESPACE])
             return Response(
                 serializer.data,
                 status=status.HTTP_201_CREATED
@@ -146,15 +225,84 @@ class MonthlyTaskSchedulerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    def update(self, request, *args, **kwargs):
+        """
+        Update a monthly task scheduler. In the same transaction, the pending
+        tasks it generated from today on are moved to the new day of month
+        and renamed, with the fewest inserts, updates and deletes; the
+        response adds the numbers of created, updated and deleted tasks.
+        """
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            with transaction.atomic():
+                monthly_task_scheduler = serializer.save()
+                task_counts, changed_dates = reschedule_quarterly_applications(
+                    MonthlyTaskAppliedQuarterly.objects.filter(
+                        monthly_task_scheduler=monthly_task_scheduler
+                    ).select_related('monthly_task_scheduler__user_profile'),
+                    build_quarterly_tasks,
+                    build_recurrence_rule
+                )
+
+            invalidate_cached_responses(
+                [monthly_task_scheduler.user_profile_id],
+                [MONTHLY_TASK_NAMESPACE] + [
+                    get_single_task_namespace(changed_date) for changed_date in changed_dates
+                ]
+            )
+            return Response({**serializer.data, **task_counts})
+        except Exception as e:
+            return Response(
+                {"message": "There was an error. Please try again"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     def destroy(self, request, *args, **kwargs):
-        """Delete a monthly task scheduler."""
+        """
+        Delete a monthly task scheduler, its quarterly applications and the
+        SingleTask instances they generated. ?cascade=pending keeps tasks
+        that were completed, deferred or cancelled, ?cascade=none keeps all
+        of them.
+        """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             instance = self.get_object()
             scheduler_id = instance.id
-            self.perform_destroy(instance)
+
+            # The applications are deleted with the scheduler, so delete
+            # their tasks first, locking them so no job adds tasks meanwhile
+            with transaction.atomic():
+                quarterly_applications = list(
+                    MonthlyTaskAppliedQuarterly.objects.select_for_update().filter(monthly_task_scheduler=instance)
+                )
+                deleted_task_count = sum(
+                    delete_generated_tasks(quarterly_application.generation_batch, cascade)
+                    for quarterly_application in quarterly_applications
+                )
+                self.perform_destroy(instance)
+
+            invalidate_cached_responses([instance.user_profile_id], [MONTHLY_TASK_NAMESPACE] + [
+                namespace
+                for quarterly_application in quarterly_applications
+                for namespace in get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            ])
             return Response({
                 "id": scheduler_id,
-                "message": "Monthly task scheduler successfully deleted!"
+                "message": "Monthly task scheduler successfully deleted!",
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -163,17 +311,18 @@ class MonthlyTaskSchedulerViewSet(viewsets.ModelViewSet):
             )
 
 
-class MonthlyTaskSchedulersByUserListView(generics.ListAPIView):
+class MonthlyTaskSchedulersByUserListView(ConditionalListMixin, CachedListMixin, generics.ListAPIView):
     """
     Get all monthly task schedulers for the authenticated user.
     """
     permission_classes = (IsAuthenticated,)
     queryset = MonthlyTaskScheduler.objects.all()
     serializer_class = MonthlyTaskSchedulerSerializer
+    cache_namespace = MONTHLY_TASK_NAMESPACE
 
     def get_queryset(self):
         queryset = MonthlyTaskScheduler.objects.filter(
-            user_profile__user=self.request.user
+            user_profile_id=get_user_profile_id(self.request)
         )
         return queryset.order_by('day_of_month', 'monthly_task_name')
 
@@ -0,0 +1,63 @@
+"""
+Conditional GET (ETag and Last-Modified) for the per-user list endpoints.
+
+The validators are derived from one aggregate query over the list's own
+queryset, max(updated_date_time) and the row count, so an unchanged list
+is answered with 304 Not Modified without loading or serializing a row.
+The count catches deletions, which do not move max(updated_date_time).
+Because of that, Last-Modified alone cannot tell that a row was deleted;
+Django's get_conditional_response only falls back to If-Modified-Since
+when the client sends no If-None-Match.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from user_profiles.utils import get_user_profile_id
+
+
+class ConditionalListMixin:
+    """
+    Adds ETag and Last-Modified headers to a list view and answers matching
+    If-None-Match / If-Modified-Since requests with 304 Not Modified.
+
+    Put it before CachedListMixin, so unchanged lists skip the cache too.
+    """
+    last_modified_field = 'updated_date_time'
+
+    def get_list_version(self):
+        """Returns (last modified datetime or None, number of rows) of the list."""
+        version = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count('pk')
+        )
+        return version['last_modified'], version['count']
+
+    def get_list_etag(self, request, last_modified, count) -> str:
+        version = '|'.join(str(part) for part in (
+            get_user_profile_id(request),
+            request.get_full_path(),
+            request.accepted_media_type,
+            last_modified.isoformat() if last_modified else '',
+            count
+        ))
+        return quote_etag(hashlib.md5(version.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        last_modified, count = self.get_list_version()
+        etag = self.get_list_etag(request, last_modified, count)
+        last_modified_timestamp = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_timestamp
+        )
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified_timestamp is not None:
+            response['Last-Modified'] = http_date(last_modified_timestamp)
+        return response
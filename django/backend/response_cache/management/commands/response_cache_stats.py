@@ -0,0 +1,43 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from response_cache.utils import (
+    get_response_cache,
+    get_response_cache_stats,
+    reset_response_cache_stats
+)
+
+
+class Command(BaseCommand):
+    """
+    Prints the response cache hit and miss counters:
+
+        python manage.py response_cache_stats [--reset]
+
+    The counters live in the response cache itself, so the command needs a
+    cache shared with the web workers (CACHE_URL) to see their counters.
+    With the default local memory cache it only sees its own process and
+    warns; read GET /api/response-cache/stats/ as a staff user instead.
+    """
+    help = 'Show (and optionally reset) the response cache hit and miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Reset the counters after printing them'
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(get_response_cache(), LocMemCache):
+            self.stderr.write(self.style.WARNING(
+                'The response cache is a local memory cache, so these are not '
+                'the web workers\' counters; use GET /api/response-cache/stats/ '
+                'or a shared CACHE_URL'
+            ))
+        stats = get_response_cache_stats()
+        self.stdout.write('Hits: {}'.format(stats['hits']))
+        self.stdout.write('Misses: {}'.format(stats['misses']))
+        self.stdout.write('Hit ratio: {:.1%}'.format(stats['hit_ratio']))
+        if options['reset']:
+            reset_response_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
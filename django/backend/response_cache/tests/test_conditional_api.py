@@ -0,0 +1,152 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interval_task_group.models import IntervalTaskGroup
+from response_cache.utils import get_response_cache
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.models import WeeklyTaskScheduler
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+WEEKLY_TASK_URL = '/api/weekly-task/'
+INTERVAL_TASK_URL = '/api/interval-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class ConditionalGetApiTests(TestCase):
+    """Test ETag and Last-Modified handling of the list endpoints"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.tasks = [
+            SingleTask.objects.create(
+                task_name='Task {}'.format(day),
+                date=datetime.date(2026, 3, day),
+                user_profile=self.test_user_profile
+            )
+            for day in (3, 4)
+        ]
+        self.month_url = '{}month-year/3/2026/'.format(SINGLE_TASK_URL)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_unchanged_list_returns_not_modified(self):
+        """Test an unchanged list is answered with 304 from the version stamp"""
+        print("Test an unchanged list is answered with 304 from the version stamp")
+        res = self.client.get(self.month_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+        # authenticate and the version stamp; no tasks are loaded
+        with self.assertNumQueries(2):
+            res_not_modified = self.client.get(
+                self.month_url, HTTP_IF_NONE_MATCH=res['ETag']
+            )
+        self.assertEqual(res_not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res_not_modified['ETag'], res['ETag'])
+        self.assertEqual(res_not_modified.content, b'')
+
+    def test_if_modified_since(self):
+        """Test If-Modified-Since with the returned Last-Modified"""
+        print("Test If-Modified-Since with the returned Last-Modified")
+        res = self.client.get(self.month_url)
+        res = self.client.get(
+            self.month_url, HTTP_IF_MODIFIED_SINCE=res['Last-Modified']
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_on_update(self):
+        """Test confirming a task changes the month's ETag"""
+        print("Test confirming a task changes the month's ETag")
+        etag = self.client.get(self.month_url)['ETag']
+        self.client.post('{}confirm/{}/'.format(SINGLE_TASK_URL, self.tasks[0].id))
+        res = self.client.get(self.month_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(res.data[0]['status'], 'completed')
+
+    def test_etag_changes_on_delete(self):
+        """Test deleting a task changes the month's ETag"""
+        print("Test deleting a task changes the month's ETag")
+        etag = self.client.get(self.month_url)['ETag']
+        # the oldest task does not hold max(updated_date_time)
+        self.client.delete('{}delete/{}/'.format(SINGLE_TASK_URL, self.tasks[0].id))
+        res = self.client.get(self.month_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_etag_differs_per_endpoint(self):
+        """Test the same tasks have different ETags on different endpoints"""
+        print("Test the same tasks have different ETags on different endpoints")
+        etag = self.client.get(self.month_url)['ETag']
+        res = self.client.get(
+            '{}date/2026-03-03/'.format(SINGLE_TASK_URL), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_scheduler_list_etag(self):
+        """Test the scheduler list ETag changes when a scheduler is renamed"""
+        print("Test the scheduler list ETag changes when a scheduler is renamed")
+        scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum',
+            day_of_week=0,
+            user_profile=self.test_user_profile
+        )
+        url = '{}schedulers/'.format(WEEKLY_TASK_URL)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+        scheduler.weekly_task_name = 'Vacuum living room'
+        scheduler.save()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_200_OK
+        )
+
+    def test_group_list_etag_changes_with_interval_tasks(self):
+        """Test adding an interval task changes the group list's ETag"""
+        print("Test adding an interval task changes the group list's ETag")
+        interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Wipe surfaces',
+            interval_in_days=3,
+            task_group_owner=self.test_user_profile
+        )
+        url = '{}groups/'.format(INTERVAL_TASK_URL)
+        etag = self.client.get(url)['ETag']
+        self.client.post('{}create-scheduler/'.format(INTERVAL_TASK_URL), {
+            'interval_task_name': 'Wipe kitchen counter',
+            'interval_task_group': interval_task_group.id
+        }, format='json')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data[0]['interval_tasks']), 1)
@@ -0,0 +1,190 @@
+import datetime
+
+from django.db import transaction
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from jobs.utils import run_pending_jobs
+from response_cache.utils import (
+    CACHE_STATUS_HEADER,
+    get_response_cache,
+    get_response_cache_stats,
+    invalidate_cached_tasks
+)
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.models import WeeklyTaskScheduler
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+WEEKLY_TASK_URL = '/api/weekly-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class ResponseCacheApiTests(TestCase):
+    """Test the per-user response cache of the read endpoints"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.task = SingleTask.objects.create(
+            task_name='March task',
+            date=datetime.date(2026, 3, 10),
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def get_month(self, month, year=2026):
+        return self.client.get('{}month-year/{}/{}/'.format(SINGLE_TASK_URL, month, year))
+
+    def test_second_request_is_served_from_cache(self):
+        """Test a repeated request is answered without querying the tasks"""
+        print("Test a repeated request is answered without querying the tasks")
+        with self.assertNumQueries(3):
+            res = self.get_month(3)
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+
+        # authenticate and the list's version stamp, but no tasks
+        with self.assertNumQueries(2):
+            cached_res = self.get_month(3)
+        self.assertEqual(cached_res[CACHE_STATUS_HEADER], 'HIT')
+        self.assertEqual(cached_res.data, res.data)
+        self.assertEqual(get_response_cache_stats()['hits'], 1)
+        self.assertEqual(get_response_cache_stats()['misses'], 1)
+
+    def test_stats_endpoint(self):
+        """Test staff users can read and reset the counters of the server process"""
+        print("Test staff users can read and reset the counters of the server process")
+        url = '/api/response-cache/stats/'
+        self.get_month(3)
+        self.get_month(3)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.test_user.is_staff = True
+        self.test_user.save()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(get_response_cache_stats()['hits'], 0)
+
+    def test_responses_are_cached_per_user(self):
+        """Test users do not get each other's cached responses"""
+        print("Test users do not get each other's cached responses")
+        self.get_month(3)
+        other_user = User.objects.create_user('otheruser', 'otherpassword')
+        UserProfile.objects.create(user=other_user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(other_user)
+        )
+        res = self.get_month(3)
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(res.data, [])
+
+    def test_create_invalidates_only_its_month(self):
+        """Test creating a task drops the cached responses of its month only"""
+        print("Test creating a task drops the cached responses of its month only")
+        self.get_month(3)
+        self.get_month(4)
+        res = self.client.post('{}create/'.format(SINGLE_TASK_URL), {
+            'task_name': 'Another March task',
+            'date': '2026-03-20'
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.get_month(3)
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(self.get_month(4)[CACHE_STATUS_HEADER], 'HIT')
+
+    def test_confirm_invalidates_date(self):
+        """Test confirming a task drops the cached day of the task"""
+        print("Test confirming a task drops the cached day of the task")
+        url = '{}date/2026-03-10/'.format(SINGLE_TASK_URL)
+        self.client.get(url)
+        self.client.post('{}confirm/{}/'.format(SINGLE_TASK_URL, self.task.id))
+        res = self.client.get(url)
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(res.data[0]['status'], 'completed')
+
+    def test_reschedule_invalidates_both_months(self):
+        """Test rescheduling a task drops its previous and its new month"""
+        print("Test rescheduling a task drops its previous and its new month")
+        self.get_month(3)
+        self.get_month(4)
+        self.client.patch(
+            '{}reschedule/{}/'.format(SINGLE_TASK_URL, self.task.id),
+            {'date': '2026-04-02'}, format='json'
+        )
+        self.assertEqual(self.get_month(3).data, [])
+        self.assertEqual(len(self.get_month(4).data), 1)
+
+    def test_delete_invalidates_month(self):
+        """Test deleting a task drops the cached responses of its month"""
+        print("Test deleting a task drops the cached responses of its month")
+        self.get_month(3)
+        self.client.delete('{}delete/{}/'.format(SINGLE_TASK_URL, self.task.id))
+        self.assertEqual(self.get_month(3).data, [])
+
+    def test_invalidation_is_repeated_on_commit(self):
+        """Test a response cached before a write commits is dropped on commit"""
+        print("Test a response cached before a write commits is dropped on commit")
+        self.get_month(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                invalidate_cached_tasks(self.test_user_profile.id, [self.task.date])
+                # a concurrent request caches the month before the commit
+                self.assertEqual(self.get_month(3)[CACHE_STATUS_HEADER], 'MISS')
+                self.assertEqual(self.get_month(3)[CACHE_STATUS_HEADER], 'HIT')
+        self.assertEqual(self.get_month(3)[CACHE_STATUS_HEADER], 'MISS')
+
+    def test_applying_a_quarter_invalidates_its_months(self):
+        """Test applying a template drops its list and the quarter's months"""
+        print("Test applying a template drops its list and the quarter's months")
+        scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Weekly task',
+            day_of_week=0,
+            user_profile=self.test_user_profile
+        )
+        self.get_month(3)
+        self.client.get('{}applied-quarterly/'.format(WEEKLY_TASK_URL))
+        res = self.client.post('{}applied-quarterly/'.format(WEEKLY_TASK_URL), {
+            'quarter': 'Q1',
+            'year': 2026,
+            'weekly_task_scheduler': scheduler.id
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+
+        res = self.client.get('{}applied-quarterly/'.format(WEEKLY_TASK_URL))
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(len(res.data), 1)
+        # the months are dropped by the job, once their tasks exist
+        self.assertEqual(self.get_month(3)[CACHE_STATUS_HEADER], 'HIT')
+        run_pending_jobs()
+        res = self.get_month(3)
+        self.assertEqual(res[CACHE_STATUS_HEADER], 'MISS')
+        self.assertEqual(len(res.data), 6)
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import ResponseCacheStatsView
+
+app_name = "response_cache"
+
+urlpatterns = [
+    # Get or reset the response cache hit and miss counters (staff only)
+    path('stats/',
+         ResponseCacheStatsView.as_view(),
+         name='response-cache-stats'),
+]
@@ -0,0 +1,180 @@
+"""
+Per-user cache for the read endpoints' serialized responses.
+
+Entries are keyed by (user profile, namespace, endpoint, query params) and
+stored on the RESPONSE_CACHE_ALIAS cache. Each namespace of a user carries
+a random version token that is part of the entry keys; invalidating a
+namespace deletes its token, which makes all of its entries unreachable at
+once without having to know which endpoints and params were cached. The
+SingleTask views use one namespace per month, so a write only drops the
+cached days and months it touches; each template app has one namespace.
+
+Writes must call the matching invalidate_* function. Inside a transaction
+the namespaces are dropped again when it commits, so a response cached by a
+concurrent request before the commit is not served until it expires.
+"""
+import hashlib
+import uuid
+from datetime import date
+from typing import Iterable, Union
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from single_task.quarter_calendar import QUARTER_START_MONTHS
+from user_profiles.utils import get_user_profile_id
+
+CACHE_STATUS_HEADER = 'X-Cache'
+
+HITS_KEY = 'response_cache:hits'
+MISSES_KEY = 'response_cache:misses'
+
+WEEKLY_TASK_NAMESPACE = 'weekly_task'
+MONTHLY_TASK_NAMESPACE = 'monthly_task'
+INTERVAL_TASK_GROUP_NAMESPACE = 'interval_task_group'
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_single_task_month_namespace(year: int, month: int) -> str:
+    """Gets the namespace of the cached SingleTask responses for a month."""
+    return 'single_task:{}-{:02d}'.format(year, month)
+
+
+def get_single_task_namespace(task_date: Union[date, str]) -> str:
+    """Gets the namespace of the cached SingleTask responses for a date's month."""
+    if isinstance(task_date, str):
+        task_date = date.fromisoformat(task_date)
+    return get_single_task_month_namespace(task_date.year, task_date.month)
+
+
+def _get_namespace_key(user_profile_id: int, namespace: str) -> str:
+    return 'response_cache:namespace:{}:{}'.format(user_profile_id, namespace)
+
+
+def _get_namespace_version(user_profile_id: int, namespace: str) -> str:
+    cache = get_response_cache()
+    namespace_key = _get_namespace_key(user_profile_id, namespace)
+    version = cache.get(namespace_key)
+    if version is None:
+        cache.add(namespace_key, uuid.uuid4().hex, None)
+        version = cache.get(namespace_key)
+    return version
+
+
+def get_cached_response_key(user_profile_id: int, namespace: str, request) -> str:
+    """
+    Gets the cache key of a request's response.
+
+    Args:
+        user_profile_id: The requesting user's profile id
+        namespace: The namespace the response is invalidated with
+        request: The DRF request, whose path and query params identify it
+
+    Returns:
+        The cache key of the response in the current version of the namespace
+    """
+    endpoint = '{}?{}'.format(request.path, request.query_params.urlencode())
+    return 'response_cache:{}:{}:{}:{}'.format(
+        user_profile_id,
+        namespace,
+        _get_namespace_version(user_profile_id, namespace),
+        hashlib.md5(endpoint.encode()).hexdigest()
+    )
+
+
+def _increment_counter(counter_key: str):
+    cache = get_response_cache()
+    try:
+        cache.incr(counter_key)
+    except ValueError:
+        # The counter does not exist yet (or was evicted)
+        if not cache.add(counter_key, 1, None):
+            cache.incr(counter_key)
+
+
+def get_response_cache_stats() -> dict:
+    """Gets the number of cache hits and misses, and the hit ratio."""
+    counters = get_response_cache().get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    requests = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / requests if requests else 0.0
+    }
+
+
+def reset_response_cache_stats():
+    get_response_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+def invalidate_cached_responses(user_profile_ids: Iterable[int], namespaces: Iterable[str]):
+    """
+    Drops every cached response in the users' namespaces, and inside a
+    transaction once more when it commits.
+    """
+    namespaces = set(namespaces)
+    namespace_keys = [
+        _get_namespace_key(user_profile_id, namespace)
+        for user_profile_id in set(user_profile_ids)
+        for namespace in namespaces
+    ]
+    get_response_cache().delete_many(namespace_keys)
+    if transaction.get_connection().in_atomic_block:
+        # a request may have cached the data the transaction had not
+        # committed yet meanwhile
+        transaction.on_commit(lambda: get_response_cache().delete_many(namespace_keys))
+
+
+def invalidate_cached_tasks(user_profile_id: int, task_dates: Iterable[Union[date, str]]):
+    """Drops the user's cached SingleTask responses for the months of task_dates."""
+    invalidate_cached_responses(
+        [user_profile_id],
+        [get_single_task_namespace(task_date) for task_date in task_dates]
+    )
+
+
+def get_quarter_namespaces(year: int, quarter: str) -> list:
+    """Gets the SingleTask namespaces of the three months of a quarter."""
+    start_month = QUARTER_START_MONTHS[quarter]
+    return [
+        get_single_task_month_namespace(year, month)
+        for month in range(start_month, start_month + 3)
+    ]
+
+
+class CachedListMixin:
+    """
+    Serves a list view's responses from the per-user response cache.
+
+    Views set cache_namespace, or override get_cache_namespace() when the
+    namespace depends on the request. Only successful responses are cached.
+    """
+    cache_namespace = None
+
+    def get_cache_namespace(self) -> str:
+        return self.cache_namespace
+
+    def list(self, request, *args, **kwargs):
+        cache = get_response_cache()
+        cache_key = get_cached_response_key(
+            get_user_profile_id(request), self.get_cache_namespace(), request
+        )
+        data = cache.get(cache_key)
+        if data is not None:
+            _increment_counter(HITS_KEY)
+            return Response(data, headers={CACHE_STATUS_HEADER: 'HIT'})
+
+        _increment_counter(MISSES_KEY)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response[CACHE_STATUS_HEADER] = 'MISS'
+        return response
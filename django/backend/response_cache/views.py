@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .utils import get_response_cache_stats, reset_response_cache_stats
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Get the response cache hit and miss counters, or reset them.
+    GET /api/response-cache/stats/
+    DELETE /api/response-cache/stats/
+
+    Staff users only. The counters are read inside the server, so with the
+    default local memory cache they are those of the worker process that
+    answers the request, which the response_cache_stats command cannot see.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_response_cache_stats())
+
+    def delete(self, request, *args, **kwargs):
+        reset_response_cache_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from rangefilter.filters import DateRangeFilter
-from .models import SingleTask
+from .models import RecurrenceRule, SingleTask, SingleTaskTombstone
 
 
 class SingleTaskAdmin(admin.ModelAdmin):
@@ -14,4 +14,15 @@ class SingleTaskAdmin(admin.ModelAdmin):
     ]
 
 
-admin.site.register(SingleTask, SingleTaskAdmin)
\ No newline at end of file
+class SingleTaskTombstoneAdmin(admin.ModelAdmin):
+    list_display = ('user_profile', 'task_id', 'deleted_date_time',)
+
+
+class RecurrenceRuleAdmin(admin.ModelAdmin):
+    list_display = ('user_profile', 'first_date', 'end_date',
+                    'frequency', 'interval', 'task_names',)
+
+
+admin.site.register(SingleTask, SingleTaskAdmin)
+admin.site.register(SingleTaskTombstone, SingleTaskTombstoneAdmin)
+admin.site.register(RecurrenceRule, RecurrenceRuleAdmin)
\ No newline at end of file
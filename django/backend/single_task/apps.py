@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class SingleTaskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'single_task'
+
+    def ready(self):
+        if settings.QUARTER_CALENDAR_PRECOMPUTE:
+            from .quarter_calendar import precompute_quarter_calendars
+            precompute_quarter_calendars()
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from single_task.quarter_calendar import QUARTER_START_MONTHS
+from single_task.services import apply_templates_to_quarter
+
+
+class Command(BaseCommand):
+    """
+    Applies every user's weekly, monthly and interval templates that are not
+    applied to the given quarter yet, e.g. at a quarter boundary:
+
+        python manage.py apply_quarterly_templates 2026 Q3
+    """
+    help = "Apply all users' task templates to a quarter in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument('year', type=int)
+        parser.add_argument('quarter')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--user-profile', type=int, action='append', dest='user_profile_ids',
+            help='Only apply the templates of this user profile id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        quarter = options['quarter'].upper()
+        if quarter not in QUARTER_START_MONTHS:
+            raise CommandError('Quarter must be one of Q1, Q2, Q3 or Q4')
+
+        start = time.perf_counter()
+        results = apply_templates_to_quarter(
+            year=options['year'],
+            quarter=quarter,
+            batch_size=options['batch_size'],
+            user_profile_ids=options['user_profile_ids']
+        )
+        elapsed = time.perf_counter() - start
+
+        for template_type, counts in results.items():
+            self.stdout.write('{}: {} applications, {} tasks'.format(
+                template_type, counts['applications'], counts['tasks']
+            ))
+        number_of_tasks = sum(counts['tasks'] for counts in results.values())
+        self.stdout.write(self.style.SUCCESS(
+            'Created {} tasks in {:.2f}s ({:.0f} tasks/s)'.format(
+                number_of_tasks, elapsed, number_of_tasks / elapsed if elapsed else 0
+            )
+        ))
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Run in a fresh interpreter per settings module, so the cold start
+# includes importing Django, the apps and the URLconf
+WORKER_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.test import RequestFactory
+application = get_wsgi_application()
+environ = RequestFactory().get(sys.argv[1], HTTP_HOST='localhost').environ
+response = application(dict(environ), lambda *args: None)
+response.close()
+cold_start = time.perf_counter() - start
+
+timings = []
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    response = application(dict(environ), lambda *args: None)
+    b''.join(response)
+    response.close()
+    timings.append(time.perf_counter() - start)
+timings.sort()
+print(json.dumps({
+    'status': response.status_code,
+    'cold_start': cold_start,
+    'modules': len(sys.modules),
+    'median': timings[len(timings) // 2],
+}))
+'''
+
+
+class Command(BaseCommand):
+    """
+    Compares the worker cold start and the per-request overhead of the
+    default settings with the API-only profile (backend.settings_api).
+
+    Each settings module runs in its own interpreter. The cold start is
+    the time to import the WSGI application and serve a first request;
+    the per-request overhead is the median time of --requests
+    unauthenticated requests to --path, which go through the middleware,
+    URL resolving and DRF authentication without touching the database.
+    """
+    help = 'Benchmark worker cold start and per-request overhead of the settings profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--path', default='/api/single-task/unconfirmed/count/')
+        parser.add_argument(
+            '--settings-modules', nargs='+',
+            default=[settings.SETTINGS_MODULE, 'backend.settings_api']
+        )
+
+    def handle(self, *args, **options):
+        for settings_module in options['settings_modules']:
+            result = json.loads(subprocess.run(
+                [sys.executable, '-c', WORKER_SCRIPT,
+                 options['path'], str(options['requests'])],
+                env={
+                    **os.environ,
+                    'DJANGO_SETTINGS_MODULE': settings_module,
+                    # the requests are sent to localhost, also with DEBUG off
+                    'ALLOWED_HOSTS': ','.join(
+                        filter(None, [os.environ.get('ALLOWED_HOSTS'), 'localhost'])
+                    ),
+                },
+                cwd=settings.BASE_DIR,
+                check=True,
+                capture_output=True,
+                text=True
+            ).stdout)
+            self.stdout.write(self.style.MIGRATE_HEADING(settings_module))
+            self.stdout.write(
+                '  cold start {:.0f} ms ({} modules loaded), per request {:.3f} ms '
+                '(status {})'.format(
+                    result['cold_start'] * 1000, result['modules'],
+                    result['median'] * 1000, result['status']
+                )
+            )
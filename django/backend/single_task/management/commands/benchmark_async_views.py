@@ -0,0 +1,202 @@
+import asyncio
+import datetime
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+from rest_framework import status
+
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = 'async_benchmark_user'
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+
+def start_response(response_status, headers, exc_info=None):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compares the sync task list views served by a WSGI worker with
+    --threads threads against their async versions served by the ASGI
+    handler on one event loop, with --clients concurrent clients each
+    sending --requests requests to --path (relative to /api/single-task/
+    and /api/single-task/async/).
+
+    Both handlers are called in process, the way a WSGI or ASGI server
+    would call them, so the request signals open and close database
+    connections as in production. The seeded user and its tasks are
+    removed again afterwards.
+    """
+    help = 'Benchmark the async task list views under ASGI against the sync views under WSGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=32)
+        parser.add_argument('--requests', type=int, default=20)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--tasks', type=int, default=300)
+        parser.add_argument('--path', default='unconfirmed/')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(BENCHMARK_USERNAME, password=None)
+        try:
+            user_profile = UserProfile.objects.create(user=user)
+            first_date = datetime.date.today() - datetime.timedelta(days=options['tasks'])
+            SingleTask.objects.bulk_create([
+                SingleTask(
+                    task_name='Benchmark task {}'.format(day % 10),
+                    date=first_date + datetime.timedelta(days=day),
+                    user_profile=user_profile
+                )
+                for day in range(options['tasks'])
+            ])
+            authorization = 'Token {}'.format(
+                UserProfileTokenObtainPairSerializer.get_token(user).access_token
+            )
+
+            self.report(
+                'WSGI, sync views, {} threads'.format(options['threads']),
+                self.run_wsgi(options, authorization)
+            )
+            self.report(
+                'ASGI, async views, one event loop',
+                asyncio.run(self.run_asgi(options, authorization))
+            )
+        finally:
+            User.objects.filter(username=BENCHMARK_USERNAME).delete()
+
+    def run_wsgi(self, options, authorization):
+        """
+        Runs the clients as threads queueing their requests for a pool of
+        --threads worker threads, like a threaded WSGI server.
+        """
+        handler = WSGIHandler()
+        request_factory = RequestFactory()
+        path = '{}{}'.format(SINGLE_TASK_URL, options['path'])
+        lock = threading.Lock()
+        result = {'timings': [], 'errors': 0}
+
+        def handle_request():
+            environ = request_factory.get(
+                path, HTTP_HOST='localhost', HTTP_AUTHORIZATION=authorization
+            ).environ
+            response = handler(environ, start_response)
+            b''.join(response)
+            response.close()
+            return response.status_code
+
+        def run_client(executor):
+            timings, errors = [], 0
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                response_status = executor.submit(handle_request).result()
+                timings.append((time.perf_counter() - start) * 1000)
+                if response_status != status.HTTP_200_OK:
+                    errors += 1
+            with lock:
+                result['timings'].extend(timings)
+                result['errors'] += errors
+
+        executor = ThreadPoolExecutor(max_workers=options['threads'])
+        clients = [
+            threading.Thread(target=run_client, args=(executor,))
+            for _ in range(options['clients'])
+        ]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        result['elapsed'] = time.perf_counter() - start
+        # close each worker thread's connection before the threads exit; the
+        # barrier makes every thread take one of the calls
+        barrier = threading.Barrier(options['threads'])
+
+        def close_connections():
+            barrier.wait()
+            connections.close_all()
+
+        for _ in range(options['threads']):
+            executor.submit(close_connections)
+        executor.shutdown()
+        return result
+
+    async def run_asgi(self, options, authorization):
+        """Runs the clients as coroutines on one event loop."""
+        handler = ASGIHandler()
+        path = '{}async/{}'.format(SINGLE_TASK_URL, options['path'])
+        result = {'timings': [], 'errors': 0}
+
+        async def handle_request():
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [
+                    (b'host', b'localhost'),
+                    (b'authorization', authorization.encode()),
+                ],
+                'client': ('127.0.0.1', 0),
+                'server': ('localhost', 80),
+            }
+            response_finished = asyncio.Event()
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            response_status = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await response_finished.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response_status.append(message['status'])
+
+            await handler(scope, receive, send)
+            response_finished.set()
+            return response_status[0]
+
+        async def run_client():
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                response_status = await handle_request()
+                result['timings'].append((time.perf_counter() - start) * 1000)
+                if response_status != status.HTTP_200_OK:
+                    result['errors'] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[run_client() for _ in range(options['clients'])])
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    def report(self, title, result):
+        timings = sorted(result['timings'])
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write('  {} requests, {} errors, {:.0f} requests/s'.format(
+            len(timings), result['errors'], len(timings) / result['elapsed']
+        ))
+        self.stdout.write('  latency: mean {:.2f} ms, p50 {:.2f} ms, p95 {:.2f} ms'.format(
+            statistics.mean(timings),
+            timings[len(timings) // 2],
+            timings[int(len(timings) * 0.95)]
+        ))
@@ -0,0 +1,139 @@
+import datetime
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from rest_framework import status
+
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = 'connection_benchmark_user'
+
+
+def start_response(response_status, headers, exc_info=None):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compares request latency with a new database connection per request
+    (CONN_MAX_AGE=0) against persistent connections (--conn-max-age).
+
+    --clients worker threads each send --requests authenticated GETs to
+    --path through Django's WSGI handler, the way the threads of a WSGI
+    server worker do, so connections are opened, reused and closed by the
+    same request signals as in production. Runs against the configured
+    database: MySQL, or SQLite with DATABASE_ENGINE=sqlite.
+
+    The seeded user and its tasks are removed again afterwards.
+    """
+    help = 'Benchmark request latency with and without persistent database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--conn-max-age', type=int, default=60)
+        parser.add_argument('--path', default='/api/single-task/unconfirmed/count/')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(BENCHMARK_USERNAME, password=None)
+        try:
+            user_profile = UserProfile.objects.create(user=user)
+            first_date = datetime.date.today() - datetime.timedelta(days=100)
+            SingleTask.objects.bulk_create([
+                SingleTask(
+                    task_name='Benchmark task {}'.format(day % 10),
+                    date=first_date + datetime.timedelta(days=day),
+                    user_profile=user_profile
+                )
+                for day in range(200)
+            ])
+            authorization = 'Token {}'.format(
+                UserProfileTokenObtainPairSerializer.get_token(user).access_token
+            )
+
+            settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+            original_conn_max_age = settings_dict['CONN_MAX_AGE']
+            try:
+                for conn_max_age in (0, options['conn_max_age']):
+                    settings_dict['CONN_MAX_AGE'] = conn_max_age
+                    self.report(
+                        'CONN_MAX_AGE={}'.format(conn_max_age),
+                        self.run_clients(options, authorization)
+                    )
+            finally:
+                settings_dict['CONN_MAX_AGE'] = original_conn_max_age
+        finally:
+            User.objects.filter(username=BENCHMARK_USERNAME).delete()
+
+    def run_clients(self, options, authorization):
+        """Runs the client threads and returns their timings and counters."""
+        handler = WSGIHandler()
+        request_factory = RequestFactory()
+        lock = threading.Lock()
+        result = {'timings': [], 'errors': 0, 'connections': 0}
+
+        def count_connection(sender, **kwargs):
+            with lock:
+                result['connections'] += 1
+
+        def run_client():
+            timings, errors = [], 0
+            try:
+                for _ in range(options['requests']):
+                    environ = request_factory.get(
+                        options['path'],
+                        HTTP_HOST='localhost',
+                        HTTP_AUTHORIZATION=authorization
+                    ).environ
+                    start = time.perf_counter()
+                    response = handler(environ, start_response)
+                    b''.join(response)
+                    # a WSGI server closes the response, which ends the request
+                    response.close()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    if response.status_code != status.HTTP_200_OK:
+                        errors += 1
+            finally:
+                connections.close_all()
+            with lock:
+                result['timings'].extend(timings)
+                result['errors'] += errors
+
+        connection_created.connect(count_connection)
+        try:
+            threads = [threading.Thread(target=run_client) for _ in range(options['clients'])]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            result['elapsed'] = time.perf_counter() - start
+        finally:
+            connection_created.disconnect(count_connection)
+        return result
+
+    def report(self, title, result):
+        timings = sorted(result['timings'])
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(
+            '  {} requests, {} errors, {} connections opened, {:.0f} requests/s'.format(
+                len(timings), result['errors'], result['connections'],
+                len(timings) / result['elapsed']
+            )
+        )
+        self.stdout.write('  latency: mean {:.2f} ms, p50 {:.2f} ms, p95 {:.2f} ms'.format(
+            statistics.mean(timings),
+            timings[len(timings) // 2],
+            timings[int(len(timings) * 0.95)]
+        ))
@@ -0,0 +1,76 @@
+import datetime
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from backend.renderers import MessagePackRenderer, ORJSONRenderer
+from single_task.models import SingleTask
+from single_task.serializers import SingleTaskSerializer
+from user_profiles.models import UserProfile
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = 'renderer_benchmark_user'
+
+RENDERERS = (
+    ('DRF json', JSONRenderer),
+    ('orjson', ORJSONRenderer),
+    ('MessagePack', MessagePackRenderer),
+)
+
+
+class Command(BaseCommand):
+    """
+    Seeds one user with --tasks-per-day SingleTasks for every day of 2026
+    and compares the encode time and payload size of the month and year
+    task lists with DRF's json renderer, orjson and MessagePack.
+
+    The user and the tasks are removed again afterwards.
+    """
+    help = 'Benchmark the JSON and MessagePack renderers on task lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks-per-day', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(BENCHMARK_USERNAME, password=None)
+        try:
+            user_profile = UserProfile.objects.create(user=user)
+            first_date = datetime.date(2026, 1, 1)
+            SingleTask.objects.bulk_create([
+                SingleTask(
+                    task_name='Benchmark task {}'.format(task_number),
+                    date=first_date + datetime.timedelta(days=day),
+                    user_profile=user_profile
+                )
+                for day in range(365)
+                for task_number in range(options['tasks_per_day'])
+            ], batch_size=5000)
+            tasks = SingleTask.objects.filter(user_profile=user_profile).order_by('date', 'id')
+            lists = {
+                'month': SingleTaskSerializer(
+                    tasks.filter(date__lt=datetime.date(2026, 2, 1)), many=True
+                ).data,
+                'year': SingleTaskSerializer(tasks, many=True).data,
+            }
+        finally:
+            user.delete()
+
+        for list_name, data in lists.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                '{} list ({} tasks)'.format(list_name, len(data))
+            ))
+            for renderer_name, renderer_class in RENDERERS:
+                renderer = renderer_class()
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    payload = renderer.render(data)
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write('  {}: mean {:.2f} ms, {} bytes'.format(
+                    renderer_name, statistics.mean(timings), len(payload)
+                ))
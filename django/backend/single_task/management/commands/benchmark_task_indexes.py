@@ -0,0 +1,134 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from single_task.models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    TASK_STATUS_PENDING,
+    SingleTask
+)
+from user_profiles.models import UserProfile
+
+User = get_user_model()
+
+BENCHMARK_USERNAME_PREFIX = 'index_benchmark_user_'
+
+STATUS_WEIGHTS = (
+    (TASK_STATUS_PENDING, 3),
+    (TASK_STATUS_COMPLETED, 6),
+    (TASK_STATUS_DEFERRED, 1),
+)
+
+
+class Command(BaseCommand):
+    """
+    Seeds a large number of SingleTask rows and compares the query plans and
+    latency of the single_task read queries with and without the composite
+    (user_profile, date, id) and (user_profile, status, date) indexes.
+
+    The seeded users and their tasks are removed again afterwards unless
+    --keep is given. Run against a disposable database.
+    """
+    help = 'Benchmark the SingleTask per-user indexes (before and after)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=2000000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--keep', action='store_true')
+
+    def handle(self, *args, **options):
+        profiles = self.seed(
+            options['tasks'], options['users'], options['batch_size']
+        )
+        sample_profile = profiles[len(profiles) // 2]
+        indexes = SingleTask._meta.indexes
+
+        try:
+            with connection.schema_editor() as schema_editor:
+                for index in indexes:
+                    schema_editor.remove_index(SingleTask, index)
+            self.report('Without composite indexes', sample_profile, options['repeat'])
+        finally:
+            with connection.schema_editor() as schema_editor:
+                for index in indexes:
+                    schema_editor.add_index(SingleTask, index)
+
+        self.report('With composite indexes', sample_profile, options['repeat'])
+
+        if not options['keep']:
+            User.objects.filter(
+                username__startswith=BENCHMARK_USERNAME_PREFIX
+            ).delete()
+
+    def seed(self, number_of_tasks, number_of_users, batch_size):
+        """Creates the benchmark users and bulk inserts their tasks."""
+        profiles = []
+        for user_number in range(number_of_users):
+            user = User.objects.create_user(
+                '{}{}'.format(BENCHMARK_USERNAME_PREFIX, user_number),
+                password=None
+            )
+            profiles.append(UserProfile.objects.create(user=user))
+
+        statuses = [status for status, weight in STATUS_WEIGHTS
+                    for _ in range(weight)]
+        first_date = datetime.date(2023, 1, 1)
+        start = time.perf_counter()
+        batch_of_tasks = []
+        for task_number in range(number_of_tasks):
+            batch_of_tasks.append(SingleTask(
+                task_name='Benchmark task {}'.format(task_number % 50),
+                date=first_date + datetime.timedelta(days=random.randint(0, 4 * 365)),
+                user_profile=profiles[task_number % number_of_users],
+                status=random.choice(statuses)
+            ))
+            if len(batch_of_tasks) == batch_size:
+                SingleTask.objects.bulk_create(batch_of_tasks)
+                batch_of_tasks = []
+        SingleTask.objects.bulk_create(batch_of_tasks)
+
+        self.stdout.write('Seeded {} tasks for {} users in {:.1f}s'.format(
+            number_of_tasks, number_of_users, time.perf_counter() - start
+        ))
+        return profiles
+
+    def get_benchmark_querysets(self, user_profile):
+        """The queries issued by the single_task read endpoints."""
+        today = datetime.date(2025, 6, 15)
+        return {
+            'task-by-date': SingleTask.objects.filter(
+                date=today,
+                user_profile=user_profile
+            ).order_by('id'),
+            'task-by-month-year': SingleTask.objects.filter(
+                date__gte=datetime.date(2025, 6, 1),
+                date__lt=datetime.date(2025, 7, 1),
+                user_profile=user_profile
+            ).order_by('date'),
+            'task-unconfirmed': SingleTask.objects.filter(
+                user_profile=user_profile,
+                date__lt=today
+            ).exclude(status=TASK_STATUS_COMPLETED).order_by('date'),
+        }
+
+    def report(self, title, user_profile, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in self.get_benchmark_querysets(user_profile).items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.values_list('id', flat=True))
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write('  {}: mean {:.2f} ms, max {:.2f} ms'.format(
+                name, statistics.mean(timings), max(timings)
+            ))
+            for line in queryset.explain().splitlines():
+                self.stdout.write('    {}'.format(line))
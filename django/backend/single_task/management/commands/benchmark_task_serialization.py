@@ -0,0 +1,79 @@
+import datetime
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from single_task.models import SingleTask
+from single_task.serializers import SingleTaskSerializer
+from user_profiles.models import UserProfile
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = 'serialization_benchmark_user'
+
+
+class Command(BaseCommand):
+    """
+    Seeds one user with --tasks SingleTasks (10,000 by default) and compares
+    rendering them with SingleTaskSerializer from model instances against
+    its values_list fast path, checking that both give the same bytes.
+
+    The user and the tasks are removed again afterwards.
+    """
+    help = 'Benchmark the SingleTask list serialization fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(BENCHMARK_USERNAME, password=None)
+        try:
+            user_profile = UserProfile.objects.create(user=user)
+            first_date = datetime.date(2026, 1, 1)
+            SingleTask.objects.bulk_create([
+                SingleTask(
+                    task_name='Benchmark task {}'.format(task_number % 50),
+                    date=first_date + datetime.timedelta(days=task_number % 365),
+                    user_profile=user_profile
+                )
+                for task_number in range(options['tasks'])
+            ], batch_size=5000)
+            queryset = SingleTask.objects.filter(
+                user_profile=user_profile
+            ).order_by('date', 'id')
+
+            regular_output, regular_timings = self.time_rendering(
+                lambda: SingleTaskSerializer(list(queryset.all()), many=True).data,
+                options['repeat']
+            )
+            fast_output, fast_timings = self.time_rendering(
+                lambda: SingleTaskSerializer(queryset.all(), many=True).data,
+                options['repeat']
+            )
+        finally:
+            user.delete()
+
+        if fast_output != regular_output:
+            raise CommandError('The fast path output differs from the serializer')
+        self.stdout.write('{} tasks, {} bytes'.format(options['tasks'], len(fast_output)))
+        for name, timings in (('ModelSerializer', regular_timings),
+                              ('values_list fast path', fast_timings)):
+            self.stdout.write('  {}: mean {:.1f} ms, min {:.1f} ms'.format(
+                name, statistics.mean(timings), min(timings)
+            ))
+        self.stdout.write(self.style.SUCCESS('Speedup: {:.1f}x'.format(
+            statistics.mean(regular_timings) / statistics.mean(fast_timings)
+        )))
+
+    def time_rendering(self, get_data, repeat):
+        """Returns the rendered JSON and the timings in ms, query included."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = JSONRenderer().render(get_data())
+            timings.append((time.perf_counter() - start) * 1000)
+        return output, timings
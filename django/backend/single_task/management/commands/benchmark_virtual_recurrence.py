@@ -0,0 +1,191 @@
+import datetime
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+
+from monthly_task.jobs import (
+    build_quarterly_tasks as build_monthly_quarterly_tasks,
+    build_recurrence_rule as build_monthly_recurrence_rule
+)
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+from response_cache.utils import get_response_cache
+from single_task.models import RecurrenceRule, SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.jobs import (
+    build_quarterly_tasks as build_weekly_quarterly_tasks,
+    build_recurrence_rule as build_weekly_recurrence_rule
+)
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+User = get_user_model()
+
+BENCHMARK_USERNAME_PREFIX = 'recurrence_benchmark_user_'
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+TABLE_NAMES = (SingleTask._meta.db_table, RecurrenceRule._meta.db_table)
+
+
+def start_response(response_status, headers, exc_info=None):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Applies --weekly weekly and --monthly monthly templates of each of
+    --users users to the current quarter, once by storing their tasks and
+    once by storing recurrence rules (SINGLE_TASK_VIRTUAL_RECURRENCE), and
+    compares the rows and bytes written and the latency of the current
+    month and unconfirmed task lists.
+
+    The lists are read through the WSGI handler with the response cache
+    cleared before each request, so every request queries the database.
+    The seeded users and their tasks are removed again afterwards.
+    """
+    help = 'Benchmark storing applied templates as recurrence rules against storing their tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--weekly', type=int, default=5)
+        parser.add_argument('--monthly', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        today = datetime.date.today()
+        year, quarter = today.year, 'Q{}'.format((today.month - 1) // 3 + 1)
+        try:
+            for title, virtual_recurrence in (
+                    ('Stored tasks', False), ('Recurrence rules', True)):
+                profiles = self.seed(options, title)
+                with override_settings(SINGLE_TASK_VIRTUAL_RECURRENCE=virtual_recurrence):
+                    bytes_before = self.get_table_bytes()
+                    start = time.perf_counter()
+                    rows = self.apply_templates(profiles, year, quarter, virtual_recurrence)
+                    elapsed = time.perf_counter() - start
+                    bytes_written = self.get_table_bytes()
+                    if bytes_before is not None:
+                        bytes_written -= bytes_before
+                    self.stdout.write(self.style.MIGRATE_HEADING(title))
+                    self.stdout.write('  applied in {:.2f} s, {} rows{}'.format(
+                        elapsed, rows,
+                        '' if bytes_before is None else ', {:.1f} KiB'.format(bytes_written / 1024)
+                    ))
+                    sample_user = profiles[len(profiles) // 2].user
+                    for path in ('current-month/', 'unconfirmed/'):
+                        self.report(path, self.time_requests(sample_user, path, options['repeat']))
+                User.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).delete()
+        finally:
+            User.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).delete()
+
+    def seed(self, options, title):
+        """Creates the benchmark users and their templates."""
+        profiles = []
+        for user_number in range(options['users']):
+            user = User.objects.create_user(
+                '{}{}'.format(BENCHMARK_USERNAME_PREFIX, user_number), password=None
+            )
+            user_profile = UserProfile.objects.create(user=user)
+            WeeklyTaskScheduler.objects.bulk_create([
+                WeeklyTaskScheduler(
+                    weekly_task_name='{} weekly {}'.format(title, number),
+                    day_of_week=number % 7,
+                    user_profile=user_profile
+                )
+                for number in range(options['weekly'])
+            ])
+            MonthlyTaskScheduler.objects.bulk_create([
+                MonthlyTaskScheduler(
+                    monthly_task_name='{} monthly {}'.format(title, number),
+                    day_of_month=number % 28 + 1,
+                    user_profile=user_profile
+                )
+                for number in range(options['monthly'])
+            ])
+            profiles.append(user_profile)
+        return profiles
+
+    def apply_templates(self, profiles, year, quarter, virtual_recurrence):
+        """Applies every template of the profiles, returning the rows stored."""
+        applications = []
+        for weekly_task_scheduler in WeeklyTaskScheduler.objects.filter(
+                user_profile__in=profiles).select_related('user_profile'):
+            applications.append((WeeklyTaskAppliedQuarterly.objects.create(
+                weekly_task_scheduler=weekly_task_scheduler, year=year, quarter=quarter
+            ), build_weekly_quarterly_tasks, build_weekly_recurrence_rule))
+        for monthly_task_scheduler in MonthlyTaskScheduler.objects.filter(
+                user_profile__in=profiles).select_related('user_profile'):
+            applications.append((MonthlyTaskAppliedQuarterly.objects.create(
+                monthly_task_scheduler=monthly_task_scheduler, year=year, quarter=quarter
+            ), build_monthly_quarterly_tasks, build_monthly_recurrence_rule))
+
+        if virtual_recurrence:
+            rules = RecurrenceRule.objects.bulk_create([
+                build_rule(application) for application, _, build_rule in applications
+            ])
+            return len(rules)
+        tasks = SingleTask.objects.bulk_create([
+            task
+            for application, build_tasks, _ in applications
+            for task in build_tasks(application)
+        ], batch_size=5000)
+        return len(tasks)
+
+    def get_table_bytes(self):
+        """Gets the size of the task and rule tables, if the database reports it."""
+        if connection.vendor == 'postgresql':
+            query = 'SELECT SUM(pg_total_relation_size(relname::regclass)) ' \
+                    'FROM unnest(%s::text[]) AS relname'
+            params = [list(TABLE_NAMES)]
+        elif connection.vendor == 'sqlite':
+            # dbstat lists the pages of the tables and of their indexes
+            query = 'SELECT SUM(pgsize) FROM dbstat WHERE name IN (' \
+                    'SELECT name FROM sqlite_master WHERE tbl_name IN (%s, %s))'
+            params = list(TABLE_NAMES)
+        else:
+            return None
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(query, params)
+            except Exception:
+                # e.g. SQLite built without the dbstat table
+                return None
+            return cursor.fetchone()[0] or 0
+
+    def time_requests(self, user, path, repeat):
+        handler = WSGIHandler()
+        environ = RequestFactory().get(
+            '{}{}'.format(SINGLE_TASK_URL, path),
+            HTTP_HOST='localhost',
+            HTTP_AUTHORIZATION='Token {}'.format(
+                UserProfileTokenObtainPairSerializer.get_token(user).access_token
+            )
+        ).environ
+        timings, number_of_tasks = [], 0
+        for _ in range(repeat):
+            get_response_cache().clear()
+            start = time.perf_counter()
+            response = handler(dict(environ), start_response)
+            content = b''.join(response)
+            response.close()
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != status.HTTP_200_OK:
+                raise RuntimeError('{} returned {}'.format(path, response.status_code))
+            number_of_tasks = content.count(b'"task_name"')
+        return timings, number_of_tasks
+
+    def report(self, path, result):
+        timings, number_of_tasks = result
+        timings = sorted(timings)
+        self.stdout.write('  {}: {} tasks, mean {:.2f} ms, p50 {:.2f} ms, p95 {:.2f} ms'.format(
+            path, number_of_tasks,
+            statistics.mean(timings),
+            timings[len(timings) // 2],
+            timings[int(len(timings) * 0.95)]
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from single_task.recurrence import materialize_recurrence_rules
+
+
+class Command(BaseCommand):
+    """
+    Stores every virtual occurrence of the recurrence rules as a SingleTask
+    and deletes the rules, e.g. before turning
+    SINGLE_TASK_VIRTUAL_RECURRENCE off:
+
+        python manage.py materialize_recurrence_rules
+    """
+    help = 'Store the occurrences of all recurrence rules as tasks and delete the rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--user-profile', type=int, action='append', dest='user_profile_ids',
+            help='Only materialize the rules of this user profile id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        number_of_rules, number_of_tasks = materialize_recurrence_rules(
+            user_profile_ids=options['user_profile_ids'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Materialized {} recurrence rules into {} tasks'.format(
+                number_of_rules, number_of_tasks
+            )
+        ))
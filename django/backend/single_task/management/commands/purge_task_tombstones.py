@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from single_task.models import SingleTaskTombstone
+
+
+class Command(BaseCommand):
+    """
+    Deletes the SingleTask tombstones older than
+    SINGLE_TASK_TOMBSTONE_RETENTION, e.g. from a daily cron job:
+
+        python manage.py purge_task_tombstones
+    """
+    help = 'Delete SingleTask tombstones older than the retention period'
+
+    def handle(self, *args, **options):
+        number_of_tombstones, _ = SingleTaskTombstone.custom_query.delete_expired()
+        self.stdout.write(self.style.SUCCESS(
+            'Deleted {} tombstones older than {}'.format(
+                number_of_tombstones, settings.SINGLE_TASK_TOMBSTONE_RETENTION
+            )
+        ))
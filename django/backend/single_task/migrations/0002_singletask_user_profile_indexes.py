@@ -0,0 +1,21 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='singletask',
+            index=models.Index(fields=['user_profile', 'date'], name='single_task_profile_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='singletask',
+            index=models.Index(fields=['user_profile', 'status', 'date'], name='single_task_profile_stat_idx'),
+        ),
+    ]
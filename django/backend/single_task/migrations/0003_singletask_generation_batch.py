@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_task', '0002_singletask_user_profile_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='singletask',
+            name='generation_batch',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('single_task', '0003_singletask_generation_batch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='singletask',
+            index=models.Index(fields=['user_profile', 'date', 'id'], name='single_task_profile_dtid_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='singletask',
+            name='single_task_profile_date_idx',
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.13 on 2026-10-17 18:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profiles', '0001_initial'),
+        ('single_task', '0004_singletask_profile_date_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SingleTaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('deleted_date_time', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'Single Task Tombstones',
+            },
+            managers=[
+                ('custom_query', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='singletask',
+            index=models.Index(fields=['user_profile', 'updated_date_time'], name='single_task_profile_upd_idx'),
+        ),
+        migrations.AddField(
+            model_name='singletasktombstone',
+            name='user_profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='single_task_tombstones', to='user_profiles.userprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='singletasktombstone',
+            index=models.Index(fields=['user_profile', 'deleted_date_time'], name='single_task_tomb_profile_idx'),
+        ),
+    ]
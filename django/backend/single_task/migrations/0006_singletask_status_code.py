@@ -0,0 +1,22 @@
+# Generated by Django 4.2.13 on 2026-10-17 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Expand: adds the nullable status_code column next to status. Running
+    code does not know about it, so this can be applied before deploying.
+    """
+
+    dependencies = [
+        ('single_task', '0005_singletasktombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='singletask',
+            name='status_code',
+            field=models.SmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.13 on 2026-10-17 20:05
+
+from django.db import migrations
+from django.db.models import Case, Value, When
+
+BACKFILL_BATCH_SIZE = 10000
+
+STATUS_CODES = {
+    'pending': 0,
+    'completed': 1,
+    'deferred': 2,
+    'cancelled': 3,
+}
+
+
+def copy_status_codes(apps, only_missing):
+    """
+    Copies status into status_code in batches of ids, each in its own short
+    transaction, so the table is never locked for long.
+
+    Args:
+        apps: The migration's app registry
+        only_missing: Only update the rows without a code yet
+    """
+    SingleTask = apps.get_model('single_task', 'SingleTask')
+    status_code = Case(
+        *[When(status=status, then=Value(code)) for status, code in STATUS_CODES.items()],
+        default=Value(0)
+    )
+    remaining_tasks = SingleTask._default_manager.order_by('id')
+    if only_missing:
+        remaining_tasks = remaining_tasks.filter(status_code__isnull=True)
+    last_id = 0
+    while True:
+        batch_ids = list(remaining_tasks.filter(id__gt=last_id).values_list(
+            'id', flat=True
+        )[:BACKFILL_BATCH_SIZE])
+        if not batch_ids:
+            break
+        remaining_tasks.filter(
+            id__gte=batch_ids[0], id__lte=batch_ids[-1]
+        ).update(status_code=status_code)
+        last_id = batch_ids[-1]
+
+
+def backfill_status_codes(apps, schema_editor):
+    """
+    Copies status into the rows without a status_code yet, so it can run
+    again to catch up.
+    """
+    copy_status_codes(apps, only_missing=True)
+
+
+def resync_status_codes(apps, schema_editor):
+    """
+    Copies status into status_code for every row, including the rows whose
+    status the old code changed after they were backfilled.
+    """
+    copy_status_codes(apps, only_missing=False)
+
+
+class Migration(migrations.Migration):
+    """
+    Backfill: runs outside of a single transaction, while the old code
+    keeps serving requests.
+    """
+    atomic = False
+
+    dependencies = [
+        ('single_task', '0006_singletask_status_code'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_status_codes, migrations.RunPython.noop),
+    ]
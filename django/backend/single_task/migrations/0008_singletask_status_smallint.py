@@ -0,0 +1,58 @@
+# Generated by Django 4.2.13 on 2026-10-17 20:05
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+backfill = import_module('single_task.migrations.0007_backfill_singletask_status_code')
+
+
+def restore_statuses(apps, schema_editor):
+    """Copies status_code back into the restored status column."""
+    SingleTask = apps.get_model('single_task', 'SingleTask')
+    SingleTask._default_manager.update(status=Case(
+        *[When(status_code=code, then=Value(status))
+          for status, code in backfill.STATUS_CODES.items()],
+        default=Value('pending')
+    ))
+
+
+class Migration(migrations.Migration):
+    """
+    Contract: applied together with the code that reads the integer status.
+    Copies every row's status again, catching up on the rows written or
+    changed since the backfill, then drops the old column and takes its
+    name, rebuilding the (user_profile, status, date) index on the two-byte
+    column.
+    """
+
+    dependencies = [
+        ('single_task', '0007_backfill_singletask_status_code'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill.resync_status_codes, restore_statuses),
+        migrations.RemoveIndex(
+            model_name='singletask',
+            name='single_task_profile_stat_idx',
+        ),
+        migrations.RemoveField(
+            model_name='singletask',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='singletask',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='singletask',
+            name='status',
+            field=models.SmallIntegerField(choices=[(0, 'Pending'), (1, 'Completed'), (2, 'Deferred'), (3, 'Cancelled')], default=0),
+        ),
+        migrations.AddIndex(
+            model_name='singletask',
+            index=models.Index(fields=['user_profile', 'status', 'date'], name='single_task_profile_stat_idx'),
+        ),
+    ]
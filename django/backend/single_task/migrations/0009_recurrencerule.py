@@ -0,0 +1,54 @@
+# Generated by Django 4.2.13 on 2026-10-17 19:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.manager
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_profiles', '0001_initial'),
+        ('single_task', '0008_singletask_status_smallint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurrenceRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation_batch', models.UUIDField(editable=False, unique=True)),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('monthly', 'Monthly')], max_length=10)),
+                ('interval', models.PositiveIntegerField(default=1)),
+                ('first_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('task_names', models.JSONField(default=list)),
+                ('created_date_time', models.DateTimeField(auto_now_add=True)),
+                ('updated_date_time', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Recurrence Rules',
+            },
+            managers=[
+                ('custom_query', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='singletask',
+            name='occurrence_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='singletask',
+            constraint=models.UniqueConstraint(fields=('generation_batch', 'occurrence_date'), name='single_task_unique_occurrence'),
+        ),
+        migrations.AddField(
+            model_name='recurrencerule',
+            name='user_profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence_rules', to='user_profiles.userprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='recurrencerule',
+            index=models.Index(fields=['user_profile', 'first_date', 'end_date'], name='single_task_rule_profile_idx'),
+        ),
+    ]
@@ -1,15 +1,56 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
 from user_profiles.models import UserProfile
 
+TASK_STATUS_PENDING = 0
+TASK_STATUS_COMPLETED = 1
+TASK_STATUS_DEFERRED = 2
+TASK_STATUS_CANCELLED = 3
+
 TASK_STATUS = (
-    ('pending', 'Pending'),
-    ('completed', 'Completed'),
-    ('deferred', 'Deferred'),
-    ('cancelled', 'Cancelled'),
+    (TASK_STATUS_PENDING, 'Pending'),
+    (TASK_STATUS_COMPLETED, 'Completed'),
+    (TASK_STATUS_DEFERRED, 'Deferred'),
+    (TASK_STATUS_CANCELLED, 'Cancelled'),
 )
 
+# The status values used by the API, and the codes they are stored as
+TASK_STATUS_CODES = {
+    'pending': TASK_STATUS_PENDING,
+    'completed': TASK_STATUS_COMPLETED,
+    'deferred': TASK_STATUS_DEFERRED,
+    'cancelled': TASK_STATUS_CANCELLED,
+}
+
+
+class SingleTaskQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        Delete the tasks and record a tombstone for each of them, so the
+        changes endpoint can report bulk deletes too.
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            deleted_date_time = timezone.now()
+            SingleTaskTombstone.objects.bulk_create([
+                SingleTaskTombstone(
+                    task_id=task_id,
+                    user_profile_id=user_profile_id,
+                    deleted_date_time=deleted_date_time
+                )
+                for task_id, user_profile_id in self.order_by().values_list(
+                    'id', 'user_profile_id'
+                ).iterator()
+            ], batch_size=1000)
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
-class SingleTaskManager(models.Manager):
+class SingleTaskManager(models.Manager.from_queryset(SingleTaskQuerySet)):
     """
     Custom manager for SingleTask model.
     Add custom query methods here as needed.
@@ -30,13 +71,13 @@ class SingleTaskManager(models.Manager):
         """
         return self.get_queryset().filter(
             user_id=user_id,
-            status='pending'
+            status=TASK_STATUS_PENDING
         )
 
 
 class SingleTask(models.Model):
     custom_query = SingleTaskManager()
-    objects = models.Manager()
+    objects = SingleTaskQuerySet.as_manager()
 
     task_name = models.CharField(max_length=255)
 
@@ -48,10 +89,9 @@ class SingleTask(models.Model):
         on_delete=models.CASCADE
     )
 
-    status = models.CharField(
-        max_length=50,
+    status = models.SmallIntegerField(
         choices=TASK_STATUS,
-        default='pending'
+        default=TASK_STATUS_PENDING
     )
 
     comments = models.TextField(
@@ -64,14 +104,22 @@ class SingleTask(models.Model):
 
     updated_date_time = models.DateTimeField(auto_now=True)
 
-    # Uncomment if you decide to implement the IntervalTaskGroup relation
-    # interval_task_group = models.ForeignKey(
-    #     'IntervalTaskGroup',
-    #     related_name='single_tasks',
-    #     on_delete=models.CASCADE,
-    #     null=True,
-    #     blank=True
-    # )
+    # The generation_batch of the weekly, monthly or interval quarterly
+    # application that created this task; None for tasks created directly
+    generation_batch = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+
+    # For a task stored when a virtual occurrence of a RecurrenceRule was
+    # changed, the date of that occurrence, which hides it from then on
+    occurrence_date = models.DateField(
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     def __str__(self):
         return "{} on {} - {} ({})".format(
@@ -83,4 +131,207 @@ class SingleTask(models.Model):
 
     class Meta:
         verbose_name_plural = 'Single Tasks'
-        ordering = ['-date', 'user_profile', 'task_name']
\ No newline at end of file
+        ordering = ['-date', 'user_profile', 'task_name']
+        indexes = [
+            # Day, month and range lookups for a single user, and keyset
+            # pages ordered by (date, id)
+            models.Index(
+                fields=['user_profile', 'date', 'id'],
+                name='single_task_profile_dtid_idx'
+            ),
+            # Uncompleted past tasks (status filter plus date range)
+            models.Index(
+                fields=['user_profile', 'status', 'date'],
+                name='single_task_profile_stat_idx'
+            ),
+            # Tasks changed since a sync cursor
+            models.Index(
+                fields=['user_profile', 'updated_date_time'],
+                name='single_task_profile_upd_idx'
+            ),
+        ]
+        constraints = [
+            # A virtual occurrence is stored at most once
+            models.UniqueConstraint(
+                fields=['generation_batch', 'occurrence_date'],
+                name='single_task_unique_occurrence'
+            ),
+        ]
+
+    def delete(self, *args, **kwargs):
+        """Delete the task and record its tombstone."""
+        with transaction.atomic():
+            SingleTaskTombstone.objects.create(
+                task_id=self.id,
+                user_profile_id=self.user_profile_id
+            )
+            return super().delete(*args, **kwargs)
+
+
+class SingleTaskTombstoneManager(models.Manager):
+    def delete_expired(self):
+        """
+        Delete all tombstones older than SINGLE_TASK_TOMBSTONE_RETENTION.
+        """
+        return self.get_queryset().filter(
+            deleted_date_time__lt=timezone.now() - settings.SINGLE_TASK_TOMBSTONE_RETENTION
+        ).delete()
+
+
+class SingleTaskTombstone(models.Model):
+    """
+    Records the id of a deleted SingleTask, so clients syncing through the
+    changes endpoint can drop it. Tombstones are purged after
+    SINGLE_TASK_TOMBSTONE_RETENTION; tasks removed together with their
+    user profile get none, since the profile's tombstones go with it.
+    """
+    custom_query = SingleTaskTombstoneManager()
+    objects = models.Manager()
+
+    task_id = models.BigIntegerField()
+
+    user_profile = models.ForeignKey(
+        UserProfile,
+        related_name='single_task_tombstones',
+        on_delete=models.CASCADE
+    )
+
+    deleted_date_time = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return "Task {} deleted on {}".format(self.task_id, self.deleted_date_time)
+
+    class Meta:
+        verbose_name_plural = 'Single Task Tombstones'
+        indexes = [
+            models.Index(
+                fields=['user_profile', 'deleted_date_time'],
+                name='single_task_tomb_profile_idx'
+            ),
+        ]
+
+RECURRENCE_DAILY = 'daily'
+RECURRENCE_MONTHLY = 'monthly'
+
+RECURRENCE_FREQUENCIES = (
+    (RECURRENCE_DAILY, 'Daily'),
+    (RECURRENCE_MONTHLY, 'Monthly'),
+)
+
+
+class RecurrenceRuleManager(models.Manager):
+    def user_rules_in_window(self, user_profile_id, start_date, end_date):
+        """
+        Get a user's rules with occurrences possibly between start_date
+        (inclusive, None for no lower bound) and end_date (exclusive).
+        """
+        queryset = self.get_queryset().filter(
+            user_profile_id=user_profile_id,
+            first_date__lt=end_date
+        )
+        if start_date is not None:
+            queryset = queryset.filter(end_date__gt=start_date)
+        return queryset
+
+
+class RecurrenceRule(models.Model):
+    """
+    A weekly, monthly or interval template applied to a quarter in virtual
+    mode (SINGLE_TASK_VIRTUAL_RECURRENCE). Instead of one SingleTask per
+    occurrence, the application is stored as this rule, and the task list
+    endpoints expand it into the occurrences of the requested dates. An
+    occurrence is only stored as a SingleTask, with the rule's
+    generation_batch and its occurrence_date, once it is changed.
+
+    The rule is a snapshot of the template, like materialized tasks are:
+    editing the template later does not change it.
+    """
+    custom_query = RecurrenceRuleManager()
+    objects = models.Manager()
+
+    user_profile = models.ForeignKey(
+        UserProfile,
+        related_name='recurrence_rules',
+        on_delete=models.CASCADE
+    )
+
+    # The generation_batch of the quarterly application
+    generation_batch = models.UUIDField(
+        unique=True,
+        editable=False
+    )
+
+    frequency = models.CharField(
+        max_length=10,
+        choices=RECURRENCE_FREQUENCIES
+    )
+
+    # Days (daily) or months (monthly) between occurrences
+    interval = models.PositiveIntegerField(default=1)
+
+    first_date = models.DateField()
+
+    # The first day after the last possible occurrence
+    end_date = models.DateField()
+
+    # The occurrences cycle through these names, starting with the first
+    task_names = models.JSONField(default=list)
+
+    created_date_time = models.DateTimeField(auto_now_add=True)
+
+    updated_date_time = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "{} every {} {} from {} - {}".format(
+            ', '.join(self.task_names),
+            self.interval,
+            'days' if self.frequency == RECURRENCE_DAILY else 'months',
+            self.first_date,
+            str(self.user_profile).title()
+        )
+
+    class Meta:
+        verbose_name_plural = 'Recurrence Rules'
+        indexes = [
+            models.Index(
+                fields=['user_profile', 'first_date', 'end_date'],
+                name='single_task_rule_profile_idx'
+            ),
+        ]
+
+    def get_occurrence_date(self, occurrence_number: int):
+        """Returns the date of the rule's occurrence_number-th occurrence."""
+        if self.frequency == RECURRENCE_DAILY:
+            return self.first_date + timedelta(days=self.interval * occurrence_number)
+        months = self.first_date.month - 1 + self.interval * occurrence_number
+        return self.first_date.replace(
+            year=self.first_date.year + months // 12, month=months % 12 + 1
+        )
+
+    def get_occurrences(self, start_date=None, end_date=None):
+        """
+        Yields (date, task name) of the occurrences from start_date
+        (inclusive) to end_date (exclusive), both optional, in date order.
+        """
+        if not self.task_names:
+            return
+        end_date = self.end_date if end_date is None else min(end_date, self.end_date)
+        occurrence_number = 0
+        if (start_date is not None and start_date > self.first_date
+                and self.frequency == RECURRENCE_DAILY):
+            # skip straight to the first occurrence in the window
+            occurrence_number = -(-(start_date - self.first_date).days // self.interval)
+        while True:
+            occurrence_date = self.get_occurrence_date(occurrence_number)
+            if occurrence_date >= end_date:
+                return
+            if start_date is None or occurrence_date >= start_date:
+                yield occurrence_date, self.task_names[occurrence_number % len(self.task_names)]
+            occurrence_number += 1
+
+    def get_task_name(self, occurrence_date):
+        """Returns the task name of the occurrence on a date, or None if there is none."""
+        for _, task_name in self.get_occurrences(
+                occurrence_date, occurrence_date + timedelta(days=1)):
+            return task_name
+        return None
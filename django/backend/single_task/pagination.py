@@ -0,0 +1,108 @@
+import base64
+import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class SingleTaskKeysetPagination(BasePagination):
+    """
+    Keyset pagination for SingleTask querysets ordered by (date, id).
+
+    Each page is fetched with an indexed range condition on (date, id) that
+    continues after the last task of the previous page, instead of an
+    OFFSET, so late pages cost the same as the first one and tasks created
+    or deleted in between do not shift the pages.
+    """
+    page_size = 500
+    max_page_size = 2000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request):
+        """Returns whether the request asks for a page (always, by default)."""
+        return True
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request):
+        """Returns the (date, id) after which the page starts, or None."""
+        encoded_cursor = request.query_params.get(self.cursor_query_param)
+        if encoded_cursor is None:
+            return None
+        try:
+            cursor = base64.urlsafe_b64decode(encoded_cursor.encode('ascii')).decode('ascii')
+            date_string, task_id = cursor.split('|')
+            return datetime.date.fromisoformat(date_string), int(task_id)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, task):
+        cursor = '{}|{}'.format(task.date.isoformat(), task.id)
+        return base64.urlsafe_b64encode(cursor.encode('ascii')).decode('ascii')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not self.is_requested(request):
+            return None
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            cursor_date, cursor_id = cursor
+            queryset = queryset.filter(
+                Q(date__gt=cursor_date) | Q(date=cursor_date, id__gt=cursor_id)
+            )
+
+        # One extra row tells whether there is a next page
+        page = list(queryset.order_by('date', 'id')[:page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.next_cursor = self.encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_first_link(self):
+        url = self.request.build_absolute_uri()
+        return remove_query_param(url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class OptionalSingleTaskKeysetPagination(SingleTaskKeysetPagination):
+    """
+    Keyset pagination that only applies when the request passes a cursor or
+    a page size, so existing clients expecting a plain list keep working.
+    """
+
+    def is_requested(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
@@ -0,0 +1,179 @@
+"""
+Precomputed quarter calendars for the recurring task generators.
+
+The weekly, monthly and interval task generators all need the same few
+things: the bounds of a quarter and the dates in it that fall on a day of
+the week, a day of the month or an interval. The date lists are computed
+once per argument combination and served from bounded LRU caches as
+immutable tuples, so callers must copy them before modifying.
+
+The quarterly application models only accept the years 2023 to 2035, which
+keeps the weekly and monthly tables small enough to precompute completely.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Tuple
+
+QUARTER_START_MONTHS = {
+    'Q1': 1,
+    'Q2': 4,
+    'Q3': 7,
+    'Q4': 10
+}
+
+# Matches the year validators on the AppliedQuarterly models
+FIRST_CALENDAR_YEAR = 2023
+LAST_CALENDAR_YEAR = 2035
+
+# The days of the week an interval task group may start on, in the order
+# of the Java app's array: Sunday first, then Monday to Saturday
+INTERVAL_START_DAYS_OF_WEEK = (6, 0, 1, 2, 3, 4, 5)
+
+
+@lru_cache(maxsize=128)
+def get_quarter_bounds(year: int, quarter: str) -> Tuple[date, date]:
+    """
+    Gets the first day of a quarter and the first day after it.
+
+    Args:
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        Tuple of (first day of the quarter, first day of the next quarter)
+    """
+    start_month = QUARTER_START_MONTHS[quarter]
+    first_day_of_quarter = date(year, start_month, 1)
+    if start_month == 10:
+        first_day_after_quarter = date(year + 1, 1, 1)
+    else:
+        first_day_after_quarter = date(year, start_month + 3, 1)
+    return first_day_of_quarter, first_day_after_quarter
+
+
+def _get_dates_by_step(first_date: date, end_date: date, step_in_days: int) -> Tuple[date, ...]:
+    """Returns the dates from first_date up to (excluding) end_date, step_in_days apart."""
+    number_of_dates = max(0, -(-(end_date - first_date).days // step_in_days))
+    return tuple(
+        first_date + timedelta(days=step_in_days * date_number)
+        for date_number in range(number_of_dates)
+    )
+
+
+@lru_cache(maxsize=512)
+def get_first_day_of_week_in_quarter(day_of_week: int, year: int, quarter: str) -> date:
+    """
+    Gets the first occurrence of a day of the week in a quarter.
+
+    Args:
+        day_of_week: Integer 0-6 (Monday=0, Sunday=6)
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        The first date in the quarter that falls on the day of the week
+    """
+    first_day_of_quarter, _ = get_quarter_bounds(year, quarter)
+    days_until_target = (day_of_week - first_day_of_quarter.weekday()) % 7
+    return first_day_of_quarter + timedelta(days=days_until_target)
+
+
+@lru_cache(maxsize=512)
+def get_weekly_dates(day_of_week: int, year: int, quarter: str) -> Tuple[date, ...]:
+    """
+    Gets all dates in a quarter that fall on a day of the week.
+
+    Args:
+        day_of_week: Integer 0-6 (Monday=0, Sunday=6)
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        Tuple of dates in ascending order
+    """
+    _, first_day_after_quarter = get_quarter_bounds(year, quarter)
+    return _get_dates_by_step(
+        get_first_day_of_week_in_quarter(day_of_week, year, quarter),
+        first_day_after_quarter,
+        7
+    )
+
+
+@lru_cache(maxsize=2048)
+def get_monthly_dates(day_of_month: int, year: int, quarter: str) -> Tuple[date, ...]:
+    """
+    Gets the dates in a quarter that fall on a day of the month.
+
+    Args:
+        day_of_month: Integer 1-28
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        Tuple of three dates, one per month of the quarter
+    """
+    start_month = QUARTER_START_MONTHS[quarter]
+    return tuple(
+        date(year, month, day_of_month)
+        for month in range(start_month, start_month + 3)
+    )
+
+
+@lru_cache(maxsize=512)
+def get_interval_start_offsets(interval: int, year: int, quarter: str) -> Tuple[int, ...]:
+    """
+    Gets the days between the first day of a quarter and the dates an
+    interval task group may start on: the first Sunday, Monday, ... of the
+    quarter, or only the first `interval` of those days when the interval
+    is shorter than a week.
+
+    Args:
+        interval: The number of days between dates
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        Tuple of offsets from 0 to 6
+    """
+    first_day_of_quarter, _ = get_quarter_bounds(year, quarter)
+    return tuple(
+        (get_first_day_of_week_in_quarter(day_of_week, year, quarter) - first_day_of_quarter).days
+        for day_of_week in INTERVAL_START_DAYS_OF_WEEK[:min(interval, 7)]
+    )
+
+
+@lru_cache(maxsize=1024)
+def get_interval_dates(
+        interval: int, start_offset: int, year: int, quarter: str
+) -> Tuple[date, ...]:
+    """
+    Gets the dates in a quarter that are an interval apart.
+
+    Args:
+        interval: The number of days between dates
+        start_offset: Days between the first day of the quarter and the first date
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+
+    Returns:
+        Tuple of dates in ascending order
+    """
+    first_day_of_quarter, first_day_after_quarter = get_quarter_bounds(year, quarter)
+    return _get_dates_by_step(
+        first_day_of_quarter + timedelta(days=start_offset),
+        first_day_after_quarter,
+        interval
+    )
+
+
+def precompute_quarter_calendars():
+    """
+    Fills the weekly and monthly caches for every year the quarterly
+    application models accept.
+    """
+    for year in range(FIRST_CALENDAR_YEAR, LAST_CALENDAR_YEAR + 1):
+        for quarter in QUARTER_START_MONTHS:
+            for day_of_week in range(7):
+                get_weekly_dates(day_of_week, year, quarter)
+            for day_of_month in range(1, 29):
+                get_monthly_dates(day_of_month, year, quarter)
@@ -0,0 +1,245 @@
+"""
+Virtual recurrence: serving the occurrences of RecurrenceRules as tasks.
+
+With SINGLE_TASK_VIRTUAL_RECURRENCE on, applying a weekly, monthly or
+interval template to a quarter stores one RecurrenceRule instead of a
+SingleTask per occurrence. The task list endpoints expand the rules of the
+requested dates into unsaved SingleTasks ("virtual tasks"), which are
+serialized like stored tasks but with a null id and an 'occurrence' key,
+"<generation_batch>/<date>". Changing an occurrence through
+POST /api/single-task/occurrence/<occurrence>/ stores it as a SingleTask
+with the rule's generation_batch and its occurrence_date, which hides the
+virtual task from then on.
+"""
+from datetime import date
+from operator import itemgetter
+from typing import Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from django.db import transaction
+
+from response_cache.utils import get_single_task_month_namespace, invalidate_cached_responses
+
+from .models import TASK_STATUS_PENDING, RecurrenceRule, SingleTask
+from .serializers import SingleTaskSerializer
+
+
+def get_occurrence_key(generation_batch: UUID, occurrence_date: date) -> str:
+    """Gets the key identifying a virtual task in the API."""
+    return '{}/{}'.format(generation_batch, occurrence_date.isoformat())
+
+
+def _get_stored_occurrences(
+        rules: List[RecurrenceRule], start_date: Optional[date], end_date: date
+):
+    """Gets a values_list() of (generation_batch, occurrence_date) of the stored occurrences."""
+    stored_occurrences = SingleTask.objects.filter(
+        generation_batch__in=[rule.generation_batch for rule in rules],
+        occurrence_date__lt=end_date
+    )
+    if start_date is not None:
+        stored_occurrences = stored_occurrences.filter(occurrence_date__gte=start_date)
+    return stored_occurrences.values_list('generation_batch', 'occurrence_date')
+
+
+def _build_virtual_tasks(
+        rules: Iterable[RecurrenceRule], stored_occurrences: Set[Tuple[UUID, date]],
+        start_date: Optional[date], end_date: Optional[date]
+) -> List[SingleTask]:
+    virtual_tasks = [
+        SingleTask(
+            task_name=task_name,
+            date=occurrence_date,
+            user_profile_id=rule.user_profile_id,
+            status=TASK_STATUS_PENDING,
+            created_date_time=rule.created_date_time,
+            updated_date_time=rule.updated_date_time,
+            generation_batch=rule.generation_batch,
+            occurrence_date=occurrence_date
+        )
+        for rule in rules
+        for occurrence_date, task_name in rule.get_occurrences(start_date, end_date)
+        if (rule.generation_batch, occurrence_date) not in stored_occurrences
+    ]
+    virtual_tasks.sort(key=lambda task: (task.date, task.task_name))
+    return virtual_tasks
+
+
+def get_virtual_tasks(
+        user_profile_id: int, start_date: Optional[date], end_date: date
+) -> List[SingleTask]:
+    """
+    Expands a user's RecurrenceRules into the occurrences that have not
+    been stored, in one query when the user has no rules for the dates and
+    two otherwise.
+
+    Args:
+        user_profile_id: The id of the user's profile
+        start_date: The first date (inclusive), or None for no lower bound
+        end_date: The date after the last date (exclusive)
+
+    Returns:
+        List of unsaved SingleTask instances, ordered by date and task name
+    """
+    rules = list(RecurrenceRule.custom_query.user_rules_in_window(
+        user_profile_id, start_date, end_date
+    ))
+    if not rules:
+        return []
+    stored_occurrences = set(_get_stored_occurrences(rules, start_date, end_date))
+    return _build_virtual_tasks(rules, stored_occurrences, start_date, end_date)
+
+
+async def aget_virtual_tasks(
+        user_profile_id: int, start_date: Optional[date], end_date: date
+) -> List[SingleTask]:
+    """Async version of get_virtual_tasks."""
+    rules = [
+        rule async for rule in RecurrenceRule.custom_query.user_rules_in_window(
+            user_profile_id, start_date, end_date
+        )
+    ]
+    if not rules:
+        return []
+    stored_occurrences = {
+        occurrence async for occurrence in _get_stored_occurrences(rules, start_date, end_date)
+    }
+    return _build_virtual_tasks(rules, stored_occurrences, start_date, end_date)
+
+
+def virtual_tasks_to_representation(
+        virtual_tasks: List[SingleTask], serializer_class=SingleTaskSerializer
+) -> List[dict]:
+    """Serializes virtual tasks like stored ones, adding their 'occurrence' key."""
+    serialized_tasks = serializer_class(virtual_tasks, many=True).data
+    for virtual_task, serialized_task in zip(virtual_tasks, serialized_tasks):
+        serialized_task['occurrence'] = get_occurrence_key(
+            virtual_task.generation_batch, virtual_task.occurrence_date
+        )
+    return serialized_tasks
+
+
+def merge_virtual_tasks(serialized_tasks: List[dict], serialized_virtual_tasks: List[dict]) -> List[dict]:
+    """
+    Merges serialized virtual tasks into serialized stored tasks by date;
+    on the same date the stored tasks come first, in their own order.
+    """
+    if not serialized_virtual_tasks:
+        return serialized_tasks
+    return sorted([*serialized_tasks, *serialized_virtual_tasks], key=itemgetter('date'))
+
+
+def store_occurrence(rule: RecurrenceRule, occurrence_date: date) -> Tuple[Optional[SingleTask], bool]:
+    """
+    Stores an occurrence of a rule as a pending SingleTask, unless it is
+    stored already.
+
+    Args:
+        rule: The RecurrenceRule
+        occurrence_date: The date of the occurrence
+
+    Returns:
+        Tuple of (the task, whether it was created), or (None, False) when
+        the rule has no occurrence on the date
+    """
+    task_name = rule.get_task_name(occurrence_date)
+    if task_name is None:
+        return None, False
+    with transaction.atomic():
+        return SingleTask.objects.get_or_create(
+            generation_batch=rule.generation_batch,
+            occurrence_date=occurrence_date,
+            defaults={
+                'task_name': task_name,
+                'date': occurrence_date,
+                'user_profile_id': rule.user_profile_id,
+            }
+        )
+
+
+def reschedule_recurrence_rule(
+        rule: RecurrenceRule, new_rule: RecurrenceRule, from_date: date
+) -> List[SingleTask]:
+    """
+    Replaces the occurrences of a rule from from_date on with those of a
+    rule built from its edited template. The virtual occurrences before
+    from_date are stored first, so they stay as they were.
+
+    Args:
+        rule: The RecurrenceRule, locked by the caller
+        new_rule: Unsaved RecurrenceRule of the edited template
+        from_date: The first date whose occurrences may change
+
+    Returns:
+        The stored occurrences from before from_date
+    """
+    stored_occurrences = set(_get_stored_occurrences([rule], None, from_date))
+    past_tasks = _build_virtual_tasks([rule], stored_occurrences, None, from_date)
+    SingleTask.objects.bulk_create(past_tasks)
+
+    # Start at the new rule's first occurrence from from_date on, rotating
+    # the task names so that every occurrence keeps the new rule's name
+    number_of_past_occurrences = sum(1 for _ in new_rule.get_occurrences(None, from_date))
+    rotation = number_of_past_occurrences % max(len(new_rule.task_names), 1)
+    rule.frequency = new_rule.frequency
+    rule.interval = new_rule.interval
+    rule.first_date = new_rule.get_occurrence_date(number_of_past_occurrences)
+    rule.task_names = new_rule.task_names[rotation:] + new_rule.task_names[:rotation]
+    rule.save()
+    return past_tasks
+
+
+def materialize_recurrence_rule(
+        rule: RecurrenceRule, batch_size: Optional[int] = None
+) -> List[SingleTask]:
+    """
+    Stores every virtual occurrence of a rule as a SingleTask and deletes
+    the rule.
+
+    Args:
+        rule: The RecurrenceRule, locked by the caller
+        batch_size: Maximum number of rows per bulk insert
+
+    Returns:
+        The stored tasks
+    """
+    stored_occurrences = set(_get_stored_occurrences([rule], None, rule.end_date))
+    virtual_tasks = _build_virtual_tasks([rule], stored_occurrences, None, None)
+    SingleTask.objects.bulk_create(virtual_tasks, batch_size=batch_size)
+    rule.delete()
+    return virtual_tasks
+
+
+def materialize_recurrence_rules(
+        user_profile_ids: Optional[List[int]] = None, batch_size: int = 5000
+) -> Tuple[int, int]:
+    """
+    Stores every virtual occurrence of the rules as a SingleTask and
+    deletes the rules, e.g. before turning SINGLE_TASK_VIRTUAL_RECURRENCE
+    off. Each rule is converted in its own transaction.
+
+    Args:
+        user_profile_ids: Optionally restrict to these users' rules
+        batch_size: Maximum number of rows per bulk insert
+
+    Returns:
+        Tuple of (number of rules, number of tasks created)
+    """
+    rules = RecurrenceRule.objects.order_by('id')
+    if user_profile_ids is not None:
+        rules = rules.filter(user_profile_id__in=user_profile_ids)
+
+    number_of_rules = number_of_tasks = 0
+    for rule in rules.iterator():
+        with transaction.atomic():
+            # lock the rule, so no occurrence is stored meanwhile
+            if not RecurrenceRule.objects.select_for_update().filter(id=rule.id).exists():
+                continue
+            virtual_tasks = materialize_recurrence_rule(rule, batch_size)
+        invalidate_cached_responses([rule.user_profile_id], {
+            get_single_task_month_namespace(task.date.year, task.date.month)
+            for task in virtual_tasks
+        })
+        number_of_rules += 1
+        number_of_tasks += len(virtual_tasks)
+    return number_of_rules, number_of_tasks
@@ -1,13 +1,241 @@
+import datetime
+
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
-from .models import SingleTask
+from rest_framework.settings import api_settings
+from .models import TASK_STATUS_CODES, SingleTask
+
+# Operations accepted by the batch endpoint
+BATCH_OPERATIONS = ('confirm', 'reschedule', 'delete')
+
+# Fields whose representation of a database value is the value itself;
+# subclasses may override to_representation, so they are matched exactly
+_PASSTHROUGH_FIELD_TYPES = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+# The API value of each stored status code
+_TASK_STATUS_VALUES = {code: value for value, code in TASK_STATUS_CODES.items()}
+
+
+class TaskStatusField(serializers.ChoiceField):
+    """
+    Keeps the API's status strings ('pending', 'completed', ...) while the
+    model stores the status as a small integer code.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(choices=list(TASK_STATUS_CODES), **kwargs)
+
+    def to_internal_value(self, data):
+        return TASK_STATUS_CODES[super().to_internal_value(data)]
+
+    def to_representation(self, value):
+        return _TASK_STATUS_VALUES[value]
+
+
+def _get_datetime_formatter(field):
+    """
+    Returns a function formatting a datetime exactly as the DRF field's
+    to_representation does with the ISO 8601 format.
+    """
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+    def format_datetime(value):
+        if not value:
+            return None
+        if field_timezone is not None:
+            if timezone.is_aware(value):
+                value = value.astimezone(field_timezone)
+            else:
+                value = timezone.make_aware(value, field_timezone)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return format_datetime
+
+
+def _passthrough(value):
+    return value
+
+
+def _format_date(value):
+    return value.isoformat() if value else None
+
+
+def _get_value_formatter(field):
+    """
+    Returns a function formatting a database value like the field would,
+    or None when the field has no fast path.
+    """
+    if '.' in field.source or field.source == '*':
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != 'iso-8601':
+            return None
+        return _get_datetime_formatter(field)
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is None or output_format.lower() != 'iso-8601':
+            return None
+        return _format_date
+    if type(field) is TaskStatusField:
+        return field.to_representation
+    if type(field) in _PASSTHROUGH_FIELD_TYPES:
+        return _passthrough
+    return None
+
+
+class SingleTaskListSerializer(serializers.ListSerializer):
+    """
+    Serializes querysets of tasks from .values_list() tuples, formatting
+    dates and datetimes directly, instead of building a model instance and
+    running every field's to_representation per row. The output is the
+    same as the child serializer's; anything other than an unevaluated
+    queryset, or a child with fields that have no fast path, uses the
+    regular path.
+    """
+
+    def get_row_fields(self):
+        """
+        Returns the field name, the source for values_list() and the value
+        formatter of each readable field, or None when a field has no fast
+        path.
+        """
+        row_fields = []
+        for field in self.child._readable_fields:
+            format_value = _get_value_formatter(field)
+            if format_value is None:
+                return None
+            row_fields.append((field.field_name, field.source, format_value))
+        return row_fields
+
+    def rows_to_representation(self, row_fields, rows):
+        """Formats values_list() rows selected for get_row_fields()."""
+        return [
+            {
+                field_name: None if value is None else format_value(value)
+                for (field_name, _, format_value), value in zip(row_fields, row)
+            }
+            for row in rows
+        ]
+
+    def to_representation(self, data):
+        if not isinstance(data, models.QuerySet) or data._result_cache is not None:
+            return super().to_representation(data)
+
+        row_fields = self.get_row_fields()
+        if row_fields is None:
+            return super().to_representation(data)
+
+        return self.rows_to_representation(
+            row_fields, data.values_list(*[source for _, source, _ in row_fields])
+        )
 
 
 class SingleTaskSerializer(serializers.ModelSerializer):
+    status = TaskStatusField(required=False)
+
     class Meta:
         model = SingleTask
+        list_serializer_class = SingleTaskListSerializer
         fields = (
             'id', 'task_name', 'date',
             'status', 'comments',
             'created_date_time', 'updated_date_time'
         ) #'user',
         read_only_fields = ('created_date_time', 'updated_date_time')
+
+
+class SingleTaskInDaySerializer(SingleTaskSerializer):
+    """
+    Used inside per-day buckets, where the date is already the bucket key.
+    """
+    class Meta(SingleTaskSerializer.Meta):
+        fields = (
+            'id', 'task_name',
+            'status', 'comments',
+            'created_date_time', 'updated_date_time'
+        )
+
+
+def to_columnar_representation(serialized_tasks, base_date=None) -> dict:
+    """
+    Converts serialized tasks into parallel arrays, one per field, which
+    repeat no keys. Dates become day offsets from base_date, statuses become
+    their TASK_STATUS_CODES and task names become indexes into a list of
+    the distinct names.
+
+    Args:
+        serialized_tasks: Tasks serialized by SingleTaskSerializer
+        base_date: The date the day offsets count from, e.g. the first day
+            of the month; defaults to the first task's date
+
+    Returns:
+        Dict with 'base_date', the 'statuses' listed by code, the distinct
+        'names' and the 'id', 'day', 'name', 'status', 'comments',
+        'created_date_time' and 'updated_date_time' arrays, and, when there
+        are virtual tasks (see single_task.recurrence), an 'occurrence'
+        array that is null for the stored tasks
+    """
+    name_indexes = {}
+    ids, days, names, statuses, comments = [], [], [], [], []
+    created_date_times, updated_date_times, occurrences = [], [], []
+    for task in serialized_tasks:
+        task_date = datetime.date.fromisoformat(task['date'])
+        if base_date is None:
+            base_date = task_date
+        ids.append(task['id'])
+        days.append((task_date - base_date).days)
+        names.append(name_indexes.setdefault(task['task_name'], len(name_indexes)))
+        statuses.append(TASK_STATUS_CODES[task['status']])
+        comments.append(task['comments'])
+        created_date_times.append(task['created_date_time'])
+        updated_date_times.append(task['updated_date_time'])
+        occurrences.append(task.get('occurrence'))
+
+    columnar_tasks = {
+        'base_date': base_date.isoformat() if base_date is not None else None,
+        'statuses': list(TASK_STATUS_CODES),
+        'names': list(name_indexes),
+        'id': ids,
+        'day': days,
+        'name': names,
+        'status': statuses,
+        'comments': comments,
+        'created_date_time': created_date_times,
+        'updated_date_time': updated_date_times,
+    }
+    if any(occurrences):
+        columnar_tasks['occurrence'] = occurrences
+    return columnar_tasks
+
+
+class SingleTaskBatchOperationSerializer(serializers.Serializer):
+    """
+    One operation of a batch request. A reschedule may set the date and
+    comments; confirm and delete only need the id.
+    """
+    op = serializers.ChoiceField(choices=BATCH_OPERATIONS)
+    id = serializers.IntegerField()
+    date = serializers.DateField(required=False)
+    comments = serializers.CharField(required=False, allow_blank=True)
+
+
+class SingleTaskOccurrenceSerializer(serializers.Serializer):
+    """
+    The changes made to a virtual task when storing it. Setting a date
+    without a status defers the task, like rescheduling does.
+    """
+    status = TaskStatusField(required=False)
+    date = serializers.DateField(required=False)
+    comments = serializers.CharField(required=False, allow_blank=True)
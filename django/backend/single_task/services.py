@@ -0,0 +1,543 @@
+from datetime import date, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from interval_task_group.models import (
+    IntervalTaskGroup,
+    IntervalTaskGroupAppliedQuarterly,
+)
+from interval_task_group.utils import (
+    generate_task_batch_by_date_list_and_interval_task_list,
+    get_default_first_day_offset,
+    get_first_day_offset,
+    get_interval_scheduling_dates_by_quarter,
+)
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+from response_cache.utils import (
+    INTERVAL_TASK_GROUP_NAMESPACE,
+    MONTHLY_TASK_NAMESPACE,
+    WEEKLY_TASK_NAMESPACE,
+    get_quarter_namespaces,
+    invalidate_cached_responses,
+)
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+from .models import TASK_STATUS_PENDING, RecurrenceRule, SingleTask
+from .quarter_calendar import get_monthly_dates, get_quarter_bounds, get_weekly_dates
+from .recurrence import reschedule_recurrence_rule
+
+# Number of templates whose applications are written in one transaction
+TEMPLATE_CHUNK_SIZE = 500
+
+
+def _chunked(iterable: Iterable, chunk_size: int) -> Iterator[List]:
+    """Yields lists of up to chunk_size items from iterable."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def _bulk_create_tasks(tasks: Iterable[SingleTask], batch_size: int) -> int:
+    """Inserts a stream of unsaved tasks batch_size rows at a time."""
+    number_of_tasks = 0
+    for batch_of_tasks in _chunked(tasks, batch_size):
+        SingleTask.objects.bulk_create(batch_of_tasks)
+        number_of_tasks += len(batch_of_tasks)
+    return number_of_tasks
+
+
+def _apply_weekly_schedulers(year, quarter, user_profile_ids, batch_size):
+    schedulers = WeeklyTaskScheduler.objects.exclude(
+        id__in=WeeklyTaskAppliedQuarterly.objects.filter(
+            year=year, quarter=quarter
+        ).values('weekly_task_scheduler_id')
+    )
+    if user_profile_ids is not None:
+        schedulers = schedulers.filter(user_profile_id__in=user_profile_ids)
+    rows = schedulers.order_by('id').values_list(
+        'id', 'weekly_task_name', 'day_of_week', 'user_profile_id'
+    )
+
+    number_of_applications = number_of_tasks = 0
+    for chunk in _chunked(rows.iterator(), TEMPLATE_CHUNK_SIZE):
+        quarterly_applications = [
+            WeeklyTaskAppliedQuarterly(
+                quarter=quarter, year=year, weekly_task_scheduler_id=scheduler_id
+            )
+            for scheduler_id, _, _, _ in chunk
+        ]
+        with transaction.atomic():
+            WeeklyTaskAppliedQuarterly.objects.bulk_create(quarterly_applications)
+            number_of_tasks += _bulk_create_tasks((
+                SingleTask(
+                    task_name=task_name,
+                    date=task_date,
+                    user_profile_id=user_profile_id,
+                    generation_batch=quarterly_application.generation_batch,
+                    occurrence_date=task_date
+                )
+                for (_, task_name, day_of_week, user_profile_id), quarterly_application
+                in zip(chunk, quarterly_applications)
+                for task_date in get_weekly_dates(day_of_week, year, quarter)
+            ), batch_size)
+        invalidate_cached_responses(
+            [user_profile_id for _, _, _, user_profile_id in chunk],
+            [WEEKLY_TASK_NAMESPACE] + get_quarter_namespaces(year, quarter)
+        )
+        number_of_applications += len(chunk)
+    return number_of_applications, number_of_tasks
+
+
+def _apply_monthly_schedulers(year, quarter, user_profile_ids, batch_size):
+    schedulers = MonthlyTaskScheduler.objects.exclude(
+        id__in=MonthlyTaskAppliedQuarterly.objects.filter(
+            year=year, quarter=quarter
+        ).values('monthly_task_scheduler_id')
+    )
+    if user_profile_ids is not None:
+        schedulers = schedulers.filter(user_profile_id__in=user_profile_ids)
+    rows = schedulers.order_by('id').values_list(
+        'id', 'monthly_task_name', 'day_of_month', 'user_profile_id'
+    )
+
+    number_of_applications = number_of_tasks = 0
+    for chunk in _chunked(rows.iterator(), TEMPLATE_CHUNK_SIZE):
+        quarterly_applications = [
+            MonthlyTaskAppliedQuarterly(
+                quarter=quarter, year=year, monthly_task_scheduler_id=scheduler_id
+            )
+            for scheduler_id, _, _, _ in chunk
+        ]
+        with transaction.atomic():
+            MonthlyTaskAppliedQuarterly.objects.bulk_create(quarterly_applications)
+            number_of_tasks += _bulk_create_tasks((
+                SingleTask(
+                    task_name=task_name,
+                    date=task_date,
+                    user_profile_id=user_profile_id,
+                    generation_batch=quarterly_application.generation_batch,
+                    occurrence_date=task_date
+                )
+                for (_, task_name, day_of_month, user_profile_id), quarterly_application
+                in zip(chunk, quarterly_applications)
+                for task_date in get_monthly_dates(day_of_month, year, quarter)
+            ), batch_size)
+        invalidate_cached_responses(
+            [user_profile_id for _, _, _, user_profile_id in chunk],
+            [MONTHLY_TASK_NAMESPACE] + get_quarter_namespaces(year, quarter)
+        )
+        number_of_applications += len(chunk)
+    return number_of_applications, number_of_tasks
+
+
+def _apply_interval_task_groups(year, quarter, user_profile_ids, batch_size):
+    # Groups without any interval tasks have nothing to rotate through
+    interval_task_groups = IntervalTaskGroup.custom_query.with_interval_tasks().filter(
+        interval_tasks__isnull=False
+    ).exclude(
+        id__in=IntervalTaskGroupAppliedQuarterly.objects.filter(
+            year=year, quarter=quarter
+        ).values('interval_task_group_id')
+    ).distinct()
+    if user_profile_ids is not None:
+        interval_task_groups = interval_task_groups.filter(
+            task_group_owner_id__in=user_profile_ids
+        )
+    interval_task_groups = interval_task_groups.order_by('id')
+
+    number_of_applications = number_of_tasks = 0
+    for chunk in _chunked(
+            interval_task_groups.iterator(chunk_size=TEMPLATE_CHUNK_SIZE),
+            TEMPLATE_CHUNK_SIZE):
+        quarterly_applications = [
+            IntervalTaskGroupAppliedQuarterly(
+                quarter=quarter, year=year, interval_task_group=interval_task_group,
+                first_day_offset=get_default_first_day_offset(
+                    interval_task_group.id, interval_task_group.interval_in_days, year, quarter
+                )
+            )
+            for interval_task_group in chunk
+        ]
+        with transaction.atomic():
+            IntervalTaskGroupAppliedQuarterly.objects.bulk_create(quarterly_applications)
+            number_of_tasks += _bulk_create_tasks((
+                task
+                for quarterly_application in quarterly_applications
+                for task in generate_task_batch_by_date_list_and_interval_task_list(
+                    quarterly_application.interval_task_group,
+                    get_interval_scheduling_dates_by_quarter(
+                        quarterly_application.interval_task_group.interval_in_days,
+                        year, quarter, quarterly_application.first_day_offset
+                    ),
+                    generation_batch=quarterly_application.generation_batch
+                )
+            ), batch_size)
+        invalidate_cached_responses(
+            [interval_task_group.task_group_owner_id for interval_task_group in chunk],
+            [INTERVAL_TASK_GROUP_NAMESPACE] + get_quarter_namespaces(year, quarter)
+        )
+        number_of_applications += len(chunk)
+    return number_of_applications, number_of_tasks
+
+
+def apply_templates_to_quarter(
+        year: int, quarter: str, batch_size: int = 5000,
+        user_profile_ids: Optional[List[int]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Applies every weekly, monthly and interval template that has not been
+    applied to a quarter yet, and materializes all of its SingleTasks.
+
+    Templates are processed TEMPLATE_CHUNK_SIZE at a time; each chunk's
+    applications and tasks are written in one transaction, and the tasks
+    are streamed into bulk_create batch_size rows at a time. The cached
+    responses of the affected users are invalidated after each chunk.
+
+    Args:
+        year: The year
+        quarter: String 'Q1', 'Q2', 'Q3', or 'Q4'
+        batch_size: Maximum number of rows per bulk insert
+        user_profile_ids: Optionally restrict to these users' templates
+
+    Returns:
+        Dict with the number of applications and tasks created per template type
+    """
+    results = {}
+    for template_type, apply_templates in (
+            ('weekly', _apply_weekly_schedulers),
+            ('monthly', _apply_monthly_schedulers),
+            ('interval', _apply_interval_task_groups)):
+        number_of_applications, number_of_tasks = apply_templates(
+            year, quarter, user_profile_ids, batch_size
+        )
+        results[template_type] = {
+            'applications': number_of_applications,
+            'tasks': number_of_tasks
+        }
+    return results
+
+
+def materialize_quarterly_application(
+        applications: models.QuerySet, application_id: int,
+        build_tasks: Callable[[models.Model], List[SingleTask]],
+        cache_namespace: str, job_context
+) -> int:
+    """
+    Creates the SingleTasks of one weekly, monthly or interval quarterly
+    application from a background job.
+
+    The tasks are written in one transaction that locks the application
+    row, so a concurrent delete of the application either happens first
+    (and nothing is written) or waits and then deletes the new tasks too.
+    A retried job that already wrote the tasks writes nothing.
+
+    Args:
+        applications: Queryset of the application model, with the relations
+            build_tasks needs selected
+        application_id: The id of the quarterly application
+        build_tasks: Returns the unsaved tasks of the application
+        cache_namespace: The response cache namespace of the template type
+        job_context: The running job's JobContext
+
+    Returns:
+        The number of tasks created
+    """
+    quarterly_application = applications.filter(id=application_id).first()
+    if quarterly_application is None:
+        # deleted before the job ran
+        return 0
+    batch_of_tasks = build_tasks(quarterly_application)
+    job_context.set_progress(0, len(batch_of_tasks))
+    job_context.throttle(len(batch_of_tasks))
+
+    with transaction.atomic():
+        # lock only the application row, not the rows of the joined relations
+        if not applications.model.objects.select_for_update().filter(
+                id=application_id).exists():
+            return 0
+        if SingleTask.objects.filter(
+                generation_batch=quarterly_application.generation_batch).exists():
+            return 0
+        SingleTask.objects.bulk_create(batch_of_tasks)
+
+    invalidate_cached_responses(
+        {task.user_profile_id for task in batch_of_tasks},
+        [cache_namespace] + get_quarter_namespaces(
+            quarterly_application.year, quarterly_application.quarter
+        )
+    )
+    job_context.set_progress(len(batch_of_tasks))
+    return len(batch_of_tasks)
+
+
+def reconcile_generated_tasks(
+        generation_batch: UUID, expected_tasks: List[SingleTask], from_date: date,
+        create_missing: bool = True
+) -> Tuple[Dict[str, int], Set[date]]:
+    """
+    Brings the pending tasks of a quarterly application dated from from_date
+    on in line with its tasks as computed now, with the fewest writes.
+
+    A generated task stands for the occurrence on its occurrence_date (its
+    date for tasks generated before occurrence dates were stored).
+    - Pending tasks whose occurrence is still scheduled are kept, and
+      renamed if the name changed.
+    - Pending tasks whose occurrence is no longer scheduled are moved to
+      the scheduled dates that have no task yet, and the rest are deleted.
+    - Scheduled dates still without a task get a new one.
+    Completed, deferred and cancelled tasks and tasks dated before
+    from_date are left alone, and their occurrences are not created again.
+    The updates run as one bulk_update, the deletes as one DELETE and the
+    inserts as one bulk_create, in one transaction.
+
+    Args:
+        generation_batch: The generation_batch of the quarterly application
+        expected_tasks: The unsaved tasks of the application as computed
+            now; those dated before from_date are ignored
+        from_date: The first date whose tasks may change
+        create_missing: False to leave the scheduled dates without a task
+            empty, e.g. when a RecurrenceRule serves them
+
+    Returns:
+        Tuple of (dict with the numbers of created, updated and deleted
+        tasks, set of the dates whose tasks changed)
+    """
+    expected_tasks = {task.date: task for task in expected_tasks if task.date >= from_date}
+    generated_tasks = SingleTask.objects.filter(
+        models.Q(date__gte=from_date) | models.Q(occurrence_date__gte=from_date),
+        generation_batch=generation_batch
+    ).order_by('date', 'id')
+
+    # The occurrences that keep a task
+    kept_occurrence_dates = set()
+    updated_tasks, obsolete_tasks = [], []
+    changed_dates = set()
+    for task in generated_tasks:
+        occurrence_date = task.occurrence_date or task.date
+        if task.status != TASK_STATUS_PENDING or task.date < from_date:
+            kept_occurrence_dates.add(occurrence_date)
+        elif occurrence_date in expected_tasks and occurrence_date not in kept_occurrence_dates:
+            kept_occurrence_dates.add(occurrence_date)
+            task_name = expected_tasks[occurrence_date].task_name
+            if task.task_name != task_name:
+                task.task_name = task_name
+                updated_tasks.append(task)
+                changed_dates.add(task.date)
+        else:
+            obsolete_tasks.append(task)
+
+    missing_tasks = [
+        task for occurrence_date, task in sorted(expected_tasks.items())
+        if occurrence_date not in kept_occurrence_dates
+    ]
+    for task, missing_task in zip(obsolete_tasks, missing_tasks):
+        changed_dates.update((task.date, missing_task.date))
+        task.date = task.occurrence_date = missing_task.date
+        task.task_name = missing_task.task_name
+        updated_tasks.append(task)
+    deleted_tasks = obsolete_tasks[len(missing_tasks):]
+    created_tasks = missing_tasks[len(obsolete_tasks):] if create_missing else []
+    changed_dates.update(task.date for task in deleted_tasks)
+    for task in created_tasks:
+        task.occurrence_date = task.date
+        changed_dates.add(task.date)
+
+    # bulk_update() does not apply auto_now
+    now = timezone.now()
+    for task in updated_tasks:
+        task.updated_date_time = now
+    with transaction.atomic():
+        if updated_tasks:
+            SingleTask.objects.bulk_update(
+                updated_tasks, ['task_name', 'date', 'occurrence_date', 'updated_date_time']
+            )
+        if deleted_tasks:
+            SingleTask.objects.filter(id__in=[task.id for task in deleted_tasks]).delete()
+        if created_tasks:
+            SingleTask.objects.bulk_create(created_tasks)
+
+    return {
+        'created_task_count': len(created_tasks),
+        'updated_task_count': len(updated_tasks),
+        'deleted_task_count': len(deleted_tasks)
+    }, changed_dates
+
+
+def reschedule_quarterly_applications(
+        applications: models.QuerySet,
+        build_tasks: Callable[[models.Model], List[SingleTask]],
+        build_rule: Callable[[models.Model], RecurrenceRule],
+        from_date: Optional[date] = None
+) -> Tuple[Dict[str, int], Set[date]]:
+    """
+    Updates the tasks of a weekly or monthly template's quarterly
+    applications after the template was edited, from from_date on, with
+    reconcile_generated_tasks. An application stored as a RecurrenceRule
+    has its rule rescheduled instead. Applications of past quarters, and
+    applications whose job has not created their tasks yet, are skipped.
+
+    Call it in the transaction that saves the template, so the template
+    and its tasks change together.
+
+    Args:
+        applications: Queryset of the template's quarterly applications,
+            with the relations build_tasks and build_rule need selected
+        build_tasks: Returns the unsaved tasks of an application
+        build_rule: Returns the unsaved RecurrenceRule of an application
+        from_date: The first date whose tasks may change, today by default
+
+    Returns:
+        Tuple of (dict with the numbers of created, updated and deleted
+        tasks, set of the dates whose tasks changed)
+    """
+    if from_date is None:
+        from_date = date.today()
+    task_counts = {'created_task_count': 0, 'updated_task_count': 0, 'deleted_task_count': 0}
+    changed_dates = set()
+
+    for quarterly_application in applications:
+        _, first_day_after_quarter = get_quarter_bounds(
+            quarterly_application.year, quarterly_application.quarter
+        )
+        if first_day_after_quarter <= from_date:
+            continue
+        # lock the application, so its job and deletes wait for the new tasks
+        applications.model.objects.select_for_update().filter(
+            id=quarterly_application.id).exists()
+        generation_batch = quarterly_application.generation_batch
+
+        rule = RecurrenceRule.objects.select_for_update().filter(
+            generation_batch=generation_batch).first()
+        if rule is not None:
+            changed_dates.update(
+                occurrence_date for occurrence_date, _ in rule.get_occurrences(from_date)
+            )
+            changed_dates.update(
+                task.date for task in
+                reschedule_recurrence_rule(rule, build_rule(quarterly_application), from_date)
+            )
+            expected_tasks = [
+                SingleTask(
+                    task_name=task_name,
+                    date=occurrence_date,
+                    user_profile_id=rule.user_profile_id,
+                    generation_batch=generation_batch
+                )
+                for occurrence_date, task_name in rule.get_occurrences(from_date)
+            ]
+            changed_dates.update(task.date for task in expected_tasks)
+        elif SingleTask.objects.filter(generation_batch=generation_batch).exists():
+            expected_tasks = build_tasks(quarterly_application)
+        else:
+            # The job will create the tasks of the edited template
+            continue
+
+        application_task_counts, application_changed_dates = reconcile_generated_tasks(
+            generation_batch, expected_tasks, from_date, create_missing=rule is None
+        )
+        for key, count in application_task_counts.items():
+            task_counts[key] += count
+        changed_dates.update(application_changed_dates)
+    return task_counts, changed_dates
+
+
+def rerotate_quarterly_applications(
+        applications: models.QuerySet, task_names: Iterable[str],
+        from_date: Optional[date] = None
+) -> Tuple[int, Set[date]]:
+    """
+    Reassigns the names of an interval task group's round-robin to the
+    pending tasks of its quarterly applications from from_date on, after
+    tasks were added to or removed from the group. The dates stay as
+    they are, and all renamed tasks are written with one bulk_update.
+
+    The n-th occurrence of an application gets
+    task_names[n % len(task_names)], as when the group is applied; n is
+    counted in intervals from the application's first date, its first day
+    offset into the quarter. An
+    application stored as a RecurrenceRule gets the new names on its rule.
+    Nothing changes when task_names is empty.
+
+    Args:
+        applications: Queryset of the group's IntervalTaskGroupAppliedQuarterly,
+            with interval_task_group selected
+        task_names: The group's task names, in the order they are applied;
+            only read when the group has applications that have not ended
+        from_date: The first date whose tasks may change, today by default
+
+    Returns:
+        Tuple of (number of renamed tasks, set of the dates whose tasks changed)
+    """
+    if from_date is None:
+        from_date = date.today()
+    quarterly_applications = [
+        quarterly_application for quarterly_application in applications
+        if get_quarter_bounds(
+            quarterly_application.year, quarterly_application.quarter
+        )[1] > from_date
+    ]
+    if not quarterly_applications:
+        return 0, set()
+    task_names = list(task_names)
+    if not task_names:
+        return 0, set()
+    renamed_tasks = []
+    changed_dates = set()
+
+    for quarterly_application in quarterly_applications:
+        # lock the application, so its job and deletes wait for the new names
+        applications.model.objects.select_for_update().filter(
+            id=quarterly_application.id).exists()
+        generation_batch = quarterly_application.generation_batch
+        interval = quarterly_application.interval_task_group.interval_in_days
+
+        # the date the application's tasks were generated from
+        first_date = get_quarter_bounds(
+            quarterly_application.year, quarterly_application.quarter
+        )[0] + timedelta(days=get_first_day_offset(quarterly_application))
+        rule = RecurrenceRule.objects.select_for_update().filter(
+            generation_batch=generation_batch).first()
+        if rule is not None:
+            interval = rule.interval
+            changed_dates.update(
+                occurrence_date for occurrence_date, _ in rule.get_occurrences(from_date)
+            )
+            changed_dates.update(task.date for task in reschedule_recurrence_rule(
+                rule,
+                RecurrenceRule(
+                    frequency=rule.frequency,
+                    interval=interval,
+                    first_date=first_date,
+                    end_date=rule.end_date,
+                    task_names=task_names
+                ),
+                from_date
+            ))
+
+        pending_tasks = SingleTask.objects.filter(
+            generation_batch=generation_batch,
+            status=TASK_STATUS_PENDING,
+            date__gte=from_date
+        ).only('id', 'task_name', 'date', 'occurrence_date')
+        for task in pending_tasks:
+            occurrence_number = (
+                (task.occurrence_date or task.date) - first_date
+            ).days // interval
+            task_name = task_names[occurrence_number % len(task_names)]
+            if task.task_name != task_name:
+                task.task_name = task_name
+                renamed_tasks.append(task)
+                changed_dates.add(task.date)
+
+    # bulk_update() does not apply auto_now
+    now = timezone.now()
+    for task in renamed_tasks:
+        task.updated_date_time = now
+    SingleTask.objects.bulk_update(renamed_tasks, ['task_name', 'updated_date_time'])
+    return len(renamed_tasks), changed_dates
@@ -0,0 +1,68 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from backend import settings_api
+from response_cache.utils import get_response_cache
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+@override_settings(
+    MIDDLEWARE=settings_api.MIDDLEWARE,
+    ROOT_URLCONF=settings_api.ROOT_URLCONF,
+    REST_FRAMEWORK=settings_api.REST_FRAMEWORK
+)
+class ApiProfileTests(TestCase):
+    """Test the single task API under the API-only settings profile"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.test_user = get_test_user()
+        UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_jwt_requests_are_served(self):
+        """Test JWT requests are served without sessions or CSRF tokens"""
+        print("Test JWT requests are served without sessions or CSRF tokens")
+        res = self.client.post('{}create/'.format(SINGLE_TASK_URL), {
+            'task_name': 'New task',
+            'date': datetime.date.today().isoformat()
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        res = self.client.get('{}current-month/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertNotIn('Set-Cookie', res)
+
+    def test_admin_is_not_routed(self):
+        """Test the admin is not part of the API-only URLs"""
+        print("Test the admin is not part of the API-only URLs")
+        self.assertEqual(self.client.get('/admin/').status_code, status.HTTP_404_NOT_FOUND)
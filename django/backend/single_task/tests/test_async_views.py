@@ -0,0 +1,120 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from response_cache.utils import get_response_cache
+from single_task.models import TASK_STATUS_COMPLETED, TASK_STATUS_PENDING, SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class AsyncSingleTaskListViewTests(TestCase):
+    """Test the async versions of the single task list views"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.today = datetime.date.today()
+        for day_offset in range(-40, 40, 3):
+            SingleTask.objects.create(
+                task_name='Task {}'.format(day_offset),
+                date=self.today + datetime.timedelta(days=day_offset),
+                user_profile=self.test_user_profile,
+                status=TASK_STATUS_COMPLETED if day_offset % 2 else TASK_STATUS_PENDING,
+                comments='Comment {}'.format(day_offset)
+            )
+        self.auth_header = get_token_auth_header(self.test_user)
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
+
+    def get_paths(self):
+        return (
+            'date/{}/'.format(self.today.isoformat()),
+            'month-year/{}/{}/'.format(self.today.month, self.today.year),
+            'current-month/',
+            'unconfirmed/',
+        )
+
+    def test_async_views_match_sync_views(self):
+        """Test the async views return the same tasks as the sync views"""
+        print("Test the async views return the same tasks as the sync views")
+        for path in self.get_paths():
+            sync_res = self.client.get('{}{}'.format(SINGLE_TASK_URL, path))
+            async_res = self.client.get('{}async/{}'.format(SINGLE_TASK_URL, path))
+            self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_res['Content-Type'], 'application/json')
+            self.assertEqual(async_res.json(), sync_res.json())
+
+    def test_async_view_query_count(self):
+        """Test the async view reads the user and the tasks in two queries"""
+        print("Test the async view reads the user and the tasks in two queries")
+        with self.assertNumQueries(2):
+            res = self.client.get('{}async/unconfirmed/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_async_view_without_profile_claim(self):
+        """Test tokens without the profile id claim look up the profile"""
+        print("Test tokens without the profile id claim look up the profile")
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(
+            AccessToken.for_user(self.test_user)
+        ))
+        with self.assertNumQueries(3):
+            res = self.client.get('{}async/current-month/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            self.client.get('{}current-month/'.format(SINGLE_TASK_URL)).json()
+        )
+
+    def test_async_view_requires_authentication(self):
+        """Test the async views reject missing and invalid tokens"""
+        print("Test the async views reject missing and invalid tokens")
+        url = '{}async/current-month/'.format(SINGLE_TASK_URL)
+        self.client.credentials()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', res)
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_client(self):
+        """Test the async view under the async request handler"""
+        print("Test the async view under the async request handler")
+        res = await self.async_client.get(
+            '{}async/unconfirmed/'.format(SINGLE_TASK_URL),
+            AUTHORIZATION=self.auth_header
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(res.json()),
+            await SingleTask.objects.filter(
+                date__lt=self.today
+            ).exclude(status=TASK_STATUS_COMPLETED).acount()
+        )
@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase
+
+from interval_task_group.utils import get_interval_scheduling_dates_by_quarter
+from monthly_task.utils import get_monthly_scheduling_dates_by_quarter
+from single_task.quarter_calendar import (
+    FIRST_CALENDAR_YEAR,
+    LAST_CALENDAR_YEAR,
+    QUARTER_START_MONTHS,
+    get_first_day_of_week_in_quarter,
+    get_interval_dates,
+    get_interval_start_offsets,
+    get_monthly_dates,
+    get_quarter_bounds,
+    get_weekly_dates,
+)
+from weekly_task.utils import get_weekly_scheduling_dates_by_quarter
+
+YEARS = range(FIRST_CALENDAR_YEAR, LAST_CALENDAR_YEAR + 1)
+QUARTERS = list(QUARTER_START_MONTHS)
+
+
+# The generators as they were before the quarter calendar was introduced,
+# kept as the reference the calendar has to match
+def reference_first_day_of_week(day_of_week, year, quarter):
+    first_day_of_quarter = date(year, QUARTER_START_MONTHS[quarter], 1)
+    days_until_target = (day_of_week - first_day_of_quarter.weekday()) % 7
+    target_date = first_day_of_quarter + timedelta(days=days_until_target)
+    if quarter == 'Q1':
+        if target_date.month == 12 and target_date.year < year:
+            target_date = target_date + timedelta(weeks=1)
+    elif quarter == 'Q2':
+        if target_date.month < 4:
+            target_date = target_date + timedelta(weeks=1)
+    elif quarter == 'Q3':
+        if target_date.month < 7:
+            target_date = target_date + timedelta(weeks=1)
+    else:
+        if target_date.month < 10:
+            target_date = target_date + timedelta(weeks=1)
+    return target_date
+
+
+def reference_dates_by_step(date_in_quarter, year, quarter, step):
+    dates = []
+    if quarter == 'Q1':
+        while date_in_quarter.month < 4:
+            dates.append(date_in_quarter)
+            date_in_quarter = date_in_quarter + timedelta(days=step)
+    elif quarter == 'Q2':
+        while date_in_quarter.month < 7:
+            dates.append(date_in_quarter)
+            date_in_quarter = date_in_quarter + timedelta(days=step)
+    elif quarter == 'Q3':
+        while date_in_quarter.month < 10:
+            dates.append(date_in_quarter)
+            date_in_quarter = date_in_quarter + timedelta(days=step)
+    else:
+        next_year = year + 1
+        while date_in_quarter.year < next_year:
+            dates.append(date_in_quarter)
+            date_in_quarter = date_in_quarter + timedelta(days=step)
+    return dates
+
+
+def reference_weekly_dates(day_of_week, year, quarter):
+    return reference_dates_by_step(
+        reference_first_day_of_week(day_of_week, year, quarter), year, quarter, 7
+    )
+
+
+def reference_monthly_dates(day_of_month, year, quarter):
+    start_month = QUARTER_START_MONTHS[quarter]
+    return [date(year, month, day_of_month)
+            for month in range(start_month, start_month + 3)]
+
+
+class QuarterCalendarEquivalenceTests(SimpleTestCase):
+    """Test the quarter calendar against the original date generators"""
+
+    def test_quarter_bounds(self):
+        """Test the quarter bounds for every supported year"""
+        print("Test the quarter bounds for every supported year")
+        for year in YEARS:
+            self.assertEqual(get_quarter_bounds(year, 'Q1'), (date(year, 1, 1), date(year, 4, 1)))
+            self.assertEqual(get_quarter_bounds(year, 'Q2'), (date(year, 4, 1), date(year, 7, 1)))
+            self.assertEqual(get_quarter_bounds(year, 'Q3'), (date(year, 7, 1), date(year, 10, 1)))
+            self.assertEqual(get_quarter_bounds(year, 'Q4'), (date(year, 10, 1), date(year + 1, 1, 1)))
+
+    def test_weekly_dates_match_reference(self):
+        """Test the weekly dates for every year, quarter and day of week"""
+        print("Test the weekly dates for every year, quarter and day of week")
+        for year in YEARS:
+            for quarter in QUARTERS:
+                for day_of_week in range(7):
+                    expected = reference_weekly_dates(day_of_week, year, quarter)
+                    self.assertEqual(
+                        get_first_day_of_week_in_quarter(day_of_week, year, quarter),
+                        reference_first_day_of_week(day_of_week, year, quarter)
+                    )
+                    self.assertEqual(list(get_weekly_dates(day_of_week, year, quarter)), expected)
+                    self.assertEqual(
+                        get_weekly_scheduling_dates_by_quarter(day_of_week, year, quarter),
+                        expected
+                    )
+
+    def test_monthly_dates_match_reference(self):
+        """Test the monthly dates for every year, quarter and day of month"""
+        print("Test the monthly dates for every year, quarter and day of month")
+        for year in YEARS:
+            for quarter in QUARTERS:
+                for day_of_month in range(1, 29):
+                    expected = reference_monthly_dates(day_of_month, year, quarter)
+                    self.assertEqual(list(get_monthly_dates(day_of_month, year, quarter)), expected)
+                    self.assertEqual(
+                        get_monthly_scheduling_dates_by_quarter(year, quarter, day_of_month),
+                        expected
+                    )
+
+    def test_interval_dates_match_reference(self):
+        """Test the interval dates for every year, quarter, start offset and interval"""
+        print("Test the interval dates for every year, quarter, start offset and interval")
+        for year in YEARS:
+            for quarter in QUARTERS:
+                first_day_of_quarter, _ = get_quarter_bounds(year, quarter)
+                for start_offset in range(7):
+                    first_date = first_day_of_quarter + timedelta(days=start_offset)
+                    for interval in range(1, 100):
+                        self.assertEqual(
+                            list(get_interval_dates(interval, start_offset, year, quarter)),
+                            reference_dates_by_step(first_date, year, quarter, interval)
+                        )
+
+    def test_interval_scheduling_dates_match_reference(self):
+        """Test the interval generator for every possible starting day"""
+        print("Test the interval generator for every possible starting day")
+        possible_days_to_begin = [6, 0, 1, 2, 3, 4, 5]
+        for year in YEARS:
+            for quarter in QUARTERS:
+                first_day_of_quarter, _ = get_quarter_bounds(year, quarter)
+                for interval in (1, 2, 3, 7, 10, 30):
+                    first_dates = [
+                        reference_first_day_of_week(day_of_week, year, quarter)
+                        for day_of_week in possible_days_to_begin[:min(interval, 7)]
+                    ]
+                    start_offsets = get_interval_start_offsets(interval, year, quarter)
+                    self.assertEqual(
+                        [first_day_of_quarter + timedelta(days=start_offset)
+                         for start_offset in start_offsets],
+                        first_dates
+                    )
+                    for start_offset, first_date in zip(start_offsets, first_dates):
+                        self.assertEqual(
+                            get_interval_scheduling_dates_by_quarter(
+                                interval, year, quarter, start_offset
+                            ),
+                            reference_dates_by_step(first_date, year, quarter, interval)
+                        )
+
+    def test_cached_dates_are_copied(self):
+        """Test that callers cannot modify the cached date lists"""
+        print("Test that callers cannot modify the cached date lists")
+        dates = get_weekly_scheduling_dates_by_quarter(0, 2026, 'Q1')
+        dates.clear()
+        self.assertEqual(len(get_weekly_scheduling_dates_by_quarter(0, 2026, 'Q1')), 13)
@@ -0,0 +1,118 @@
+import datetime
+import decimal
+import uuid
+
+import msgpack
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from backend.renderers import ORJSONRenderer
+from response_cache.utils import get_response_cache
+from single_task.models import SingleTask
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class RendererTests(TestCase):
+    """Test the orjson and MessagePack renderers and parsers"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        SingleTask.objects.create(
+            task_name='Água das plantas',
+            date=datetime.date(2026, 3, 10),
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_orjson_matches_drf_json(self):
+        """Test the orjson renderer gives the same bytes as DRF's renderer"""
+        print("Test the orjson renderer gives the same bytes as DRF's renderer")
+        data = {
+            'text': 'Água   "quoted"',
+            'number': 1.5,
+            'decimal': decimal.Decimal('2.50'),
+            'date': datetime.date(2026, 3, 10),
+            'date_time': timezone.now(),
+            'uuid': uuid.uuid4(),
+            'lazy': gettext_lazy('Pending'),
+            'list': [1, None, True],
+        }
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_json_response(self):
+        """Test JSON responses are rendered by orjson by default"""
+        print("Test JSON responses are rendered by orjson by default")
+        res = self.client.get('{}month-year/3/2026/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/json')
+        self.assertEqual(res.json()[0]['task_name'], 'Água das plantas')
+
+    def test_msgpack_response(self):
+        """Test Accept: application/msgpack returns MessagePack"""
+        print("Test Accept: application/msgpack returns MessagePack")
+        res = self.client.get(
+            '{}month-year/3/2026/'.format(SINGLE_TASK_URL),
+            HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/msgpack')
+        tasks = msgpack.unpackb(res.content, raw=False)
+        self.assertEqual(tasks[0]['task_name'], 'Água das plantas')
+        self.assertEqual(tasks[0]['date'], '2026-03-10')
+
+    def test_msgpack_request(self):
+        """Test a MessagePack request body is parsed"""
+        print("Test a MessagePack request body is parsed")
+        res = self.client.post(
+            '{}create/'.format(SINGLE_TASK_URL),
+            msgpack.packb({'task_name': 'New task', 'date': '2026-03-10'}),
+            content_type='application/msgpack'
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.json()), 2)
+
+    def test_invalid_bodies(self):
+        """Test malformed JSON and MessagePack bodies are rejected"""
+        print("Test malformed JSON and MessagePack bodies are rejected")
+        for content_type, body in (('application/json', b'{"task_name": '),
+                                   ('application/msgpack', b'\xc1'),
+                                   # a map with an array as its key
+                                   ('application/msgpack', b'\x81\x91\x01\x01')):
+            res = self.client.post(
+                '{}create/'.format(SINGLE_TASK_URL), body, content_type=content_type
+            )
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
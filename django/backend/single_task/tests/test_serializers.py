@@ -0,0 +1,118 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from single_task.models import TASK_STATUS_CODES, SingleTask
+from single_task.serializers import SingleTaskInDaySerializer, SingleTaskSerializer
+from user_profiles.models import UserProfile
+
+User = get_user_model()
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+class SingleTaskListSerializerTests(TestCase):
+    """Test the values_list fast path produces the regular serializer's output"""
+
+    def setUp(self):
+        self.test_user_profile = UserProfile.objects.create(
+            user=get_test_user(),
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        statuses = list(TASK_STATUS_CODES.values())
+        for task_number in range(40):
+            SingleTask.objects.create(
+                task_name='Task "{}" é任務'.format(task_number),
+                date=datetime.date(2026, 1, 1) + datetime.timedelta(days=task_number * 9),
+                user_profile=self.test_user_profile,
+                status=statuses[task_number % 4],
+                comments='' if task_number % 3 else 'Line one\nline two'
+            )
+        # whole-second and midnight UTC timestamps format differently
+        SingleTask.objects.filter(id__in=SingleTask.objects.values('id')[:5]).update(
+            updated_date_time=datetime.datetime(2026, 3, 1, 0, 0, tzinfo=datetime.timezone.utc)
+        )
+
+    def assert_same_output(self, serializer_class):
+        queryset = SingleTask.objects.filter(
+            user_profile=self.test_user_profile
+        ).order_by('date', 'id')
+        with self.assertNumQueries(1):
+            fast_output = JSONRenderer().render(
+                serializer_class(queryset, many=True).data
+            )
+        regular_output = JSONRenderer().render(
+            serializer_class(list(queryset), many=True).data
+        )
+        self.assertEqual(fast_output, regular_output)
+
+    def test_fast_path_matches_serializer(self):
+        """Test the fast path output is byte-identical to the serializer's"""
+        print("Test the fast path output is byte-identical to the serializer's")
+        self.assert_same_output(SingleTaskSerializer)
+        self.assert_same_output(SingleTaskInDaySerializer)
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_fast_path_matches_serializer_in_utc(self):
+        """Test UTC datetimes are formatted with a Z like the serializer does"""
+        print("Test UTC datetimes are formatted with a Z like the serializer does")
+        timezone.activate(datetime.timezone.utc)
+        self.addCleanup(timezone.deactivate)
+        self.assert_same_output(SingleTaskSerializer)
+        self.assertTrue(
+            SingleTaskSerializer(SingleTask.objects.all(), many=True).data[0]
+            ['updated_date_time'].endswith('Z')
+        )
+
+    def test_evaluated_queryset_uses_regular_path(self):
+        """Test an already evaluated queryset is not queried again"""
+        print("Test an already evaluated queryset is not queried again")
+        queryset = SingleTask.objects.filter(user_profile=self.test_user_profile)
+        list(queryset)
+        with self.assertNumQueries(0):
+            data = SingleTaskSerializer(queryset, many=True).data
+        self.assertEqual(len(data), 40)
+
+    def test_status_is_serialized_as_string(self):
+        """Test the integer status codes go out as the API's status strings"""
+        print("Test the integer status codes go out as the API's status strings")
+        data = SingleTaskSerializer(
+            SingleTask.objects.order_by('date', 'id')[:4], many=True
+        ).data
+        self.assertEqual(
+            [task['status'] for task in data],
+            ['pending', 'completed', 'deferred', 'cancelled']
+        )
+
+
+class TaskStatusFieldTests(TestCase):
+    """Test the status strings accepted by the single task serializer"""
+
+    def test_status_string_is_stored_as_code(self):
+        """Test a status string is validated into its code"""
+        print("Test a status string is validated into its code")
+        serializer = SingleTaskSerializer(data={
+            'task_name': 'Water plants', 'date': '2026-05-01', 'status': 'deferred'
+        })
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['status'], TASK_STATUS_CODES['deferred'])
+
+    def test_unknown_status_is_rejected(self):
+        """Test unknown statuses and raw codes are rejected"""
+        print("Test unknown statuses and raw codes are rejected")
+        for invalid_status in ('archived', 1):
+            serializer = SingleTaskSerializer(data={
+                'task_name': 'Water plants', 'date': '2026-05-01', 'status': invalid_status
+            })
+            self.assertFalse(serializer.is_valid())
+            self.assertIn('status', serializer.errors)
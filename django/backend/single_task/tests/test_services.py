@@ -0,0 +1,313 @@
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from interval_task_group.models import (
+    IntervalTaskGroup,
+    IntervalTaskScheduler,
+    IntervalTaskGroupAppliedQuarterly
+)
+from interval_task_group.jobs import build_quarterly_tasks as build_interval_quarterly_tasks
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+from single_task.models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    TASK_STATUS_PENDING,
+    SingleTask
+)
+from single_task.services import (
+    apply_templates_to_quarter,
+    reschedule_quarterly_applications,
+    rerotate_quarterly_applications
+)
+from user_profiles.models import UserProfile
+from weekly_task.jobs import build_quarterly_tasks, build_recurrence_rule
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+User = get_user_model()
+
+
+def get_test_user(username='testuser'):
+    return User.objects.create_user(
+        username,
+        'testpassword'
+    )
+
+
+class ApplyTemplatesToQuarterTests(TestCase):
+    """Test applying all templates to a quarter in bulk"""
+
+    def setUp(self):
+        self.test_user_profiles = [
+            UserProfile.objects.create(user=get_test_user('testuser{}'.format(n)))
+            for n in range(2)
+        ]
+        for user_profile in self.test_user_profiles:
+            WeeklyTaskScheduler.objects.create(
+                weekly_task_name='Vacuum living room',
+                day_of_week=6,
+                user_profile=user_profile
+            )
+            MonthlyTaskScheduler.objects.create(
+                monthly_task_name='Pay rent',
+                day_of_month=1,
+                user_profile=user_profile
+            )
+            interval_task_group = IntervalTaskGroup.objects.create(
+                task_group_name='Wipe surfaces',
+                interval_in_days=30,
+                task_group_owner=user_profile
+            )
+            for interval_task_name in ('A', 'B'):
+                IntervalTaskScheduler.objects.create(
+                    interval_task_name=interval_task_name,
+                    interval_task_group=interval_task_group
+                )
+            # a group without tasks cannot be applied
+            IntervalTaskGroup.objects.create(
+                task_group_name='Empty group',
+                interval_in_days=2,
+                task_group_owner=user_profile
+            )
+
+    def test_apply_templates_to_quarter(self):
+        """Test every template is applied and its tasks materialized"""
+        print("Test every template is applied and its tasks materialized")
+        results = apply_templates_to_quarter(2026, 'Q1', batch_size=7)
+
+        self.assertEqual(results['weekly'], {'applications': 2, 'tasks': 26})
+        self.assertEqual(results['monthly'], {'applications': 2, 'tasks': 6})
+        self.assertEqual(results['interval'], {'applications': 2, 'tasks': 6})
+        self.assertEqual(SingleTask.objects.count(), 38)
+        self.assertEqual(WeeklyTaskAppliedQuarterly.objects.count(), 2)
+        for quarterly_application in WeeklyTaskAppliedQuarterly.objects.all():
+            self.assertEqual(SingleTask.objects.filter(
+                generation_batch=quarterly_application.generation_batch
+            ).count(), 13)
+        self.assertEqual(MonthlyTaskAppliedQuarterly.objects.count(), 2)
+        self.assertEqual(IntervalTaskGroupAppliedQuarterly.objects.count(), 2)
+
+        interval_task_names = SingleTask.objects.filter(
+            user_profile=self.test_user_profiles[0],
+            task_name__in=('A', 'B')
+        ).order_by('date').values_list('task_name', flat=True)
+        self.assertEqual(list(interval_task_names), ['A', 'B', 'A'])
+
+    def test_apply_templates_skips_applied_templates(self):
+        """Test templates already applied to the quarter are skipped"""
+        print("Test templates already applied to the quarter are skipped")
+        apply_templates_to_quarter(2026, 'Q1')
+        results = apply_templates_to_quarter(2026, 'Q1')
+        for counts in results.values():
+            self.assertEqual(counts, {'applications': 0, 'tasks': 0})
+        self.assertEqual(SingleTask.objects.count(), 38)
+
+    def test_apply_templates_for_selected_users(self):
+        """Test restricting the bulk apply to some users"""
+        print("Test restricting the bulk apply to some users")
+        results = apply_templates_to_quarter(
+            2026, 'Q2', user_profile_ids=[self.test_user_profiles[1].id]
+        )
+        self.assertEqual(results['weekly']['applications'], 1)
+        self.assertFalse(SingleTask.objects.filter(
+            user_profile=self.test_user_profiles[0]
+        ).exists())
+
+
+class RescheduleQuarterlyApplicationsTests(TestCase):
+    """Test updating the generated tasks of an edited template"""
+
+    def setUp(self):
+        self.test_user_profile = UserProfile.objects.create(user=get_test_user())
+        self.weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        self.quarterly_application = WeeklyTaskAppliedQuarterly.objects.create(
+            quarter='Q1', year=2026, weekly_task_scheduler=self.weekly_task_scheduler
+        )
+        SingleTask.objects.bulk_create(build_quarterly_tasks(self.quarterly_application))
+        # the occurrence of Feb 8 was moved to Feb 10, the one of Feb 15 is done
+        SingleTask.objects.filter(date=datetime.date(2026, 2, 8)).update(
+            date=datetime.date(2026, 2, 10), status=TASK_STATUS_DEFERRED
+        )
+        SingleTask.objects.filter(date=datetime.date(2026, 2, 15)).update(
+            status=TASK_STATUS_COMPLETED
+        )
+        self.from_date = datetime.date(2026, 2, 1)
+
+    def reschedule(self, **scheduler_fields):
+        WeeklyTaskScheduler.objects.filter(
+            id=self.weekly_task_scheduler.id).update(**scheduler_fields)
+        return reschedule_quarterly_applications(
+            WeeklyTaskAppliedQuarterly.objects.select_related(
+                'weekly_task_scheduler__user_profile'),
+            build_quarterly_tasks,
+            build_recurrence_rule,
+            self.from_date
+        )
+
+    def get_tasks(self, **filters):
+        return SingleTask.objects.filter(**filters).order_by('date')
+
+    def test_rename_updates_future_pending_tasks(self):
+        """Test renaming a template renames only its future pending tasks"""
+        print("Test renaming a template renames only its future pending tasks")
+        task_counts, changed_dates = self.reschedule(weekly_task_name='Vacuum all rooms')
+        self.assertEqual(task_counts, {
+            'created_task_count': 0, 'updated_task_count': 7, 'deleted_task_count': 0
+        })
+        self.assertEqual(len(changed_dates), 7)
+        self.assertEqual(
+            self.get_tasks(task_name='Vacuum all rooms').exclude(
+                status=TASK_STATUS_PENDING).count(), 0
+        )
+        self.assertTrue(all(
+            task.date >= self.from_date for task in self.get_tasks(task_name='Vacuum all rooms')
+        ))
+        self.assertEqual(self.get_tasks(task_name='Vacuum living room').count(), 6)
+
+    def test_new_day_moves_future_pending_tasks(self):
+        """Test a new day of week moves the future pending tasks and adds the missing ones"""
+        print("Test a new day of week moves the future pending tasks and adds the missing ones")
+        pending_task_ids = set(self.get_tasks(
+            status=TASK_STATUS_PENDING, date__gte=self.from_date
+        ).values_list('id', flat=True))
+        task_counts, _ = self.reschedule(day_of_week=0)
+        self.assertEqual(task_counts, {
+            'created_task_count': 2, 'updated_task_count': 7, 'deleted_task_count': 0
+        })
+        mondays = self.get_tasks(date__gte=self.from_date, status=TASK_STATUS_PENDING)
+        self.assertEqual(
+            [task.date for task in mondays],
+            [datetime.date(2026, 2, 2) + datetime.timedelta(weeks=week) for week in range(9)]
+        )
+        self.assertTrue(all(task.occurrence_date == task.date for task in mondays))
+        self.assertTrue(pending_task_ids < {task.id for task in mondays})
+        # the past, deferred and completed tasks stay where they were
+        self.assertEqual(
+            list(self.get_tasks(date__lt=self.from_date).values_list('date', flat=True)),
+            [datetime.date(2026, 1, 4) + datetime.timedelta(weeks=week) for week in range(4)]
+        )
+        self.assertEqual(
+            list(self.get_tasks(status__in=[TASK_STATUS_DEFERRED, TASK_STATUS_COMPLETED])
+                 .values_list('date', flat=True)),
+            [datetime.date(2026, 2, 10), datetime.date(2026, 2, 15)]
+        )
+
+    def test_fewer_dates_delete_tasks(self):
+        """Test the tasks without a date in the new schedule are deleted"""
+        print("Test the tasks without a date in the new schedule are deleted")
+        self.from_date = datetime.date(2026, 3, 28)
+        task_counts, changed_dates = self.reschedule(day_of_week=4)
+        # Sunday Mar 29 has no Friday left in the quarter
+        self.assertEqual(task_counts, {
+            'created_task_count': 0, 'updated_task_count': 0, 'deleted_task_count': 1
+        })
+        self.assertEqual(changed_dates, {datetime.date(2026, 3, 29)})
+        self.assertEqual(SingleTask.objects.count(), 12)
+
+    def test_unchanged_template_writes_nothing(self):
+        """Test rescheduling twice leaves the tasks as they are the second time"""
+        print("Test rescheduling twice leaves the tasks as they are the second time")
+        self.reschedule(day_of_week=0, weekly_task_name='Vacuum all rooms')
+        task_counts, changed_dates = self.reschedule()
+        self.assertEqual(task_counts, {
+            'created_task_count': 0, 'updated_task_count': 0, 'deleted_task_count': 0
+        })
+        self.assertEqual(changed_dates, set())
+
+    def test_skips_past_and_unmaterialized_applications(self):
+        """Test applications of past quarters or without tasks yet are skipped"""
+        print("Test applications of past quarters or without tasks yet are skipped")
+        WeeklyTaskAppliedQuarterly.objects.create(
+            quarter='Q2', year=2026, weekly_task_scheduler=self.weekly_task_scheduler
+        )
+        self.from_date = datetime.date(2026, 4, 1)
+        task_counts, _ = self.reschedule(day_of_week=0)
+        self.assertEqual(task_counts, {
+            'created_task_count': 0, 'updated_task_count': 0, 'deleted_task_count': 0
+        })
+        self.assertEqual(SingleTask.objects.count(), 13)
+
+
+class RerotateQuarterlyApplicationsTests(TestCase):
+    """Test reassigning an interval group's tasks to its future pending tasks"""
+
+    def setUp(self):
+        self.test_user_profile = UserProfile.objects.create(user=get_test_user())
+        self.interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts',
+            interval_in_days=3,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('A', 'B', 'C'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=self.interval_task_group
+            )
+        self.quarterly_application = IntervalTaskGroupAppliedQuarterly.objects.create(
+            quarter='Q1', year=2026, interval_task_group=self.interval_task_group,
+            first_day_offset=5
+        )
+        SingleTask.objects.bulk_create(
+            build_interval_quarterly_tasks(self.quarterly_application)
+        )
+        # the occurrences are on the Tuesday Jan 6 and every third day after
+        self.completed_task = SingleTask.objects.get(date=datetime.date(2026, 2, 8))
+        SingleTask.objects.filter(id=self.completed_task.id).update(status=TASK_STATUS_COMPLETED)
+        self.from_date = datetime.date(2026, 2, 1)
+
+    def rerotate(self, task_names):
+        return rerotate_quarterly_applications(
+            IntervalTaskGroupAppliedQuarterly.objects.select_related('interval_task_group'),
+            task_names,
+            self.from_date
+        )
+
+    def get_task_names(self, **filters):
+        return list(SingleTask.objects.filter(**filters).order_by('date').values_list(
+            'task_name', flat=True))
+
+    def test_added_task_joins_the_rotation(self):
+        """Test adding a task reassigns the future pending tasks in one bulk update"""
+        print("Test adding a task reassigns the future pending tasks in one bulk update")
+        past_task_names = self.get_task_names(date__lt=self.from_date)
+        with mock.patch.object(
+                SingleTask.objects, 'bulk_update', wraps=SingleTask.objects.bulk_update
+        ) as bulk_update:
+            renamed_task_count, changed_dates = self.rerotate(['A', 'B', 'C', 'D'])
+        bulk_update.assert_called_once()
+        self.assertEqual(renamed_task_count, len(changed_dates))
+
+        future_tasks = SingleTask.objects.filter(date__gte=self.from_date).exclude(
+            id=self.completed_task.id)
+        for task in future_tasks:
+            occurrence_number = (task.date - datetime.date(2026, 1, 6)).days // 3
+            self.assertEqual(task.task_name, 'ABCD'[occurrence_number % 4])
+        self.assertEqual(self.get_task_names(date__lt=self.from_date), past_task_names)
+        self.assertEqual(
+            SingleTask.objects.get(id=self.completed_task.id).task_name,
+            self.completed_task.task_name
+        )
+        # Feb 11 is the 13th occurrence, which stays 'A' with four tasks too
+        self.assertNotIn(datetime.date(2026, 2, 11), changed_dates)
+
+    def test_removed_task_leaves_the_rotation(self):
+        """Test removing a task rotates the remaining tasks"""
+        print("Test removing a task rotates the remaining tasks")
+        self.rerotate(['A', 'C'])
+        self.assertEqual(
+            set(self.get_task_names(date__gte=self.from_date, status=TASK_STATUS_PENDING)),
+            {'A', 'C'}
+        )
+        self.assertEqual(self.rerotate(['A', 'C']), (0, set()))
+
+    def test_no_tasks_left(self):
+        """Test a group without tasks leaves its tasks alone"""
+        print("Test a group without tasks leaves its tasks alone")
+        self.assertEqual(self.rerotate([]), (0, set()))
+        self.assertEqual(set(self.get_task_names()), {'A', 'B', 'C'})
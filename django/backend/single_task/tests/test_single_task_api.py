@@ -0,0 +1,627 @@
+import datetime
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from response_cache.utils import get_response_cache
+from single_task.models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    TASK_STATUS_PENDING,
+    SingleTask,
+    SingleTaskTombstone
+)
+from single_task.utils import encode_changes_cursor
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class SingleTaskQueryCountApiTests(TestCase):
+    """Test the number of queries issued by the single task API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.today = datetime.date.today()
+        for day_offset in range(-5, 5):
+            SingleTask.objects.create(
+                task_name='Task {}'.format(day_offset),
+                date=self.today + datetime.timedelta(days=day_offset),
+                user_profile=self.test_user_profile
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_task_by_date_query_count(self):
+        """Test the tasks by date view filters on the profile id claim"""
+        print("Test the tasks by date view filters on the profile id claim")
+        # authenticate the user, the list's version stamp, then the tasks
+        with self.assertNumQueries(3):
+            res = self.client.get('{}date/{}/'.format(
+                SINGLE_TASK_URL, self.today.isoformat()
+            ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_task_by_month_year_query_count(self):
+        """Test the tasks by month and year view query count"""
+        print("Test the tasks by month and year view query count")
+        with self.assertNumQueries(3):
+            res = self.client.get('{}month-year/{}/{}/'.format(
+                SINGLE_TASK_URL, self.today.month, self.today.year
+            ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_task_current_month_query_count(self):
+        """Test the current month view query count"""
+        print("Test the current month view query count")
+        with self.assertNumQueries(3):
+            res = self.client.get('{}current-month/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_unconfirmed_tasks_query_count(self):
+        """Test the uncompleted past tasks view query count"""
+        print("Test the uncompleted past tasks view query count")
+        with self.assertNumQueries(2):
+            res = self.client.get('{}unconfirmed/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 5)
+
+    def test_unconfirmed_tasks_pagination(self):
+        """Test paging through the uncompleted past tasks by (date, id)"""
+        print("Test paging through the uncompleted past tasks by (date, id)")
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                '{}unconfirmed/'.format(SINGLE_TASK_URL), {'page_size': 3}
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        task_dates = [task['date'] for task in res.data['results']]
+        self.assertEqual(len(task_dates), 3)
+        self.assertIsNotNone(res.data['next'])
+
+        res = self.client.get(res.data['next'])
+        task_dates += [task['date'] for task in res.data['results']]
+        self.assertIsNone(res.data['next'])
+        self.assertEqual(task_dates, [
+            (self.today + datetime.timedelta(days=day_offset)).isoformat()
+            for day_offset in range(-5, 0)
+        ])
+
+    def test_unconfirmed_tasks_count(self):
+        """Test the uncompleted past tasks count view"""
+        print("Test the uncompleted past tasks count view")
+        SingleTask.objects.filter(
+            date=self.today - datetime.timedelta(days=1)
+        ).update(status=TASK_STATUS_COMPLETED)
+        with self.assertNumQueries(2):
+            res = self.client.get('{}unconfirmed/count/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'count': 4})
+
+    def test_task_create_query_count(self):
+        """Test creating a task does not look up the user profile"""
+        print("Test creating a task does not look up the user profile")
+        payload = {
+            'task_name': 'New task',
+            'date': self.today.isoformat()
+        }
+        # authenticate, insert, then list the tasks on the same date
+        with self.assertNumQueries(3):
+            res = self.client.post(
+                '{}create/'.format(SINGLE_TASK_URL), data=payload, format='json'
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+
+    def test_profile_lookup_without_claim(self):
+        """Test the profile id is looked up once when the token has no claim"""
+        print("Test the profile id is looked up once when the token has no claim")
+        self.client.credentials()
+        self.client.force_authenticate(self.test_user)
+        with self.assertNumQueries(2):
+            res = self.client.get('{}unconfirmed/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 5)
+
+
+class SingleTaskRangeApiTests(TestCase):
+    """Test the tasks by date range API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        other_user_profile = UserProfile.objects.create(
+            user=User.objects.create_user('otheruser', 'otherpassword')
+        )
+        self.start_date = datetime.date(2026, 3, 1)
+        for day_offset in range(10):
+            for task_number in range(3):
+                SingleTask.objects.create(
+                    task_name='Task {}'.format(task_number),
+                    date=self.start_date + datetime.timedelta(days=day_offset),
+                    user_profile=self.test_user_profile
+                )
+            SingleTask.objects.create(
+                task_name='Other task',
+                date=self.start_date + datetime.timedelta(days=day_offset),
+                user_profile=other_user_profile
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def get_range(self, start, end, **params):
+        params.update({'start': start, 'end': end})
+        return self.client.get('{}range/'.format(SINGLE_TASK_URL), params)
+
+    def test_range_groups_tasks_by_date(self):
+        """Test the range endpoint returns the user's tasks grouped by date"""
+        print("Test the range endpoint returns the user's tasks grouped by date")
+        with self.assertNumQueries(2):
+            res = self.get_range('2026-03-02', '2026-03-04')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(res.data['days']), ['2026-03-02', '2026-03-03', '2026-03-04']
+        )
+        for tasks in res.data['days'].values():
+            self.assertEqual(
+                [task['task_name'] for task in tasks], ['Task 0', 'Task 1', 'Task 2']
+            )
+            self.assertNotIn('date', tasks[0])
+        self.assertIsNone(res.data['next'])
+
+    def test_range_keyset_pagination(self):
+        """Test paging through a range returns every task exactly once"""
+        print("Test paging through a range returns every task exactly once")
+        task_ids = []
+        res = self.get_range('2026-03-01', '2026-03-31', page_size=4)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            for tasks in res.data['days'].values():
+                task_ids.extend(task['id'] for task in tasks)
+            if res.data['next'] is None:
+                break
+            res = self.client.get(res.data['next'])
+        self.assertEqual(len(task_ids), 30)
+        self.assertEqual(sorted(task_ids), sorted(SingleTask.objects.filter(
+            user_profile=self.test_user_profile
+        ).values_list('id', flat=True)))
+
+    def test_range_columnar_format(self):
+        """Test the range endpoint returns parallel arrays with ?format=columnar"""
+        print("Test the range endpoint returns parallel arrays with ?format=columnar")
+        with self.assertNumQueries(2):
+            res = self.get_range('2026-03-02', '2026-03-04', format='columnar')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        tasks = res.data['tasks']
+        self.assertEqual(tasks['base_date'], '2026-03-02')
+        self.assertEqual(tasks['names'], ['Task 0', 'Task 1', 'Task 2'])
+        self.assertEqual(tasks['day'], [0, 0, 0, 1, 1, 1, 2, 2, 2])
+        self.assertEqual(tasks['name'], [0, 1, 2] * 3)
+        self.assertIsNone(res.data['next'])
+
+    def test_range_span_is_capped(self):
+        """Test the range cannot span more than a year"""
+        print("Test the range cannot span more than a year")
+        res = self.get_range('2026-01-01', '2027-01-02')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_range_invalid_dates(self):
+        """Test invalid or reversed dates are rejected"""
+        print("Test invalid or reversed dates are rejected")
+        self.assertEqual(
+            self.get_range('2026-03-xx', '2026-03-04').status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.get_range('2026-03-04', '2026-03-01').status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_range_invalid_cursor(self):
+        """Test an invalid cursor is rejected"""
+        print("Test an invalid cursor is rejected")
+        res = self.get_range('2026-03-01', '2026-03-31', cursor='invalid')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(SINGLE_TASK_CHANGES_OVERLAP=datetime.timedelta(0))
+class SingleTaskChangesApiTests(TestCase):
+    """Test the tasks changed since a sync cursor API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.task = SingleTask.objects.create(
+            task_name='Old task',
+            date=datetime.date(2026, 3, 1),
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def get_changes(self, cursor=None):
+        params = {} if cursor is None else {'since': cursor}
+        return self.client.get('{}changes/'.format(SINGLE_TASK_URL), params)
+
+    def test_first_sync_returns_cursor_only(self):
+        """Test a request without a cursor only returns the cursor"""
+        print("Test a request without a cursor only returns the cursor")
+        res = self.get_changes()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['changed'], [])
+        self.assertEqual(res.data['deleted'], [])
+        self.assertTrue(res.data['cursor'].isdigit())
+
+    def test_changes_since_cursor(self):
+        """Test created, updated and deleted tasks are returned after the cursor"""
+        print("Test created, updated and deleted tasks are returned after the cursor")
+        other_task = SingleTask.objects.create(
+            task_name='Other task',
+            date=datetime.date(2026, 3, 2),
+            user_profile=self.test_user_profile
+        )
+        cursor = self.get_changes().data['cursor']
+
+        res = self.client.post('{}create/'.format(SINGLE_TASK_URL), {
+            'task_name': 'New task',
+            'date': '2026-03-05'
+        }, format='json')
+        self.client.post('{}confirm/{}/'.format(SINGLE_TASK_URL, self.task.id))
+        self.client.delete('{}delete/{}/'.format(SINGLE_TASK_URL, other_task.id))
+
+        # authenticate, the changed tasks, then the tombstones
+        with self.assertNumQueries(3):
+            res = self.get_changes(cursor)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [task['task_name'] for task in res.data['changed']],
+            ['New task', 'Old task']
+        )
+        self.assertEqual(res.data['deleted'], [other_task.id])
+
+        res = self.get_changes(res.data['cursor'])
+        self.assertEqual(res.data['changed'], [])
+        self.assertEqual(res.data['deleted'], [])
+
+    def test_bulk_delete_records_tombstones(self):
+        """Test deleting a queryset of tasks records a tombstone for each"""
+        print("Test deleting a queryset of tasks records a tombstone for each")
+        cursor = self.get_changes().data['cursor']
+        SingleTask.objects.filter(user_profile=self.test_user_profile).delete()
+        self.assertEqual(self.get_changes(cursor).data['deleted'], [self.task.id])
+
+    def test_changes_of_other_users_are_hidden(self):
+        """Test the changes of other users are not returned"""
+        print("Test the changes of other users are not returned")
+        cursor = self.get_changes().data['cursor']
+        other_user_profile = UserProfile.objects.create(
+            user=User.objects.create_user('otheruser', 'otherpassword')
+        )
+        SingleTask.objects.create(
+            task_name='Other user task',
+            date=datetime.date(2026, 3, 1),
+            user_profile=other_user_profile
+        ).delete()
+        res = self.get_changes(cursor)
+        self.assertEqual(res.data['changed'], [])
+        self.assertEqual(res.data['deleted'], [])
+
+    def test_invalid_and_expired_cursors(self):
+        """Test invalid cursors are rejected and expired ones are gone"""
+        print("Test invalid cursors are rejected and expired ones are gone")
+        self.assertEqual(
+            self.get_changes('yesterday').status_code, status.HTTP_400_BAD_REQUEST
+        )
+        expired_cursor = encode_changes_cursor(
+            timezone.now() - settings.SINGLE_TASK_TOMBSTONE_RETENTION
+            - datetime.timedelta(minutes=1)
+        )
+        self.assertEqual(
+            self.get_changes(expired_cursor).status_code, status.HTTP_410_GONE
+        )
+
+    def test_purge_expired_tombstones(self):
+        """Test the purge command only deletes expired tombstones"""
+        print("Test the purge command only deletes expired tombstones")
+        task_id = self.task.id
+        self.task.delete()
+        SingleTaskTombstone.objects.create(
+            task_id=task_id + 1,
+            user_profile=self.test_user_profile,
+            deleted_date_time=timezone.now()
+            - settings.SINGLE_TASK_TOMBSTONE_RETENTION
+            - datetime.timedelta(days=1)
+        )
+        call_command('purge_task_tombstones', stdout=StringIO())
+        self.assertEqual(
+            list(SingleTaskTombstone.objects.values_list('task_id', flat=True)),
+            [task_id]
+        )
+
+
+class SingleTaskOwnershipApiTests(TestCase):
+    """Test users cannot change each other's tasks"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        other_user_profile = UserProfile.objects.create(
+            user=User.objects.create_user('otheruser', 'otherpassword')
+        )
+        self.other_user_task = SingleTask.objects.create(
+            task_name='Other user task',
+            date=datetime.date(2026, 3, 1),
+            user_profile=other_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def assert_task_unchanged(self):
+        task = SingleTask.objects.get(id=self.other_user_task.id)
+        self.assertEqual(task.status, TASK_STATUS_PENDING)
+        self.assertEqual(task.date, datetime.date(2026, 3, 1))
+
+    def test_confirm_other_users_task(self):
+        """Test confirming another user's task returns 404"""
+        print("Test confirming another user's task returns 404")
+        res = self.client.post('{}confirm/{}/'.format(SINGLE_TASK_URL, self.other_user_task.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assert_task_unchanged()
+
+    def test_delete_other_users_task(self):
+        """Test deleting another user's task returns 404"""
+        print("Test deleting another user's task returns 404")
+        res = self.client.delete('{}delete/{}/'.format(SINGLE_TASK_URL, self.other_user_task.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(SingleTask.objects.filter(id=self.other_user_task.id).exists())
+
+    def test_reschedule_other_users_task(self):
+        """Test rescheduling another user's task returns 404"""
+        print("Test rescheduling another user's task returns 404")
+        res = self.client.patch(
+            '{}reschedule/{}/'.format(SINGLE_TASK_URL, self.other_user_task.id),
+            {'date': '2026-03-05'}, format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assert_task_unchanged()
+
+
+class SingleTaskBatchApiTests(TestCase):
+    """Test the batch confirm, reschedule and delete API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.tasks = [
+            SingleTask.objects.create(
+                task_name='Task {}'.format(day),
+                date=datetime.date(2026, 3, day),
+                user_profile=self.test_user_profile
+            )
+            for day in range(1, 7)
+        ]
+        other_user_profile = UserProfile.objects.create(
+            user=User.objects.create_user('otheruser', 'otherpassword')
+        )
+        self.other_user_task = SingleTask.objects.create(
+            task_name='Other user task',
+            date=datetime.date(2026, 3, 1),
+            user_profile=other_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def post_batch(self, operations):
+        return self.client.post(
+            '{}batch/'.format(SINGLE_TASK_URL),
+            {'operations': operations}, format='json'
+        )
+
+    def test_batch_operations(self):
+        """Test confirming, rescheduling and deleting tasks in one batch"""
+        print("Test confirming, rescheduling and deleting tasks in one batch")
+        operations = [
+            {'op': 'confirm', 'id': self.tasks[0].id},
+            {'op': 'confirm', 'id': self.tasks[1].id},
+            {'op': 'reschedule', 'id': self.tasks[2].id,
+             'date': '2026-04-01', 'comments': 'Too busy'},
+            {'op': 'reschedule', 'id': self.tasks[3].id, 'date': '2026-04-02'},
+            {'op': 'delete', 'id': self.tasks[4].id},
+            {'op': 'delete', 'id': self.tasks[5].id},
+        ]
+        # authenticate, load the tasks, then in a savepoint (a transaction
+        # outside of tests) one UPDATE, one bulk UPDATE, and the tombstones
+        # plus one DELETE for the deletions
+        with self.assertNumQueries(9):
+            res = self.post_batch(operations)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in res.data['results']], ['ok'] * 6
+        )
+        self.assertEqual(res.data['results'][0]['task']['status'], 'completed')
+        self.assertEqual(res.data['results'][2]['task']['date'], '2026-04-01')
+
+        for task in self.tasks[:4]:
+            task.refresh_from_db()
+        self.assertEqual(self.tasks[0].status, TASK_STATUS_COMPLETED)
+        self.assertEqual(self.tasks[1].status, TASK_STATUS_COMPLETED)
+        self.assertEqual(self.tasks[2].status, TASK_STATUS_DEFERRED)
+        self.assertEqual(self.tasks[2].date, datetime.date(2026, 4, 1))
+        self.assertEqual(self.tasks[2].comments, 'Too busy')
+        self.assertEqual(self.tasks[3].comments, '')
+        self.assertGreater(self.tasks[0].updated_date_time, self.tasks[0].created_date_time)
+        self.assertFalse(SingleTask.objects.filter(
+            id__in=[self.tasks[4].id, self.tasks[5].id]
+        ).exists())
+        self.assertEqual(SingleTaskTombstone.objects.count(), 2)
+
+    def test_batch_per_item_results(self):
+        """Test invalid, foreign and repeated operations get their own results"""
+        print("Test invalid, foreign and repeated operations get their own results")
+        res = self.post_batch([
+            {'op': 'archive', 'id': self.tasks[0].id},
+            {'op': 'confirm', 'id': self.other_user_task.id},
+            {'op': 'confirm', 'id': self.tasks[1].id},
+            {'op': 'delete', 'id': self.tasks[1].id},
+            {'op': 'reschedule', 'id': self.tasks[2].id, 'date': 'someday'},
+        ])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in res.data['results']],
+            ['invalid', 'not_found', 'ok', 'conflict', 'invalid']
+        )
+        self.assertIn('op', res.data['results'][0]['errors'])
+        self.other_user_task.refresh_from_db()
+        self.assertEqual(self.other_user_task.status, TASK_STATUS_PENDING)
+        self.assertTrue(SingleTask.objects.filter(id=self.tasks[1].id).exists())
+
+    def test_batch_must_be_a_list(self):
+        """Test a missing, empty or oversized operations list is rejected"""
+        print("Test a missing, empty or oversized operations list is rejected")
+        self.assertEqual(
+            self.client.post('{}batch/'.format(SINGLE_TASK_URL), {}, format='json').status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(self.post_batch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.post_batch([{'op': 'confirm', 'id': 1}] * 1001).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+
+class SingleTaskColumnarApiTests(TestCase):
+    """Test the columnar format of the single task list views"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        for day_of_month in range(1, 31, 3):
+            SingleTask.objects.create(
+                task_name='Water plants',
+                date=datetime.date(2026, 4, day_of_month),
+                user_profile=self.test_user_profile
+            )
+            SingleTask.objects.create(
+                task_name='Vacuum',
+                date=datetime.date(2026, 4, day_of_month),
+                user_profile=self.test_user_profile,
+                status=TASK_STATUS_COMPLETED,
+                comments='Living room'
+            )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_month_columnar_matches_default_format(self):
+        """Test the columnar month holds the same tasks as the default format"""
+        print("Test the columnar month holds the same tasks as the default format")
+        url = '{}month-year/4/2026/'.format(SINGLE_TASK_URL)
+        tasks = self.client.get(url).data
+        res = self.client.get(url, {'format': 'columnar'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/json')
+        columns = res.data
+        self.assertEqual(columns['base_date'], '2026-04-01')
+        self.assertEqual(columns['statuses'], ['pending', 'completed', 'deferred', 'cancelled'])
+        self.assertEqual(len(columns['names']), 2)
+        self.assertEqual(len(columns['id']), len(tasks))
+        for index, task in enumerate(tasks):
+            self.assertEqual(columns['id'][index], task['id'])
+            self.assertEqual(
+                '2026-04-{:02d}'.format(columns['day'][index] + 1), task['date']
+            )
+            self.assertEqual(columns['names'][columns['name'][index]], task['task_name'])
+            self.assertEqual(columns['statuses'][columns['status'][index]], task['status'])
+            self.assertEqual(columns['comments'][index], task['comments'])
+            self.assertEqual(
+                columns['updated_date_time'][index], task['updated_date_time']
+            )
+
+    def test_unconfirmed_columnar_pagination(self):
+        """Test paged unconfirmed tasks keep the columnar format in the next link"""
+        print("Test paged unconfirmed tasks keep the columnar format in the next link")
+        res = self.client.get(
+            '{}unconfirmed/'.format(SINGLE_TASK_URL), {'format': 'columnar', 'page_size': 4}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results']['base_date'], '2026-04-01')
+        self.assertEqual(res.data['results']['day'], [0, 3, 6, 9])
+        self.assertEqual(res.data['results']['names'], ['Water plants'])
+        self.assertIn('format=columnar', res.data['next'])
+        res = self.client.get(res.data['next'])
+        self.assertEqual(res.data['results']['base_date'], '2026-04-13')
+
+    def test_columnar_format_only_on_list_views(self):
+        """Test views without a columnar representation do not accept the format"""
+        print("Test views without a columnar representation do not accept the format")
+        res = self.client.get('{}changes/'.format(SINGLE_TASK_URL), {'format': 'columnar'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,463 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interval_task_group.jobs import (
+    build_quarterly_tasks as build_interval_quarterly_tasks,
+    build_recurrence_rule as build_interval_recurrence_rule
+)
+from interval_task_group.models import (
+    IntervalTaskGroup,
+    IntervalTaskGroupAppliedQuarterly,
+    IntervalTaskScheduler
+)
+from monthly_task.jobs import (
+    build_quarterly_tasks as build_monthly_quarterly_tasks,
+    build_recurrence_rule as build_monthly_recurrence_rule
+)
+from monthly_task.models import MonthlyTaskScheduler, MonthlyTaskAppliedQuarterly
+from response_cache.utils import get_response_cache
+from single_task.models import (
+    RECURRENCE_DAILY,
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    RecurrenceRule,
+    SingleTask
+)
+from single_task.services import (
+    reschedule_quarterly_applications,
+    rerotate_quarterly_applications
+)
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.jobs import (
+    build_quarterly_tasks as build_weekly_quarterly_tasks,
+    build_recurrence_rule as build_weekly_recurrence_rule
+)
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+User = get_user_model()
+
+SINGLE_TASK_URL = '/api/single-task/'
+WEEKLY_TASK_URL = '/api/weekly-task/'
+WEEKLY_APPLY_URL = '{}applied-quarterly/'.format(WEEKLY_TASK_URL)
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+def get_occurrences(rule, start_date=None, end_date=None):
+    return list(rule.get_occurrences(start_date, end_date))
+
+
+class RecurrenceRuleTests(TestCase):
+    """Test expanding recurrence rules into occurrences"""
+
+    def setUp(self):
+        self.test_user_profile = UserProfile.objects.create(user=get_test_user())
+
+    def test_rules_match_materialized_tasks(self):
+        """Test each template's rule has the dates and names of its materialized tasks"""
+        print("Test each template's rule has the dates and names of its materialized tasks")
+        weekly_application = WeeklyTaskAppliedQuarterly.objects.create(
+            quarter='Q1', year=2026,
+            weekly_task_scheduler=WeeklyTaskScheduler.objects.create(
+                weekly_task_name='Vacuum', day_of_week=6,
+                user_profile=self.test_user_profile
+            )
+        )
+        monthly_application = MonthlyTaskAppliedQuarterly.objects.create(
+            quarter='Q4', year=2026,
+            monthly_task_scheduler=MonthlyTaskScheduler.objects.create(
+                monthly_task_name='Pay rent', day_of_month=28,
+                user_profile=self.test_user_profile
+            )
+        )
+        interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts', interval_in_days=3,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('Legs', 'Back', 'Arms'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=interval_task_group
+            )
+        # starts on the first Tuesday of the quarter, Apr 7
+        interval_application = IntervalTaskGroupAppliedQuarterly.objects.create(
+            quarter='Q2', year=2026, interval_task_group=interval_task_group,
+            first_day_offset=6
+        )
+
+        for application, build_tasks, build_rule in (
+                (weekly_application, build_weekly_quarterly_tasks, build_weekly_recurrence_rule),
+                (monthly_application, build_monthly_quarterly_tasks, build_monthly_recurrence_rule),
+                (interval_application, build_interval_quarterly_tasks,
+                 build_interval_recurrence_rule)):
+            tasks = build_tasks(application)
+            rule = build_rule(application)
+            self.assertEqual(
+                get_occurrences(rule),
+                [(task.date, task.task_name) for task in tasks]
+            )
+
+    def test_occurrences_in_window(self):
+        """Test a window only yields its occurrences and keeps the name cycle"""
+        print("Test a window only yields its occurrences and keeps the name cycle")
+        rule = RecurrenceRule(
+            frequency=RECURRENCE_DAILY,
+            interval=3,
+            first_date=datetime.date(2026, 1, 2),
+            end_date=datetime.date(2026, 4, 1),
+            task_names=['Legs', 'Back']
+        )
+        self.assertEqual(
+            get_occurrences(rule, datetime.date(2026, 1, 6), datetime.date(2026, 1, 12)),
+            [(datetime.date(2026, 1, 8), 'Legs'), (datetime.date(2026, 1, 11), 'Back')]
+        )
+        self.assertEqual(get_occurrences(rule, datetime.date(2026, 3, 31))[-1:], [])
+        self.assertEqual(rule.get_task_name(datetime.date(2026, 1, 5)), 'Back')
+        self.assertIsNone(rule.get_task_name(datetime.date(2026, 1, 6)))
+
+
+@override_settings(SINGLE_TASK_VIRTUAL_RECURRENCE=True)
+class VirtualRecurrenceApiTests(TestCase):
+    """Test the task lists in virtual recurrence mode"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+        # a stored task on the same day as an occurrence
+        SingleTask.objects.create(
+            task_name='Buy groceries',
+            date=datetime.date(2026, 3, 1),
+            user_profile=self.test_user_profile
+        )
+
+    def apply_weekly_scheduler(self, year=2026, quarter='Q1'):
+        return self.client.post(WEEKLY_APPLY_URL, {
+            'quarter': quarter,
+            'year': year,
+            'weekly_task_scheduler': self.weekly_task_scheduler.id
+        }, format='json')
+
+    def get_march(self, **extra):
+        return self.client.get('{}month-year/3/2026/'.format(SINGLE_TASK_URL), **extra)
+
+    def test_apply_stores_rule(self):
+        """Test applying a template stores a rule instead of its tasks"""
+        print("Test applying a template stores a rule instead of its tasks")
+        res = self.apply_weekly_scheduler()
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('job_id', res.data)
+        self.assertEqual(SingleTask.objects.count(), 1)
+        rule = RecurrenceRule.objects.get()
+        self.assertEqual(
+            rule.generation_batch,
+            WeeklyTaskAppliedQuarterly.objects.get(id=res.data['id']).generation_batch
+        )
+
+    def test_month_lists_virtual_tasks(self):
+        """Test the month list merges the virtual tasks in by date"""
+        print("Test the month list merges the virtual tasks in by date")
+        self.apply_weekly_scheduler()
+        res = self.get_march()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(task['date'], task['task_name'], task['id'] is None) for task in res.data],
+            [('2026-03-01', 'Buy groceries', False)] + [
+                ('2026-03-{:02d}'.format(day), 'Vacuum living room', True)
+                for day in (1, 8, 15, 22, 29)
+            ]
+        )
+        generation_batch = RecurrenceRule.objects.get().generation_batch
+        self.assertEqual(res.data[1]['status'], 'pending')
+        self.assertEqual(res.data[1]['occurrence'], '{}/2026-03-01'.format(generation_batch))
+        self.assertNotIn('occurrence', res.data[0])
+
+        res = self.client.get('{}date/2026-03-01/'.format(SINGLE_TASK_URL))
+        self.assertEqual([task['id'] is None for task in res.data], [False, True])
+
+    def test_conditional_get_sees_new_rules(self):
+        """Test applying a template changes the ETag of its months"""
+        print("Test applying a template changes the ETag of its months")
+        etag = self.get_march()['ETag']
+        self.assertEqual(
+            self.get_march(HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+        self.apply_weekly_scheduler()
+        res = self.get_march(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 6)
+
+    def test_store_occurrence(self):
+        """Test confirming a virtual task stores it once"""
+        print("Test confirming a virtual task stores it once")
+        self.apply_weekly_scheduler()
+        occurrence = self.get_march().data[2]['occurrence']
+        url = '{}occurrence/{}/'.format(SINGLE_TASK_URL, occurrence)
+
+        res = self.client.post(url, {'status': 'completed'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['status'], 'completed')
+        task = SingleTask.objects.get(id=res.data['id'])
+        self.assertEqual(task.date, datetime.date(2026, 3, 8))
+        self.assertEqual(task.generation_batch, RecurrenceRule.objects.get().generation_batch)
+
+        res = self.client.post(url, {'comments': 'Done early'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['id'], task.id)
+        self.assertEqual(SingleTask.objects.count(), 2)
+
+        tasks = self.get_march().data
+        self.assertEqual(len(tasks), 6)
+        self.assertEqual(
+            [(task['id'], task['status'], task['comments']) for task in tasks
+             if task['date'] == '2026-03-08'],
+            [(task.id, 'completed', 'Done early')]
+        )
+
+    def test_defer_occurrence(self):
+        """Test moving a virtual task stores it as deferred on the new date"""
+        print("Test moving a virtual task stores it as deferred on the new date")
+        self.apply_weekly_scheduler()
+        occurrence = self.get_march().data[2]['occurrence']
+        res = self.client.post('{}occurrence/{}/'.format(SINGLE_TASK_URL, occurrence), {
+            'date': '2026-03-10'
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SingleTask.objects.get(id=res.data['id']).status, TASK_STATUS_DEFERRED)
+        self.assertEqual(
+            [task['date'] for task in self.get_march().data
+             if task['task_name'] == 'Vacuum living room'],
+            ['2026-03-01', '2026-03-10', '2026-03-15', '2026-03-22', '2026-03-29']
+        )
+
+    def test_unknown_occurrence(self):
+        """Test storing an occurrence that is not on the rule or not the user's fails"""
+        print("Test storing an occurrence that is not on the rule or not the user's fails")
+        self.apply_weekly_scheduler()
+        generation_batch = RecurrenceRule.objects.get().generation_batch
+        res = self.client.post('{}occurrence/{}/2026-03-02/'.format(
+            SINGLE_TASK_URL, generation_batch), {'status': 'completed'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        other_user = User.objects.create_user('otheruser', 'otherpassword')
+        UserProfile.objects.create(user=other_user)
+        self.client.credentials(HTTP_AUTHORIZATION=get_token_auth_header(other_user))
+        res = self.client.post('{}occurrence/{}/2026-03-01/'.format(
+            SINGLE_TASK_URL, generation_batch), {'status': 'completed'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(SingleTask.objects.count(), 1)
+
+    def test_unconfirmed_includes_past_virtual_tasks(self):
+        """Test past virtual tasks are listed and counted as unconfirmed"""
+        print("Test past virtual tasks are listed and counted as unconfirmed")
+        today = datetime.date.today()
+        quarter = 'Q{}'.format((today.month - 1) // 3 + 1)
+        self.apply_weekly_scheduler(today.year, quarter)
+        past_occurrences = [
+            occurrence_date for occurrence_date, _ in
+            get_occurrences(RecurrenceRule.objects.get(), None, today)
+        ]
+        past_stored_tasks = SingleTask.objects.filter(date__lt=today).count()
+
+        res = self.client.get('{}unconfirmed/'.format(SINGLE_TASK_URL))
+        self.assertEqual(len(res.data), len(past_occurrences) + past_stored_tasks)
+        res = self.client.get('{}unconfirmed/count/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.data['count'], len(past_occurrences) + past_stored_tasks)
+
+        if past_occurrences:
+            self.client.post('{}occurrence/{}/{}/'.format(
+                SINGLE_TASK_URL, RecurrenceRule.objects.get().generation_batch,
+                past_occurrences[0].isoformat()
+            ), {'status': 'completed'}, format='json')
+            res = self.client.get('{}unconfirmed/count/'.format(SINGLE_TASK_URL))
+            self.assertEqual(res.data['count'], len(past_occurrences) + past_stored_tasks - 1)
+
+    def test_range_and_columnar(self):
+        """Test the range endpoint groups virtual tasks and columnar keeps their keys"""
+        print("Test the range endpoint groups virtual tasks and columnar keeps their keys")
+        self.apply_weekly_scheduler()
+        res = self.client.get('{}range/'.format(SINGLE_TASK_URL), {
+            'start': '2026-02-28', 'end': '2026-03-08'
+        })
+        self.assertEqual(list(res.data['days']), ['2026-03-01', '2026-03-08'])
+        self.assertEqual(
+            [task['task_name'] for task in res.data['days']['2026-03-01']],
+            ['Buy groceries', 'Vacuum living room']
+        )
+
+        res = self.client.get('{}month-year/3/2026/?format=columnar'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        columnar_tasks = res.json()
+        self.assertEqual(columnar_tasks['day'], [0, 0, 7, 14, 21, 28])
+        self.assertIsNone(columnar_tasks['occurrence'][0])
+        self.assertTrue(all(columnar_tasks['occurrence'][1:]))
+
+    def test_async_view_matches_sync_view(self):
+        """Test the async month view serves the same virtual tasks"""
+        print("Test the async month view serves the same virtual tasks")
+        self.apply_weekly_scheduler()
+        res = self.client.get('{}async/month-year/3/2026/'.format(SINGLE_TASK_URL))
+        self.assertEqual(res.json(), self.get_march().json())
+
+    def test_destroy_application_deletes_rule(self):
+        """Test deleting the application deletes its rule and stored occurrences"""
+        print("Test deleting the application deletes its rule and stored occurrences")
+        application_id = self.apply_weekly_scheduler().data['id']
+        self.client.post('{}occurrence/{}/'.format(
+            SINGLE_TASK_URL, self.get_march().data[1]['occurrence']
+        ), {'status': 'cancelled'}, format='json')
+
+        res = self.client.delete('{}{}/'.format(WEEKLY_APPLY_URL, application_id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 1)
+        self.assertFalse(RecurrenceRule.objects.exists())
+        self.assertEqual(len(self.get_march().data), 1)
+
+    def test_destroy_application_cascade_none_keeps_virtual_tasks(self):
+        """Test cascade=none stores the rule's virtual tasks before deleting it"""
+        print("Test cascade=none stores the rule's virtual tasks before deleting it")
+        application_id = self.apply_weekly_scheduler().data['id']
+        tasks_before = self.get_march().data
+
+        res = self.client.delete('{}{}/?cascade=none'.format(WEEKLY_APPLY_URL, application_id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 0)
+        self.assertFalse(RecurrenceRule.objects.exists())
+        self.assertEqual(SingleTask.objects.count(), 14)
+        self.assertEqual(
+            [(task['date'], task['task_name']) for task in self.get_march().data],
+            [(task['date'], task['task_name']) for task in tasks_before]
+        )
+
+    def test_destroy_scheduler_deletes_rule(self):
+        """Test deleting the scheduler deletes its applications' rules"""
+        print("Test deleting the scheduler deletes its applications' rules")
+        self.apply_weekly_scheduler()
+        self.assertEqual(len(self.get_march().data), 6)
+
+        res = self.client.delete('{}scheduler/{}/'.format(
+            WEEKLY_TASK_URL, self.weekly_task_scheduler.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(RecurrenceRule.objects.exists())
+        # the cached month is dropped too
+        self.assertEqual(len(self.get_march().data), 1)
+
+    def test_materialize_recurrence_rules(self):
+        """Test materializing the rules stores the remaining occurrences"""
+        print("Test materializing the rules stores the remaining occurrences")
+        self.apply_weekly_scheduler()
+        self.client.post('{}occurrence/{}/'.format(
+            SINGLE_TASK_URL, self.get_march().data[2]['occurrence']
+        ), {'status': 'completed'}, format='json')
+        tasks_before = self.get_march().data
+
+        out = StringIO()
+        call_command('materialize_recurrence_rules', stdout=out)
+        self.assertIn('Materialized 1 recurrence rules into 12 tasks', out.getvalue())
+        self.assertFalse(RecurrenceRule.objects.exists())
+        self.assertEqual(SingleTask.objects.count(), 14)
+        self.assertEqual(
+            SingleTask.objects.filter(status=TASK_STATUS_COMPLETED).count(), 1
+        )
+
+        with override_settings(SINGLE_TASK_VIRTUAL_RECURRENCE=False):
+            tasks_after = self.get_march().data
+        self.assertEqual(
+            [(task['date'], task['task_name'], task['status']) for task in tasks_after],
+            [(task['date'], task['task_name'], task['status']) for task in tasks_before]
+        )
+
+    def test_edit_template_reschedules_rule(self):
+        """Test editing a template keeps the past occurrences and moves the future ones"""
+        print("Test editing a template keeps the past occurrences and moves the future ones")
+        self.apply_weekly_scheduler()
+        self.client.post('{}occurrence/{}/'.format(
+            SINGLE_TASK_URL, self.get_march().data[2]['occurrence']
+        ), {'status': 'completed'}, format='json')
+        WeeklyTaskScheduler.objects.filter(id=self.weekly_task_scheduler.id).update(day_of_week=0)
+
+        reschedule_quarterly_applications(
+            WeeklyTaskAppliedQuarterly.objects.select_related(
+                'weekly_task_scheduler__user_profile'),
+            build_weekly_quarterly_tasks,
+            build_weekly_recurrence_rule,
+            datetime.date(2026, 3, 1)
+        )
+        rule = RecurrenceRule.objects.get()
+        self.assertEqual(rule.first_date, datetime.date(2026, 3, 2))
+        # the Sundays before March are stored as they were
+        self.assertEqual(SingleTask.objects.filter(
+            generation_batch=rule.generation_batch, date__lt=datetime.date(2026, 3, 1)
+        ).count(), 8)
+        self.assertEqual(
+            [(task['date'], task['id'] is None) for task in self.get_march().data],
+            [('2026-03-01', False), ('2026-03-02', True), ('2026-03-08', False),
+             ('2026-03-09', True), ('2026-03-16', True), ('2026-03-23', True),
+             ('2026-03-30', True)]
+        )
+
+    def test_rerotate_rule(self):
+        """Test adding a task to an interval group rotates it into the rule"""
+        print("Test adding a task to an interval group rotates it into the rule")
+        interval_task_group = IntervalTaskGroup.objects.create(
+            task_group_name='Workouts', interval_in_days=7,
+            task_group_owner=self.test_user_profile
+        )
+        for interval_task_name in ('Legs', 'Back'):
+            IntervalTaskScheduler.objects.create(
+                interval_task_name=interval_task_name,
+                interval_task_group=interval_task_group
+            )
+        # starts on the first Monday of the quarter, Jan 5
+        with mock.patch('interval_task_group.views.get_default_first_day_offset', return_value=4):
+            self.client.post('/api/interval-task/applied-quarterly/', {
+                'quarter': 'Q1', 'year': 2026, 'interval_task_group': interval_task_group.id
+            }, format='json')
+        rerotate_quarterly_applications(
+            IntervalTaskGroupAppliedQuarterly.objects.select_related('interval_task_group'),
+            ['Arms', 'Back', 'Legs'],
+            datetime.date(2026, 3, 1)
+        )
+        rule = RecurrenceRule.objects.get()
+        self.assertEqual(rule.first_date, datetime.date(2026, 3, 2))
+        # Mar 2 is the 9th occurrence of the quarter
+        self.assertEqual(rule.task_names, ['Legs', 'Arms', 'Back'])
+        self.assertEqual(
+            list(SingleTask.objects.filter(generation_batch=rule.generation_batch)
+                 .order_by('date').values_list('task_name', flat=True)),
+            ['Back', 'Legs'] * 4
+        )
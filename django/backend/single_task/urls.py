@@ -1,10 +1,19 @@
 from django.urls import path
 from .views import (
+    AsyncSingleTaskByDateView,
+    AsyncSingleTaskByMonthYearView,
+    AsyncSingleTaskCurrentMonthView,
+    AsyncUncompletedPastTasksView,
+    SingleTaskBatchView,
+    SingleTaskChangesView,
     SingleTaskConfirmCompletionView,
     SingleTaskViewSet,
     SingleTaskByDateView,
     SingleTaskByMonthYearView,
     SingleTaskCurrentMonthView,
+    SingleTaskOccurrenceView,
+    SingleTaskRangeView,
+    UncompletedPastTasksCountView,
     UncompletedPastTasksView
 )
 
@@ -31,6 +40,16 @@ urlpatterns = [
          SingleTaskViewSet.as_view({'patch': 'partial_update'}),
          name='task-reschedule'),
 
+    # Store a virtual task of a recurrence rule, with changes
+    path('occurrence/<uuid:generation_batch>/<str:date>/',
+         SingleTaskOccurrenceView.as_view(),
+         name='task-occurrence'),
+
+    # Confirm, reschedule and delete many tasks at once
+    path('batch/',
+         SingleTaskBatchView.as_view(),
+         name='task-batch'),
+
     # Get tasks by specific date
     path('date/<str:date>/',
          SingleTaskByDateView.as_view(),
@@ -41,6 +60,16 @@ urlpatterns = [
          SingleTaskByMonthYearView.as_view(),
          name='task-by-month-year'),
 
+    # Get tasks between two dates, grouped by date
+    path('range/',
+         SingleTaskRangeView.as_view(),
+         name='task-range'),
+
+    # Get tasks created, updated or deleted since a sync cursor
+    path('changes/',
+         SingleTaskChangesView.as_view(),
+         name='task-changes'),
+
     # Get tasks for current month
     path('current-month/',
          SingleTaskCurrentMonthView.as_view(),
@@ -50,4 +79,26 @@ urlpatterns = [
     path('unconfirmed/',
          UncompletedPastTasksView.as_view(),
          name='task-unconfirmed'),
+
+    # Get the number of uncompleted past tasks
+    path('unconfirmed/count/',
+         UncompletedPastTasksCountView.as_view(),
+         name='task-unconfirmed-count'),
+
+    # Async versions of the task list views, for deployment under ASGI
+    path('async/date/<str:date>/',
+         AsyncSingleTaskByDateView.as_view(),
+         name='task-by-date-async'),
+
+    path('async/month-year/<int:month>/<int:year>/',
+         AsyncSingleTaskByMonthYearView.as_view(),
+         name='task-by-month-year-async'),
+
+    path('async/current-month/',
+         AsyncSingleTaskCurrentMonthView.as_view(),
+         name='task-current-month-async'),
+
+    path('async/unconfirmed/',
+         AsyncUncompletedPastTasksView.as_view(),
+         name='task-unconfirmed-async'),
 ]
@@ -1,11 +1,70 @@
-from datetime import date
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
 
-from .models import SingleTask
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from response_cache.utils import invalidate_cached_tasks
+
+from .models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    TASK_STATUS_PENDING,
+    RecurrenceRule,
+    SingleTask
+)
+from .recurrence import materialize_recurrence_rule
+
+# Values of the ?cascade= parameter when deleting a quarterly application:
+# delete all of its generated tasks, only those still pending, or none
+GENERATED_TASK_CASCADE_MODES = ('all', 'pending', 'none')
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """
+    Gets the first day of a month and the first day of the next month.
+
+    Args:
+        year: The year
+        month: Integer 1-12
+
+    Returns:
+        Tuple of (first day of the month, first day of the next month)
+    """
+    if month == 12:
+        return date(year, month, 1), date(year + 1, 1, 1)
+    return date(year, month, 1), date(year, month + 1, 1)
+
+
+def encode_changes_cursor(cursor_date_time: datetime) -> str:
+    """
+    Encodes a sync cursor for the changes endpoint.
+
+    Args:
+        cursor_date_time: Aware datetime the next sync continues from
+
+    Returns:
+        The datetime as microseconds since the epoch, which is URL safe
+    """
+    return str((cursor_date_time - _EPOCH) // timedelta(microseconds=1))
+
+
+def decode_changes_cursor(cursor: str) -> datetime:
+    """
+    Decodes a sync cursor made by encode_changes_cursor.
+
+    Raises:
+        ValueError: If the cursor is not a number of microseconds
+    """
+    return _EPOCH + timedelta(microseconds=int(cursor))
 
 
 def generate_recurring_tasks_by_date_list(
-        task_name: str, user_profile, dates_to_schedule_tasks: List[date]
+        task_name: str, user_profile, dates_to_schedule_tasks: List[date],
+        generation_batch: Optional[UUID] = None
 ) -> List[SingleTask]:
     """
     Generates a batch of SingleTask instances with the same task name on multiple dates.
@@ -14,6 +73,9 @@ def generate_recurring_tasks_by_date_list(
         task_name: The name of the task to create
         user_profile: The UserProfile instance to associate with the tasks
         dates_to_schedule_tasks: List of dates on which to schedule the task
+        generation_batch: The generation_batch of the quarterly application
+            creating the tasks; each task's date is then also stored as its
+            occurrence_date
 
     Returns:
         List of SingleTask instances (not yet saved to database)
@@ -25,9 +87,116 @@ def generate_recurring_tasks_by_date_list(
             task_name=task_name,
             date=task_date,
             user_profile=user_profile,
-            status='pending'  # Default status from the model
+            status=TASK_STATUS_PENDING,  # Default status from the model
+            generation_batch=generation_batch,
+            occurrence_date=task_date if generation_batch else None
         )
         batch_of_tasks.append(task)
 
     return batch_of_tasks
 
+
+def delete_generated_tasks(generation_batch: UUID, cascade: str = 'all') -> int:
+    """
+    Deletes the SingleTask instances generated by a quarterly application
+    in a single statement on the indexed generation_batch column, and the
+    application's RecurrenceRule, whose virtual tasks are all pending.
+
+    Args:
+        generation_batch: The generation_batch of the quarterly application
+        cascade: 'all' deletes every generated task, 'pending' keeps the tasks
+            that were completed, deferred or cancelled, 'none' deletes no
+            task and stores the rule's virtual tasks before deleting it
+
+    Returns:
+        The number of deleted (stored) tasks
+    """
+    rules = RecurrenceRule.objects.filter(generation_batch=generation_batch)
+    if cascade == 'none':
+        for rule in rules.select_for_update():
+            materialize_recurrence_rule(rule)
+        return 0
+    rules.delete()
+    generated_tasks = SingleTask.objects.filter(generation_batch=generation_batch)
+    if cascade == 'pending':
+        generated_tasks = generated_tasks.filter(status=TASK_STATUS_PENDING)
+    deleted_count, _ = generated_tasks.delete()
+    return deleted_count
+
+
+def apply_batch_operations(user_profile_id: int, operations: List[dict]) -> List[dict]:
+    """
+    Applies confirm, reschedule and delete operations to a user's tasks.
+
+    The tasks are loaded in one query, then all confirmations are applied
+    with one UPDATE, all reschedules with one bulk_update and all deletions
+    with one DELETE ... IN, together in a transaction. Operations on tasks
+    the user does not own, or on a task already changed earlier in the
+    batch, are skipped.
+
+    Args:
+        user_profile_id: The id of the user's profile
+        operations: Validated operations, dicts with 'op' (one of
+            serializers.BATCH_OPERATIONS) and 'id', and for reschedules
+            optionally 'date' and 'comments'
+
+    Returns:
+        One result per operation, in order, with 'id', 'op' and a 'status'
+        of 'ok', 'not_found' or 'conflict'; confirmed and rescheduled
+        results also hold the updated 'task'
+    """
+    now = django_timezone.now()
+    tasks = SingleTask.objects.filter(user_profile_id=user_profile_id).in_bulk(
+        [operation['id'] for operation in operations]
+    )
+
+    confirmed_tasks, rescheduled_tasks, deleted_tasks = [], [], []
+    applied_task_ids = set()
+    changed_dates = set()
+    results = []
+    for operation in operations:
+        task_id = operation['id']
+        result = {'id': task_id, 'op': operation['op']}
+        results.append(result)
+        task = tasks.pop(task_id, None)
+        if task is None:
+            # Not the user's task, or already used by an earlier operation
+            result['status'] = 'conflict' if task_id in applied_task_ids else 'not_found'
+            continue
+
+        applied_task_ids.add(task_id)
+        result['status'] = 'ok'
+        changed_dates.add(task.date)
+        if operation['op'] == 'delete':
+            deleted_tasks.append(task)
+            continue
+        if operation['op'] == 'confirm':
+            task.status = TASK_STATUS_COMPLETED
+            confirmed_tasks.append(task)
+        else:
+            task.date = operation.get('date', task.date)
+            task.comments = operation.get('comments', task.comments)
+            task.status = TASK_STATUS_DEFERRED
+            changed_dates.add(task.date)
+            rescheduled_tasks.append(task)
+        # update() and bulk_update() do not apply auto_now
+        task.updated_date_time = now
+        result['task'] = task
+
+    with transaction.atomic():
+        if confirmed_tasks:
+            SingleTask.objects.filter(
+                id__in=[task.id for task in confirmed_tasks]
+            ).update(status=TASK_STATUS_COMPLETED, updated_date_time=now)
+        if rescheduled_tasks:
+            SingleTask.objects.bulk_update(
+                rescheduled_tasks,
+                ['date', 'comments', 'status', 'updated_date_time']
+            )
+        if deleted_tasks:
+            SingleTask.objects.filter(
+                id__in=[task.id for task in deleted_tasks]
+            ).delete()
+
+    invalidate_cached_tasks(user_profile_id, changed_dates)
+    return results
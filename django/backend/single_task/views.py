@@ -1,13 +1,141 @@
 import datetime
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, status, viewsets
+from django.utils import timezone
+from django.views import View
+from rest_framework import exceptions, generics, status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .models import SingleTask
-from .serializers import SingleTaskSerializer
+from backend.renderers import ColumnarRenderer, ORJSONRenderer
+from idempotency.utils import idempotent
+from response_cache.conditional import ConditionalListMixin
+from response_cache.utils import (
+    CachedListMixin,
+    get_single_task_month_namespace,
+    invalidate_cached_tasks
+)
+from user_profiles.authentication import UserProfileJWTAuthentication
+from user_profiles.utils import aget_user_profile_id, get_user_profile_id
+
+from .models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    RecurrenceRule,
+    SingleTask,
+    SingleTaskTombstone
+)
+from .pagination import (
+    OptionalSingleTaskKeysetPagination,
+    SingleTaskKeysetPagination
+)
+from .serializers import (
+    SingleTaskBatchOperationSerializer,
+    SingleTaskInDaySerializer,
+    SingleTaskOccurrenceSerializer,
+    SingleTaskSerializer,
+    to_columnar_representation
+)
+from .recurrence import (
+    aget_virtual_tasks,
+    get_virtual_tasks,
+    merge_virtual_tasks,
+    store_occurrence,
+    virtual_tasks_to_representation
+)
+from .utils import (
+    apply_batch_operations,
+    decode_changes_cursor,
+    encode_changes_cursor,
+    get_month_bounds
+)
+
+# The longest span the range endpoint serves in one request
+MAX_RANGE_IN_DAYS = 366
+
+# The most operations the batch endpoint applies in one request
+MAX_BATCH_OPERATIONS = 1000
+
+
+class ColumnarListMixin:
+    """
+    Lets a task list view answer ?format=columnar with the tasks as
+    parallel arrays (see to_columnar_representation) instead of a list of
+    objects. Views override get_columnar_base_date() to choose the date the
+    day offsets count from.
+    """
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [ColumnarRenderer]
+
+    def get_columnar_base_date(self):
+        return None
+
+    def is_columnar_request(self) -> bool:
+        return self.request.accepted_renderer.format == ColumnarRenderer.format
+
+    def serialize_tasks(self, tasks, paginated=False):
+        return self.get_serializer(tasks, many=True).data
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        data = self.serialize_tasks(
+            queryset if page is None else page, paginated=page is not None
+        )
+        if self.is_columnar_request():
+            data = to_columnar_representation(data, self.get_columnar_base_date())
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class VirtualTaskListMixin:
+    """
+    Adds the virtual tasks of the user's RecurrenceRules (see
+    single_task.recurrence) to a task list view when
+    SINGLE_TASK_VIRTUAL_RECURRENCE is on. Views return the dates of their
+    list from get_virtual_task_window(); keyset pages only contain stored
+    tasks, since virtual tasks have no id to page by.
+
+    Put it first, so the conditional GET validators include the rules too.
+    """
+
+    def get_virtual_task_window(self):
+        """Returns (first date or None, date after the last date) of the list."""
+        raise NotImplementedError
+
+    def serves_virtual_tasks(self) -> bool:
+        return settings.SINGLE_TASK_VIRTUAL_RECURRENCE
+
+    def get_list_version(self):
+        last_modified, count = super().get_list_version()
+        if not self.serves_virtual_tasks():
+            return last_modified, count
+        rule_version = RecurrenceRule.custom_query.user_rules_in_window(
+            get_user_profile_id(self.request), *self.get_virtual_task_window()
+        ).order_by().aggregate(
+            last_modified=Max('updated_date_time'),
+            count=Count('pk')
+        )
+        last_modified = max(
+            filter(None, (last_modified, rule_version['last_modified'])), default=None
+        )
+        # a rule deleted along with a task added must change the ETag too
+        return last_modified, '{}+{}'.format(count, rule_version['count'])
+
+    def serialize_tasks(self, tasks, paginated=False):
+        serialized_tasks = super().serialize_tasks(tasks, paginated)
+        if paginated or not self.serves_virtual_tasks():
+            return serialized_tasks
+        return merge_virtual_tasks(serialized_tasks, virtual_tasks_to_representation(
+            get_virtual_tasks(get_user_profile_id(self.request), *self.get_virtual_task_window()),
+            self.get_serializer_class()
+        ))
 
 
 class SingleTaskConfirmCompletionView(APIView):
@@ -19,11 +147,14 @@ class SingleTaskConfirmCompletionView(APIView):
 
     def post(self, request, *args, **kwargs):
         task_id = kwargs.get('id')
-        task = get_object_or_404(SingleTask, id=task_id)
+        task = get_object_or_404(
+            SingleTask, id=task_id, user_profile_id=get_user_profile_id(request)
+        )
         
         try:
-            task.status = 'completed'
+            task.status = TASK_STATUS_COMPLETED
             task.save()
+            invalidate_cached_tasks(task.user_profile_id, [task.date])
             serializer = SingleTaskSerializer(task)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Exception as e:
@@ -33,6 +164,67 @@ class SingleTaskConfirmCompletionView(APIView):
             )
 
 
+class SingleTaskOccurrenceView(APIView):
+    """
+    Store a virtual task of a recurrence rule (see single_task.recurrence)
+    to confirm, defer, comment on or cancel it, and return the stored task.
+    POST /api/single-task/occurrence/<generation_batch>/<date>/
+    {"status": "completed"}
+    {"date": "2026-05-01", "comments": "Next week"}
+
+    The stored task is changed through the endpoints by id from then on;
+    posting an occurrence that is already stored changes the stored task.
+    Deleting the stored task brings the virtual one back, cancel it to
+    skip an occurrence.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        serializer = SingleTaskOccurrenceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            occurrence_date = datetime.date.fromisoformat(kwargs.get('date'))
+        except ValueError:
+            return Response(
+                {"message": "date must be in the format YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            with transaction.atomic():
+                # lock the rule, so it cannot be deleted meanwhile
+                rule = RecurrenceRule.objects.select_for_update().filter(
+                    generation_batch=kwargs.get('generation_batch'),
+                    user_profile_id=get_user_profile_id(request)
+                ).first()
+                task, created = (None, False) if rule is None else store_occurrence(
+                    rule, occurrence_date
+                )
+                if task is None:
+                    return Response(
+                        {"message": "Occurrence not found"},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+
+                previous_date = task.date
+                for field_name, value in serializer.validated_data.items():
+                    setattr(task, field_name, value)
+                if 'date' in serializer.validated_data and 'status' not in serializer.validated_data:
+                    task.status = TASK_STATUS_DEFERRED
+                task.save()
+
+            invalidate_cached_tasks(task.user_profile_id, [previous_date, task.date])
+            return Response(
+                SingleTaskSerializer(task).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
+        except Exception as e:
+            return Response(
+                {"message": "There was an error. Please try again"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+
 class SingleTaskViewSet(viewsets.ModelViewSet):
     """
     Standard CRUD operations for SingleTask.
@@ -45,6 +237,12 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
     serializer_class = SingleTaskSerializer
     lookup_field = 'id'
 
+    def get_queryset(self):
+        # Only the authenticated user's tasks can be deleted or rescheduled
+        return SingleTask.objects.filter(
+            user_profile_id=get_user_profile_id(self.request)
+        )
+
     def create(self, request, *args, **kwargs):
         """Create a new task and return all tasks on the same date."""
         serializer = self.get_serializer(data=request.data)
@@ -52,11 +250,14 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
 
         try:
             # Pass user_profile to save method
-            new_task = serializer.save(user_profile=request.user.userprofile)
+            new_task = serializer.save(
+                user_profile_id=get_user_profile_id(request)
+            )
+            invalidate_cached_tasks(new_task.user_profile_id, [new_task.date])
 
             # Get all tasks for this user on the same date
             tasks_on_date = SingleTask.objects.filter(
-                user_profile=new_task.user_profile,
+                user_profile_id=new_task.user_profile_id,
                 date=new_task.date
             ).order_by('id')
 
@@ -75,6 +276,7 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
 
         try:
             self.perform_destroy(instance)
+            invalidate_cached_tasks(instance.user_profile_id, [instance.date])
             return Response(
                 {
                     "id": task_id,
@@ -91,6 +293,7 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
     def partial_update(self, request, *args, **kwargs):
         """Reschedule a task (updates date, status to deferred, and comments)."""
         instance = self.get_object()
+        previous_date = instance.date
 
         try:
             # Update the task fields
@@ -100,8 +303,11 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
                 instance.comments = request.data['comments']
 
             # Set status to deferred when rescheduling
-            instance.status = 'deferred'
+            instance.status = TASK_STATUS_DEFERRED
             instance.save()
+            invalidate_cached_tasks(
+                instance.user_profile_id, [previous_date, instance.date]
+            )
 
             serializer = self.get_serializer(instance)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -112,7 +318,8 @@ class SingleTaskViewSet(viewsets.ModelViewSet):
             )
 
 
-class SingleTaskByDateView(generics.ListAPIView):
+class SingleTaskByDateView(VirtualTaskListMixin, ConditionalListMixin, CachedListMixin,
+                          ColumnarListMixin, generics.ListAPIView):
     """
     Get all tasks for the authenticated user on a specific date.
     GET /api/task/date/<date>/
@@ -121,6 +328,17 @@ class SingleTaskByDateView(generics.ListAPIView):
     queryset = SingleTask.objects.all()
     serializer_class = SingleTaskSerializer
 
+    def get_cache_namespace(self):
+        year, month = self.kwargs.get("date").split('-')[:2]
+        return get_single_task_month_namespace(int(year), int(month))
+
+    def get_columnar_base_date(self):
+        return datetime.date(*[int(part) for part in self.kwargs.get("date").split('-')])
+
+    def get_virtual_task_window(self):
+        query_date = self.get_columnar_base_date()
+        return query_date, query_date + datetime.timedelta(days=1)
+
     def get_queryset(self):
         date_str = self.kwargs.get("date")
         date_list = date_str.split('-')
@@ -129,14 +347,15 @@ class SingleTaskByDateView(generics.ListAPIView):
         try:
             queryset = SingleTask.objects.filter(
                 date=query_date,
-                user_profile__user=self.request.user
+                user_profile_id=get_user_profile_id(self.request)
             ).order_by('id')
             return queryset
         except Exception as e:
             return SingleTask.objects.none()
 
 
-class SingleTaskByMonthYearView(generics.ListAPIView):
+class SingleTaskByMonthYearView(VirtualTaskListMixin, ConditionalListMixin, CachedListMixin,
+                               ColumnarListMixin, generics.ListAPIView):
     """
     Get all tasks for the authenticated user in a specific month and year.
     GET /api/task/month-year/<month>/<year>/
@@ -145,28 +364,36 @@ class SingleTaskByMonthYearView(generics.ListAPIView):
     queryset = SingleTask.objects.all()
     serializer_class = SingleTaskSerializer
 
+    def get_cache_namespace(self):
+        return get_single_task_month_namespace(
+            int(self.kwargs.get("year")), int(self.kwargs.get("month"))
+        )
+
+    def get_columnar_base_date(self):
+        return datetime.date(int(self.kwargs.get("year")), int(self.kwargs.get("month")), 1)
+
+    def get_virtual_task_window(self):
+        return get_month_bounds(int(self.kwargs.get("year")), int(self.kwargs.get("month")))
+
     def get_queryset(self):
         month = int(self.kwargs.get("month"))
         year = int(self.kwargs.get("year"))
 
         try:
-            start_date = datetime.date(year, month, 1)
-            if month == 12:
-                finish_date = datetime.date(year + 1, 1, 1)
-            else:
-                finish_date = datetime.date(year, month + 1, 1)
+            start_date, finish_date = get_month_bounds(year, month)
 
             queryset = SingleTask.objects.filter(
                 date__gte=start_date,
                 date__lt=finish_date,
-                user_profile__user=self.request.user
+                user_profile_id=get_user_profile_id(self.request)
             ).order_by('date')
             return queryset
         except Exception as e:
             return SingleTask.objects.none()
 
 
-class SingleTaskCurrentMonthView(generics.ListAPIView):
+class SingleTaskCurrentMonthView(VirtualTaskListMixin, ConditionalListMixin, CachedListMixin,
+                                ColumnarListMixin, generics.ListAPIView):
     """
     Get all tasks for the authenticated user in the current month.
     GET /api/task/current-month/
@@ -175,43 +402,362 @@ class SingleTaskCurrentMonthView(generics.ListAPIView):
     queryset = SingleTask.objects.all()
     serializer_class = SingleTaskSerializer
 
+    def get_cache_namespace(self):
+        today = datetime.date.today()
+        return get_single_task_month_namespace(today.year, today.month)
+
+    def get_columnar_base_date(self):
+        return datetime.date.today().replace(day=1)
+
+    def get_virtual_task_window(self):
+        today = datetime.date.today()
+        return get_month_bounds(today.year, today.month)
+
     def get_queryset(self):
         today = datetime.date.today()
-        start_date = today.replace(day=1)
 
         try:
-            if today.month == 12:
-                finish_date = datetime.date(today.year + 1, 1, 1)
-            else:
-                finish_date = datetime.date(today.year, today.month + 1, 1)
+            start_date, finish_date = get_month_bounds(today.year, today.month)
 
             queryset = SingleTask.objects.filter(
                 date__gte=start_date,
                 date__lt=finish_date,
-                user_profile__user=self.request.user
+                user_profile_id=get_user_profile_id(self.request)
             ).order_by('date')
             return queryset
         except Exception as e:
             return SingleTask.objects.none()
 
 
-class UncompletedPastTasksView(generics.ListAPIView):
+class UncompletedPastTasksView(VirtualTaskListMixin, ColumnarListMixin, generics.ListAPIView):
     """
     Get all uncompleted tasks before today for the authenticated user.
     GET /api/task/unconfirmed/
+
+    Passing ?page_size=<n> (and then the returned ?cursor=) pages through
+    the tasks ordered by (date, id) instead of returning all of them.
     """
     permission_classes = (IsAuthenticated,)
     queryset = SingleTask.objects.all()
     serializer_class = SingleTaskSerializer
+    pagination_class = OptionalSingleTaskKeysetPagination
+
+    def get_virtual_task_window(self):
+        # virtual tasks are pending, so all past ones are uncompleted
+        return None, datetime.date.today()
 
     def get_queryset(self):
         today = datetime.date.today()
 
         try:
             queryset = SingleTask.objects.filter(
-                user_profile__user=self.request.user,
+                user_profile_id=get_user_profile_id(self.request),
                 date__lt=today
-            ).exclude(status='completed').order_by('date')
+            ).exclude(status=TASK_STATUS_COMPLETED).order_by('date', 'id')
             return queryset
         except Exception as e:
             return SingleTask.objects.none()
+
+
+class UncompletedPastTasksCountView(APIView):
+    """
+    Get the number of uncompleted tasks before today for the authenticated user.
+    GET /api/task/unconfirmed/count/
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        today = datetime.date.today()
+        count = SingleTask.objects.filter(
+            user_profile_id=get_user_profile_id(request),
+            date__lt=today
+        ).exclude(status=TASK_STATUS_COMPLETED).count()
+        if settings.SINGLE_TASK_VIRTUAL_RECURRENCE:
+            count += len(get_virtual_tasks(get_user_profile_id(request), None, today))
+        return Response({"count": count}, status=status.HTTP_200_OK)
+
+
+class SingleTaskRangeView(generics.GenericAPIView):
+    """
+    Get the authenticated user's tasks between two dates (inclusive),
+    grouped by date, from one indexed query per page.
+    GET /api/single-task/range/?start=<date>&end=<date>
+
+    Replaces one day or month request per date for calendar views. The
+    span is limited to MAX_RANGE_IN_DAYS; very large ranges are served in
+    pages keyed on (date, id), following the 'next' link. With
+    ?format=columnar the tasks are returned as parallel arrays under
+    'tasks', with day offsets from start, instead of grouped under 'days'.
+    With SINGLE_TASK_VIRTUAL_RECURRENCE on, the virtual tasks of the whole
+    range are sent with the first page.
+    """
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = ColumnarListMixin.renderer_classes
+    queryset = SingleTask.objects.all()
+    serializer_class = SingleTaskInDaySerializer
+    pagination_class = SingleTaskKeysetPagination
+
+    def get(self, request, *args, **kwargs):
+        try:
+            start_date = datetime.date.fromisoformat(request.query_params['start'])
+            end_date = datetime.date.fromisoformat(request.query_params['end'])
+        except (KeyError, ValueError):
+            return Response(
+                {"message": "start and end must be dates in the format YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end_date < start_date:
+            return Response(
+                {"message": "end must not be before start"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end_date - start_date).days >= MAX_RANGE_IN_DAYS:
+            return Response(
+                {"message": "The range cannot span more than {} days".format(
+                    MAX_RANGE_IN_DAYS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = SingleTask.objects.filter(
+            user_profile_id=get_user_profile_id(request),
+            date__gte=start_date,
+            date__lte=end_date
+        )
+        page = self.paginate_queryset(queryset)
+        virtual_tasks = []
+        if (settings.SINGLE_TASK_VIRTUAL_RECURRENCE
+                and self.paginator.cursor_query_param not in request.query_params):
+            virtual_tasks = get_virtual_tasks(
+                get_user_profile_id(request), start_date, end_date + datetime.timedelta(days=1)
+            )
+        if request.accepted_renderer.format == ColumnarRenderer.format:
+            return Response({
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+                "tasks": to_columnar_representation(merge_virtual_tasks(
+                    SingleTaskSerializer(page, many=True).data,
+                    virtual_tasks_to_representation(virtual_tasks)
+                ), start_date),
+                "next": self.paginator.get_next_link()
+            })
+        serialized_tasks = self.get_serializer(page, many=True).data
+
+        days = {}
+        for task, serialized_task in zip(page, serialized_tasks):
+            days.setdefault(task.date.isoformat(), []).append(serialized_task)
+        if virtual_tasks:
+            for task, serialized_task in zip(virtual_tasks, virtual_tasks_to_representation(
+                    virtual_tasks, self.get_serializer_class())):
+                days.setdefault(task.date.isoformat(), []).append(serialized_task)
+            days = dict(sorted(days.items()))
+
+        return Response({
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
+            "days": days,
+            "next": self.paginator.get_next_link()
+        })
+
+
+class SingleTaskChangesView(APIView):
+    """
+    Get the authenticated user's tasks created, updated or deleted since a
+    sync cursor, so clients can patch their local copy instead of reloading.
+    GET /api/single-task/changes/?since=<cursor>
+
+    Without ?since= nothing is returned but the cursor to sync from. Each
+    response carries the cursor for the next request. Changes from the last
+    SINGLE_TASK_CHANGES_OVERLAP before the cursor are sent again, so
+    clients must apply them idempotently. Cursors older than
+    SINGLE_TASK_TOMBSTONE_RETENTION get 410 Gone and must reload.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        since_cursor = request.query_params.get('since')
+        if since_cursor is None:
+            return Response({
+                "cursor": encode_changes_cursor(now),
+                "changed": [],
+                "deleted": []
+            })
+
+        try:
+            since = decode_changes_cursor(since_cursor)
+        except (ValueError, OverflowError):
+            return Response(
+                {"message": "Invalid cursor"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if since < now - settings.SINGLE_TASK_TOMBSTONE_RETENTION:
+            return Response(
+                {"message": "The cursor has expired. Please reload all tasks"},
+                status=status.HTTP_410_GONE
+            )
+
+        user_profile_id = get_user_profile_id(request)
+        changed_since = since - settings.SINGLE_TASK_CHANGES_OVERLAP
+        changed_tasks = SingleTask.objects.filter(
+            user_profile_id=user_profile_id,
+            updated_date_time__gte=changed_since
+        ).order_by('updated_date_time', 'id')
+        deleted_task_ids = SingleTaskTombstone.objects.filter(
+            user_profile_id=user_profile_id,
+            deleted_date_time__gte=changed_since
+        ).order_by('deleted_date_time', 'id').values_list('task_id', flat=True)
+
+        return Response({
+            "cursor": encode_changes_cursor(now),
+            "changed": SingleTaskSerializer(changed_tasks, many=True).data,
+            "deleted": list(deleted_task_ids)
+        })
+
+
+class SingleTaskBatchView(APIView):
+    """
+    Confirm, reschedule and delete many of the authenticated user's tasks
+    in one request and one transaction.
+    POST /api/single-task/batch/
+    {"operations": [{"op": "confirm", "id": 1},
+                    {"op": "reschedule", "id": 2, "date": "2026-05-01"},
+                    {"op": "delete", "id": 3}]}
+
+    Returns one result per operation, in order. Invalid operations are
+    reported with their errors and the valid ones are still applied.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"message": "operations must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return Response(
+                {"message": "A batch cannot have more than {} operations".format(
+                    MAX_BATCH_OPERATIONS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            results = [None] * len(operations)
+            valid_operations = []
+            for index, operation in enumerate(operations):
+                serializer = SingleTaskBatchOperationSerializer(data=operation)
+                if serializer.is_valid():
+                    valid_operations.append((index, serializer.validated_data))
+                else:
+                    results[index] = {
+                        "id": operation.get('id') if isinstance(operation, dict) else None,
+                        "op": operation.get('op') if isinstance(operation, dict) else None,
+                        "status": "invalid",
+                        "errors": serializer.errors
+                    }
+
+            applied_results = apply_batch_operations(
+                get_user_profile_id(request),
+                [operation for _, operation in valid_operations]
+            )
+            for (index, _), result in zip(valid_operations, applied_results):
+                if 'task' in result:
+                    result['task'] = SingleTaskSerializer(result['task']).data
+                results[index] = result
+
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {"message": "There was an error. Please try again"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+
+class AsyncSingleTaskListView(View):
+    """
+    Base of the async versions of the hot task list views, for deployment
+    under ASGI (backend.asgi), where a request waiting on the database does
+    not hold a worker thread.
+
+    The user is authenticated from the JWT with the async ORM, the
+    queryset comes from the sync view in list_view_class, and the tasks are
+    read with an async values_list() query and formatted exactly like
+    SingleTaskSerializer, with the virtual tasks merged in like the sync views.
+    The responses are always JSON: the response cache, conditional GET,
+    pagination and ?format=columnar are only served by the sync views.
+    """
+    list_view_class = None
+    authentication = UserProfileJWTAuthentication()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            authenticated = await self.authentication.aauthenticate(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as e:
+            response = self.render({"detail": e.detail}, e.status_code)
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+        request.user = authenticated[0]
+
+        # get_queryset() filters on the profile id, which is now on the user
+        user_profile_id = await aget_user_profile_id(request)
+        if user_profile_id is None:
+            return self.render([])
+        list_view = self.list_view_class(request=request, args=args, kwargs=kwargs)
+        queryset = list_view.get_queryset()
+
+        serializer = SingleTaskSerializer(many=True)
+        row_fields = serializer.get_row_fields()
+        rows = [
+            row async for row in queryset.values_list(
+                *[source for _, source, _ in row_fields]
+            )
+        ]
+        data = serializer.rows_to_representation(row_fields, rows)
+        if list_view.serves_virtual_tasks():
+            data = merge_virtual_tasks(data, virtual_tasks_to_representation(
+                await aget_virtual_tasks(user_profile_id, *list_view.get_virtual_task_window())
+            ))
+        return self.render(data)
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            ORJSONRenderer().render(data),
+            content_type='application/json',
+            status=status_code
+        )
+
+
+class AsyncSingleTaskByDateView(AsyncSingleTaskListView):
+    """
+    Async version of SingleTaskByDateView.
+    GET /api/single-task/async/date/<date>/
+    """
+    list_view_class = SingleTaskByDateView
+
+
+class AsyncSingleTaskByMonthYearView(AsyncSingleTaskListView):
+    """
+    Async version of SingleTaskByMonthYearView.
+    GET /api/single-task/async/month-year/<month>/<year>/
+    """
+    list_view_class = SingleTaskByMonthYearView
+
+
+class AsyncSingleTaskCurrentMonthView(AsyncSingleTaskListView):
+    """
+    Async version of SingleTaskCurrentMonthView.
+    GET /api/single-task/async/current-month/
+    """
+    list_view_class = SingleTaskCurrentMonthView
+
+
+class AsyncUncompletedPastTasksView(AsyncSingleTaskListView):
+    """
+    Async version of UncompletedPastTasksView, always unpaginated.
+    GET /api/single-task/async/unconfirmed/
+    """
+    list_view_class = UncompletedPastTasksView
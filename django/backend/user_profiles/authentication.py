@@ -0,0 +1,76 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_PROFILE_ID_CLAIM = 'user_profile_id'
+
+
+class UserProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that also attaches the caller's UserProfile id,
+    read from the token claims, to the authenticated user.
+
+    Tokens issued before the claim was added carry no profile id; for
+    those the id is looked up once per request by get_user_profile_id.
+
+    aauthenticate() does the same for the async views, with the async ORM.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        user.user_profile_id = validated_token.get(USER_PROFILE_ID_CLAIM)
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate() for Django's HttpRequest.
+
+        Returns:
+            A (user, validated token) tuple, or None when the request has
+            no JWT
+
+        Raises:
+            AuthenticationFailed: If the header, token or user is invalid
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Async counterpart of get_user(), with the same checks."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        user.user_profile_id = validated_token.get(USER_PROFILE_ID_CLAIM)
+        return user
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 #from djoser.serializers import UserCreateSerializer as BaseUserRegistrationSerializer
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .authentication import USER_PROFILE_ID_CLAIM
 from .models import UserProfile
 
 
@@ -42,3 +45,15 @@ class UserCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'password', 're_password', 'profile')
+
+
+# this is used by the jwt/create endpoint; it adds the user's profile id to
+# the token claims so that authenticated requests do not need to look it up
+class UserProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[USER_PROFILE_ID_CLAIM] = UserProfile.objects.filter(
+            user=user
+        ).values_list('id', flat=True).first()
+        return token
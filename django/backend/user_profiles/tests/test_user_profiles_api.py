@@ -3,6 +3,7 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from user_profiles.models import UserProfile
 from user_profiles.serializers import UserProfileSerializer
@@ -11,6 +12,7 @@ User = get_user_model()
 
 USR_PROFILE_URL = '/api/profiles/user-profile/'
 USR_PROFILE_CREATE_URL = '/api/profiles/user/'
+JWT_CREATE_URL = '/auth/jwt/create/'
 
 
 def get_test_user():
@@ -60,6 +62,22 @@ class ProfilePublicApiTests(TestCase):
             res.status_code == status.HTTP_201_CREATED)
         self.assertEqual('TestUser2', User.objects.get(username='TestUser2').username)
 
+    def test_jwt_contains_user_profile_id(self):
+        """Test that the access token carries the user profile id claim"""
+        print("Test that the access token carries the user profile id claim")
+        self.test_user.set_password('testpassword')
+        self.test_user.save()
+        payload = {
+            'username': 'testuser',
+            'password': 'testpassword'
+        }
+        res = self.client.post(
+            JWT_CREATE_URL, data=json.dumps(payload),
+            content_type='application/json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        access_token = AccessToken(res.data['access'])
+        self.assertEqual(access_token['user_profile_id'], self.test_user_profile.id)
+
 
 class ProfilePrivateApiTests(TestCase):
     """Test the privately available user profile API"""
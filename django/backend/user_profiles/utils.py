@@ -0,0 +1,46 @@
+from .models import UserProfile
+
+
+def get_user_profile_id(request) -> int:
+    """
+    Returns the UserProfile id of the authenticated user.
+
+    The id is taken from the JWT claims when UserProfileJWTAuthentication
+    has already attached it. Otherwise it is looked up once and cached on
+    the user for the rest of the request, so querysets can filter directly
+    on the user_profile foreign key column instead of joining to the user.
+
+    Args:
+        request: The DRF request of an authenticated user
+
+    Returns:
+        The id of the user's profile, or None if the user has no profile
+    """
+    user = request.user
+    user_profile_id = getattr(user, 'user_profile_id', None)
+    if user_profile_id is None:
+        user_profile_id = UserProfile.objects.filter(
+            user=user
+        ).values_list('id', flat=True).first()
+        user.user_profile_id = user_profile_id
+    return user_profile_id
+
+
+async def aget_user_profile_id(request) -> int:
+    """
+    Async counterpart of get_user_profile_id, for the async views.
+
+    Args:
+        request: The HttpRequest of an authenticated user
+
+    Returns:
+        The id of the user's profile, or None if the user has no profile
+    """
+    user = request.user
+    user_profile_id = getattr(user, 'user_profile_id', None)
+    if user_profile_id is None:
+        user_profile_id = await UserProfile.objects.filter(
+            user=user
+        ).values_list('id', flat=True).afirst()
+        user.user_profile_id = user_profile_id
+    return user_profile_id
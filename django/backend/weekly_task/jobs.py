@@ -0,0 +1,62 @@
+from jobs.utils import job_handler
+from response_cache.utils import WEEKLY_TASK_NAMESPACE
+from single_task.models import RECURRENCE_DAILY, RecurrenceRule
+from single_task.quarter_calendar import get_quarter_bounds
+from single_task.services import materialize_quarterly_application
+from single_task.utils import generate_recurring_tasks_by_date_list
+
+from .models import WeeklyTaskAppliedQuarterly
+from .utils import (
+    get_first_day_of_week_by_year_and_quarter,
+    get_weekly_scheduling_dates_by_quarter,
+)
+
+APPLY_QUARTERLY_JOB = 'weekly_task.apply_quarterly'
+
+
+def build_quarterly_tasks(quarterly_application):
+    """Builds the unsaved SingleTasks of a weekly task applied to a quarter."""
+    weekly_task_scheduler = quarterly_application.weekly_task_scheduler
+    return generate_recurring_tasks_by_date_list(
+        task_name=weekly_task_scheduler.weekly_task_name,
+        user_profile=weekly_task_scheduler.user_profile,
+        dates_to_schedule_tasks=get_weekly_scheduling_dates_by_quarter(
+            day_of_week=weekly_task_scheduler.day_of_week,
+            year=quarterly_application.year,
+            quarter=quarterly_application.quarter
+        ),
+        generation_batch=quarterly_application.generation_batch
+    )
+
+
+def build_recurrence_rule(quarterly_application):
+    """Builds the unsaved RecurrenceRule of a weekly task applied to a quarter."""
+    weekly_task_scheduler = quarterly_application.weekly_task_scheduler
+    return RecurrenceRule(
+        user_profile_id=weekly_task_scheduler.user_profile_id,
+        generation_batch=quarterly_application.generation_batch,
+        frequency=RECURRENCE_DAILY,
+        interval=7,
+        first_date=get_first_day_of_week_by_year_and_quarter(
+            weekly_task_scheduler.day_of_week,
+            quarterly_application.year,
+            quarterly_application.quarter
+        ),
+        end_date=get_quarter_bounds(quarterly_application.year, quarterly_application.quarter)[1],
+        task_names=[weekly_task_scheduler.weekly_task_name]
+    )
+
+
+@job_handler(APPLY_QUARTERLY_JOB)
+def apply_quarterly(job, job_context):
+    """Creates the SingleTasks of a WeeklyTaskAppliedQuarterly."""
+    created_task_count = materialize_quarterly_application(
+        WeeklyTaskAppliedQuarterly.objects.select_related(
+            'weekly_task_scheduler__user_profile'
+        ),
+        job.payload['quarterly_application_id'],
+        build_quarterly_tasks,
+        WEEKLY_TASK_NAMESPACE,
+        job_context
+    )
+    return {'created_task_count': created_task_count}
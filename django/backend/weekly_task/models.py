@@ -1,4 +1,5 @@
 from datetime import datetime
+import uuid
 
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -61,6 +62,8 @@ class WeeklyTaskScheduler(models.Model):
         on_delete=models.CASCADE
     )
 
+    updated_date_time = models.DateTimeField(auto_now=True)
+
     @property
     def day_of_week_string(self):
         """Returns the day of week as a string (e.g., 'Monday')."""
@@ -110,6 +113,14 @@ class WeeklyTaskAppliedQuarterly(models.Model):
         on_delete=models.CASCADE
     )
 
+    # Shared by every SingleTask generated for this application, so they
+    # can be found and deleted together
+    generation_batch = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False
+    )
+
     class Meta:
         verbose_name_plural = 'Weekly Tasks Applied Quarterly'
         ordering = [
@@ -0,0 +1,298 @@
+import datetime
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from jobs.utils import run_pending_jobs
+from response_cache.utils import get_response_cache
+from single_task.models import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_DEFERRED,
+    TASK_STATUS_PENDING,
+    SingleTask
+)
+from user_profiles.models import UserProfile
+from user_profiles.serializers import UserProfileTokenObtainPairSerializer
+from weekly_task.models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
+
+User = get_user_model()
+
+WEEKLY_TASK_URL = '/api/weekly-task/'
+
+
+def get_test_user():
+    return User.objects.create_user(
+        'testuser',
+        'testpassword'
+    )
+
+
+def get_token_auth_header(user):
+    access_token = UserProfileTokenObtainPairSerializer.get_token(user).access_token
+    return 'Token {}'.format(access_token)
+
+
+class WeeklyTaskQueryCountApiTests(TestCase):
+    """Test the number of queries issued by the weekly task API"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        for day_of_week in range(3):
+            scheduler = WeeklyTaskScheduler.objects.create(
+                weekly_task_name='Weekly task {}'.format(day_of_week),
+                day_of_week=day_of_week,
+                user_profile=self.test_user_profile
+            )
+            for quarter in ('Q1', 'Q2'):
+                WeeklyTaskAppliedQuarterly.objects.create(
+                    quarter=quarter,
+                    year=2026,
+                    weekly_task_scheduler=scheduler
+                )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+
+    def test_schedulers_by_user_query_count(self):
+        """Test the weekly schedulers list view query count"""
+        print("Test the weekly schedulers list view query count")
+        # authenticate the user, the list's version stamp, then the schedulers
+        with self.assertNumQueries(3):
+            res = self.client.get('{}schedulers/'.format(WEEKLY_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_applied_quarterly_list_query_count(self):
+        """Test the applied quarterly list view query count"""
+        print("Test the applied quarterly list view query count")
+        with self.assertNumQueries(2):
+            res = self.client.get('{}applied-quarterly/'.format(WEEKLY_TASK_URL))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 6)
+
+    def test_applied_quarterly_filtered_query_count(self):
+        """Test the applied quarterly list filtered by quarter and year"""
+        print("Test the applied quarterly list filtered by quarter and year")
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                '{}applied-quarterly/Q1/2026/'.format(WEEKLY_TASK_URL)
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
+
+    def test_scheduler_create_query_count(self):
+        """Test creating a scheduler does not look up the user profile"""
+        print("Test creating a scheduler does not look up the user profile")
+        payload = {
+            'weekly_task_name': 'Vacuum living room',
+            'day_of_week': 6
+        }
+        with self.assertNumQueries(2):
+            res = self.client.post(
+                '{}scheduler/'.format(WEEKLY_TASK_URL), data=payload, format='json'
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+
+class WeeklyTaskAppliedQuarterlyDestroyApiTests(TestCase):
+    """Test deleting a quarterly application and its generated tasks"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        self.client.force_authenticate(self.test_user)
+        res = self.client.post(
+            '{}applied-quarterly/'.format(WEEKLY_TASK_URL),
+            data={
+                'quarter': 'Q1',
+                'year': 2026,
+                'weekly_task_scheduler': self.weekly_task_scheduler.id
+            },
+            format='json'
+        )
+        run_pending_jobs()
+        self.quarterly_application = WeeklyTaskAppliedQuarterly.objects.get(
+            id=res.data['id']
+        )
+        # a task created directly on the same day is not part of the batch
+        SingleTask.objects.create(
+            task_name='Vacuum living room',
+            date=SingleTask.objects.first().date,
+            user_profile=self.test_user_profile
+        )
+        generated_tasks = SingleTask.objects.filter(
+            generation_batch=self.quarterly_application.generation_batch
+        ).order_by('date')
+        generated_tasks.filter(id=generated_tasks[0].id).update(status=TASK_STATUS_COMPLETED)
+        generated_tasks.filter(id=generated_tasks[1].id).update(status=TASK_STATUS_DEFERRED)
+
+    def get_destroy_url(self, query=''):
+        return '{}applied-quarterly/{}/{}'.format(
+            WEEKLY_TASK_URL, self.quarterly_application.id, query
+        )
+
+    def test_generated_tasks_are_created_in_one_batch(self):
+        """Test applying a scheduler links every generated task to the application"""
+        print("Test applying a scheduler links every generated task to the application")
+        self.assertEqual(SingleTask.objects.filter(
+            generation_batch=self.quarterly_application.generation_batch
+        ).count(), 13)
+
+    def test_destroy_deletes_generated_tasks(self):
+        """Test deleting the application deletes all of its generated tasks"""
+        print("Test deleting the application deletes all of its generated tasks")
+        res = self.client.delete(self.get_destroy_url())
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 13)
+        self.assertEqual(SingleTask.objects.count(), 1)
+        self.assertFalse(WeeklyTaskAppliedQuarterly.objects.exists())
+
+    def test_destroy_cascade_pending(self):
+        """Test cascade=pending keeps tasks that are no longer pending"""
+        print("Test cascade=pending keeps tasks that are no longer pending")
+        res = self.client.delete(self.get_destroy_url('?cascade=pending'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 11)
+        self.assertEqual(
+            sorted(SingleTask.objects.values_list('status', flat=True)),
+            [TASK_STATUS_PENDING, TASK_STATUS_COMPLETED, TASK_STATUS_DEFERRED]
+        )
+
+    def test_destroy_invalid_cascade(self):
+        """Test an unknown cascade mode is rejected"""
+        print("Test an unknown cascade mode is rejected")
+        res = self.client.delete(self.get_destroy_url('?cascade=some'))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(WeeklyTaskAppliedQuarterly.objects.exists())
+        self.assertEqual(SingleTask.objects.count(), 14)
+
+    def test_destroy_scheduler_deletes_generated_tasks(self):
+        """Test deleting the scheduler deletes the tasks of its applications"""
+        print("Test deleting the scheduler deletes the tasks of its applications")
+        cached_month = self.client.get('/api/single-task/month-year/1/2026/')
+        self.assertEqual(len(cached_month.data), 4)
+        res = self.client.delete('{}scheduler/{}/'.format(
+            WEEKLY_TASK_URL, self.weekly_task_scheduler.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 13)
+        self.assertFalse(WeeklyTaskAppliedQuarterly.objects.exists())
+        self.assertEqual(SingleTask.objects.count(), 1)
+        # the quarter's cached months are dropped
+        self.assertEqual(
+            len(self.client.get('/api/single-task/month-year/1/2026/').data),
+            SingleTask.objects.filter(date__year=2026, date__month=1).count()
+        )
+
+    def test_destroy_scheduler_cascade_pending(self):
+        """Test cascade=pending keeps the scheduler's tasks that are no longer pending"""
+        print("Test cascade=pending keeps the scheduler's tasks that are no longer pending")
+        res = self.client.delete('{}scheduler/{}/?cascade=pending'.format(
+            WEEKLY_TASK_URL, self.weekly_task_scheduler.id
+        ))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['deleted_task_count'], 11)
+        self.assertEqual(
+            sorted(SingleTask.objects.values_list('status', flat=True)),
+            [TASK_STATUS_PENDING, TASK_STATUS_COMPLETED, TASK_STATUS_DEFERRED]
+        )
+
+
+class WeeklyTaskSchedulerUpdateApiTests(TestCase):
+    """Test editing a scheduler updates the tasks it generated"""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.test_user = get_test_user()
+        self.test_user_profile = UserProfile.objects.create(
+            user=self.test_user,
+            contact_email="testemail@gmx.com",
+            surname="McTest",
+            given_name="Testy"
+        )
+        self.weekly_task_scheduler = WeeklyTaskScheduler.objects.create(
+            weekly_task_name='Vacuum living room',
+            day_of_week=6,
+            user_profile=self.test_user_profile
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=get_token_auth_header(self.test_user)
+        )
+        self.today = datetime.date.today()
+        self.client.post('{}applied-quarterly/'.format(WEEKLY_TASK_URL), {
+            'quarter': 'Q{}'.format((self.today.month - 1) // 3 + 1),
+            'year': self.today.year,
+            'weekly_task_scheduler': self.weekly_task_scheduler.id
+        }, format='json')
+        run_pending_jobs()
+        self.past_tasks = list(SingleTask.objects.filter(
+            date__lt=self.today).order_by('date').values_list('date', 'task_name'))
+
+    def get_scheduler_url(self):
+        return '{}scheduler/{}/'.format(WEEKLY_TASK_URL, self.weekly_task_scheduler.id)
+
+    def test_update_moves_future_tasks(self):
+        """Test a new day of week and name change the future tasks only"""
+        print("Test a new day of week and name change the future tasks only")
+        future_task_ids = set(SingleTask.objects.filter(
+            date__gte=self.today).values_list('id', flat=True))
+        res = self.client.patch(self.get_scheduler_url(), {
+            'weekly_task_name': 'Vacuum all rooms',
+            'day_of_week': 2
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['day_of_week_string'], 'Wednesday')
+
+        future_tasks = SingleTask.objects.filter(date__gte=self.today)
+        self.assertEqual(res.data['updated_task_count'], len(future_task_ids))
+        self.assertEqual(
+            res.data['created_task_count'] - res.data['deleted_task_count'],
+            future_tasks.count() - len(future_task_ids)
+        )
+        self.assertTrue(all(
+            task.date.weekday() == 2 and task.task_name == 'Vacuum all rooms'
+            for task in future_tasks
+        ))
+        self.assertEqual(
+            list(SingleTask.objects.filter(date__lt=self.today).order_by('date')
+                 .values_list('date', 'task_name')),
+            self.past_tasks
+        )
+
+    def test_update_invalidates_cached_months(self):
+        """Test editing a scheduler drops the cached months of its moved tasks"""
+        print("Test editing a scheduler drops the cached months of its moved tasks")
+        url = '/api/single-task/current-month/'
+        self.client.get(url)
+        self.client.put(self.get_scheduler_url(), {
+            'weekly_task_name': 'Vacuum all rooms',
+            'day_of_week': 6
+        }, format='json')
+        res = self.client.get(url)
+        self.assertNotIn(
+            'Vacuum living room',
+            {task['task_name'] for task in res.data if task['date'] >= self.today.isoformat()}
+        )
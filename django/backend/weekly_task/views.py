@@ -1,56 +1,102 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import generics, status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from single_task.models import SingleTask
-from single_task.utils import generate_recurring_tasks_by_date_list
+from idempotency.utils import idempotent
+from jobs.models import Job
+from response_cache.conditional import ConditionalListMixin
+from response_cache.utils import (
+    WEEKLY_TASK_NAMESPACE,
+    CachedListMixin,
+    get_quarter_namespaces,
+    get_single_task_namespace,
+    invalidate_cached_responses
+)
+from single_task.services import reschedule_quarterly_applications
+from single_task.utils import (
+    GENERATED_TASK_CASCADE_MODES,
+    delete_generated_tasks,
+)
+from user_profiles.utils import get_user_profile_id
 
+from .jobs import APPLY_QUARTERLY_JOB, build_quarterly_tasks, build_recurrence_rule
 from .models import WeeklyTaskScheduler, WeeklyTaskAppliedQuarterly
 from .serializers import WeeklyTaskSchedulerSerializer, WeeklyTaskAppliedQuarterlySerializer
-from .utils import (
-    get_weekly_scheduling_dates_by_quarter,
-)
 
 
-class WeeklyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
+class WeeklyTaskAppliedQuarterlyViewSet(CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for WeeklyTaskAppliedQuarterly.
-    Applying a weekly task to a quarter creates SingleTask instances for each occurrence.
+    Applying a weekly task to a quarter queues a job that creates SingleTask
+    instances for each occurrence.
     """
     permission_classes = (IsAuthenticated,)
     queryset = WeeklyTaskAppliedQuarterly.objects.all()
     serializer_class = WeeklyTaskAppliedQuarterlySerializer
+    cache_namespace = WEEKLY_TASK_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        # Only the authenticated user's applications can be listed or deleted
+        queryset = WeeklyTaskAppliedQuarterly.objects.filter(
+            weekly_task_scheduler__user_profile_id=get_user_profile_id(self.request)
+        ).select_related('weekly_task_scheduler')
+        return queryset.order_by(
+            '-year', '-quarter',
+            'weekly_task_scheduler__day_of_week',
+            'weekly_task_scheduler__weekly_task_name'
+        )
+
+    @idempotent
     def create(self, request, *args, **kwargs):
-        """Create a quarterly application and generate all SingleTask instances."""
+        """
+        Create a quarterly application and queue a job that generates its
+        SingleTask instances. Responds with 202 and the job's id; the job's
+        progress is at /api/jobs/<job_id>/. With
+        SINGLE_TASK_VIRTUAL_RECURRENCE on, the application is stored as a
+        RecurrenceRule instead, and the response is 201.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         try:
-            quarter = serializer.validated_data['quarter']
-            year = serializer.validated_data['year']
             weekly_task_scheduler = serializer.validated_data['weekly_task_scheduler']
 
-            # Generate list of dates for this quarter
-            quarterly_task_date_list = get_weekly_scheduling_dates_by_quarter(
-                day_of_week=weekly_task_scheduler.day_of_week,
-                year=year,
-                quarter=quarter
-            )
+            if settings.SINGLE_TASK_VIRTUAL_RECURRENCE:
+                with transaction.atomic():
+                    quarterly_application = serializer.save()
+                    build_recurrence_rule(quarterly_application).save()
 
-            # Save the quarterly application
-            serializer.save()
+                invalidate_cached_responses(
+                    [weekly_task_scheduler.user_profile_id],
+                    [WEEKLY_TASK_NAMESPACE] + get_quarter_namespaces(
+                        quarterly_application.year, quarterly_application.quarter
+                    )
+                )
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-            # Generate and save all SingleTask instances for the quarter
-            batch_of_tasks = generate_recurring_tasks_by_date_list(
-                task_name=weekly_task_scheduler.weekly_task_name,
-                user_profile=weekly_task_scheduler.user_profile,
-                dates_to_schedule_tasks=quarterly_task_date_list
-            )
-            SingleTask.objects.bulk_create(batch_of_tasks)
+            # Save the quarterly application and queue the job creating its
+            # tasks together, so an application is never left without a job
+            with transaction.atomic():
+                quarterly_application = serializer.save()
+                job = Job.custom_query.enqueue(
+                    APPLY_QUARTERLY_JOB,
+                    {'quarterly_application_id': quarterly_application.id},
+                    user_profile_id=weekly_task_scheduler.user_profile_id
+                )
 
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # The job invalidates the quarter's months once their tasks exist
+            invalidate_cached_responses(
+                [weekly_task_scheduler.user_profile_id], [WEEKLY_TASK_NAMESPACE]
+            )
+            return Response(
+                {**serializer.data, 'job_id': job.id},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse('jobs:job-detail', kwargs={'id': job.id})}
+            )
         except Exception as e:
             return Response(
                 {"message": "There was an error. Please try again"},
@@ -59,43 +105,42 @@ class WeeklyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         """
-        Delete the quarterly application and find obsolete SingleTask instances.
-        Returns IDs of tasks that can be deleted.
+        Delete the quarterly application and the SingleTask instances it generated.
+        ?cascade=pending keeps tasks that were completed, deferred or cancelled,
+        ?cascade=none keeps all of them.
         """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             quarterly_application = self.get_object()
             deleted_id = quarterly_application.id
-            quarter = quarterly_application.quarter
-            year = quarterly_application.year
-            weekly_task_scheduler = quarterly_application.weekly_task_scheduler
-
-            # Generate list of dates for this quarter
-            quarterly_task_date_list = get_weekly_scheduling_dates_by_quarter(
-                day_of_week=weekly_task_scheduler.day_of_week,
-                year=year,
-                quarter=quarter
-            )
-
-            # Find all SingleTask instances that match
-            #obsolete_tasks = SingleTask.objects.filter(
-            #    user_profile=weekly_task_scheduler.user_profile,
-            #    task_name=weekly_task_scheduler.weekly_task_name,
-            #    date__in=quarterly_task_date_list
-            #)
 
-            #obsolete_task_strings = [str(task) for task in obsolete_tasks]
-            #obsolete_task_ids = [task.id for task in obsolete_tasks]
+            # Delete the generated tasks and the quarterly application together,
+            # locking the application so a running job cannot add tasks meanwhile
+            with transaction.atomic():
+                WeeklyTaskAppliedQuarterly.objects.select_for_update().filter(id=deleted_id).exists()
+                deleted_task_count = delete_generated_tasks(
+                    quarterly_application.generation_batch, cascade
+                )
+                quarterly_application.delete()
 
-            # Delete the quarterly application
-            quarterly_application.delete()
+            invalidate_cached_responses(
+                [get_user_profile_id(request)],
+                [WEEKLY_TASK_NAMESPACE] + get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            )
 
             return Response({
                 "message": "Weekly task application successfully deleted!",
                 "id": deleted_id,
-                #"single_task_batch_deletion_data": {
-                #    "obsolete_task_strings": ', '.join(obsolete_task_strings),
-                #    "obsolete_task_ids": obsolete_task_ids
-                #}
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -108,7 +153,7 @@ class WeeklyTaskAppliedQuarterlyViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
 
-class WeeklyTaskAppliedQuarterlyListView(generics.ListAPIView):
+class WeeklyTaskAppliedQuarterlyListView(CachedListMixin, generics.ListAPIView):
     """
     Get all weekly tasks applied quarterly for the authenticated user.
     Can be filtered by quarter and year via URL parameters.
@@ -116,40 +161,50 @@ class WeeklyTaskAppliedQuarterlyListView(generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
     queryset = WeeklyTaskAppliedQuarterly.objects.all()
     serializer_class = WeeklyTaskAppliedQuarterlySerializer
+    cache_namespace = WEEKLY_TASK_NAMESPACE
 
     def get_queryset(self):
         # Check if filtering by quarter and year
         quarter = self.kwargs.get("quarter")
         year = self.kwargs.get("year")
+        user_profile_id = get_user_profile_id(self.request)
 
         if quarter and year:
             queryset = WeeklyTaskAppliedQuarterly.objects.filter(
-                weekly_task_scheduler__user_profile__user=self.request.user,
+                weekly_task_scheduler__user_profile_id=user_profile_id,
                 quarter=quarter,
                 year=year
             )
         else:
             # Return all quarterly applications for the user
             queryset = WeeklyTaskAppliedQuarterly.objects.filter(
-                weekly_task_scheduler__user_profile__user=self.request.user
+                weekly_task_scheduler__user_profile_id=user_profile_id
             )
 
-        return queryset.order_by(
+        # The serializer reads the scheduler's name and day of week
+        return queryset.select_related('weekly_task_scheduler').order_by(
             '-year', '-quarter',
             'weekly_task_scheduler__day_of_week',
             'weekly_task_scheduler__weekly_task_name'
         )
 
 
-class WeeklyTaskSchedulerViewSet(viewsets.ModelViewSet):
+class WeeklyTaskSchedulerViewSet(ConditionalListMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     Handles CRUD operations for WeeklyTaskScheduler templates.
     """
     permission_classes = (IsAuthenticated,)
     queryset = WeeklyTaskScheduler.objects.all()
     serializer_class = WeeklyTaskSchedulerSerializer
+    cache_namespace = WEEKLY_TASK_NAMESPACE
     lookup_field = 'id'
 
+    def get_queryset(self):
+        queryset = WeeklyTaskScheduler.objects.filter(
+            user_profile_id=get_user_profile_id(self.request)
+        )
+        return queryset.order_by('day_of_week', 'weekly_task_name')
+
     def create(self, request, *args, **kwargs):
         """Create a new weekly task scheduler."""
 
@@ -159,8 +214,9 @@ class WeeklyTaskSchedulerViewSet(viewsets.ModelViewSet):
         try:
             # Automatically set user_profile from authenticated user
             new_scheduler = serializer.save(
-                user_profile=request.user.userprofile
+                user_profile_id=get_user_profile_id(request)
             )
+            invalidate_cached_responses([new_scheduler.user_profile_id], [WEEKLY_TASK_NAMESPACE])
             return Response(
                 serializer.data,
                 status=status.HTTP_201_CREATED
@@ -171,15 +227,84 @@ class WeeklyTaskSchedulerViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    def update(self, request, *args, **kwargs):
+        """
+        Update a weekly task scheduler. In the same transaction, the pending
+        tasks it generated from today on are moved to the new day of week
+        and renamed, with the fewest inserts, updates and deletes; the
+        response adds the numbers of created, updated and deleted tasks.
+        """
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            with transaction.atomic():
+                weekly_task_scheduler = serializer.save()
+                task_counts, changed_dates = reschedule_quarterly_applications(
+                    WeeklyTaskAppliedQuarterly.objects.filter(
+                        weekly_task_scheduler=weekly_task_scheduler
+                    ).select_related('weekly_task_scheduler__user_profile'),
+                    build_quarterly_tasks,
+                    build_recurrence_rule
+                )
+
+            invalidate_cached_responses(
+                [weekly_task_scheduler.user_profile_id],
+                [WEEKLY_TASK_NAMESPACE] + [
+                    get_single_task_namespace(changed_date) for changed_date in changed_dates
+                ]
+            )
+            return Response({**serializer.data, **task_counts})
+        except Exception as e:
+            return Response(
+                {"message": "There was an error. Please try again"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
     def destroy(self, request, *args, **kwargs):
-        """Delete a weekly task scheduler."""
+        """
+        Delete a weekly task scheduler, its quarterly applications and the
+        SingleTask instances they generated. ?cascade=pending keeps tasks
+        that were completed, deferred or cancelled, ?cascade=none keeps all
+        of them.
+        """
+        cascade = request.query_params.get('cascade', 'all')
+        if cascade not in GENERATED_TASK_CASCADE_MODES:
+            return Response(
+                {"message": "cascade must be one of: {}".format(
+                    ', '.join(GENERATED_TASK_CASCADE_MODES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             instance = self.get_object()
             scheduler_id = instance.id
-            self.perform_destroy(instance)
+
+            # The applications are deleted with the scheduler, so delete
+            # their tasks first, locking them so no job adds tasks meanwhile
+            with transaction.atomic():
+                quarterly_applications = list(
+                    WeeklyTaskAppliedQuarterly.objects.select_for_update().filter(weekly_task_scheduler=instance)
+                )
+                deleted_task_count = sum(
+                    delete_generated_tasks(quarterly_application.generation_batch, cascade)
+                    for quarterly_application in quarterly_applications
+                )
+                self.perform_destroy(instance)
+
+            invalidate_cached_responses([instance.user_profile_id], [WEEKLY_TASK_NAMESPACE] + [
+                namespace
+                for quarterly_application in quarterly_applications
+                for namespace in get_quarter_namespaces(
+                    quarterly_application.year, quarterly_application.quarter
+                )
+            ])
             return Response({
                 "id": scheduler_id,
-                "message": "Weekly task scheduler successfully deleted!"
+                "message": "Weekly task scheduler successfully deleted!",
+                "deleted_task_count": deleted_task_count
             })
         except Exception as e:
             return Response(
@@ -188,16 +313,17 @@ class WeeklyTaskSchedulerViewSet(viewsets.ModelViewSet):
             )
 
 
-class WeeklyTaskSchedulersByUserListView(generics.ListAPIView):
+class WeeklyTaskSchedulersByUserListView(ConditionalListMixin, CachedListMixin, generics.ListAPIView):
     """
     Get all weekly task schedulers for the authenticated user.
     """
     permission_classes = (IsAuthenticated,)
     queryset = WeeklyTaskScheduler.objects.all()
     serializer_class = WeeklyTaskSchedulerSerializer
+    cache_namespace = WEEKLY_TASK_NAMESPACE
 
     def get_queryset(self):
         queryset = WeeklyTaskScheduler.objects.filter(
-            user_profile__user=self.request.user
+            user_profile_id=get_user_profile_id(self.request)
         )
         return queryset.order_by('day_of_week', 'weekly_task_name')